@@ -0,0 +1,18 @@
+#!/bin/sh
+#
+# Public Archive of Days Since Timers
+# Production Container Entrypoint
+#
+# Brings the database up to date, then hands over to Gunicorn.
+#
+set -e
+
+if [ "${PADS_DB_ENGINE:-postgresql}" = "sqlite3" ]; then
+    # WAL mode is kept in the database file, setting it once is enough
+    python -c "import sqlite3,sys; sqlite3.connect(sys.argv[1]).execute('PRAGMA journal_mode=WAL')" \
+        "${PADS_DB_NAME:-db.sqlite3}"
+fi
+
+python manage.py migrate --noinput
+python manage.py createcachetable
+exec gunicorn --config gunicorn.conf.py "${PADS_PROJECT}.wsgi"
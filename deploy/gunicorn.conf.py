@@ -0,0 +1,35 @@
+#
+#
+# Public Archive of Days Since Timers
+# Gunicorn Configuration
+#
+#
+"""Gunicorn settings for the production deployment profile. The number
+of workers and threads may be overridden with the PADS_WORKERS and
+PADS_THREADS environment variables.
+"""
+
+# Standard Library Imports
+import multiprocessing, os
+
+bind = '0.0.0.0:{0}'.format(os.environ.get('PADS_PORT', '80'))
+
+# Pages are rendered on the CPU, so one worker process per core (plus one)
+#  is used, each holding one persistent database connection
+workers = int(os.environ.get(
+    'PADS_WORKERS', multiprocessing.cpu_count() + 1))
+threads = int(os.environ.get('PADS_THREADS', 1))
+if threads > 1:
+    worker_class = 'gthread'
+
+# Load the app once before forking the workers, to save memory and to
+#  surface import errors early
+preload_app = True
+
+# Replace workers from time to time to contain memory growth
+max_requests = 2000
+max_requests_jitter = 200
+timeout = 30
+
+accesslog = '-'
+errorlog = '-'
@@ -0,0 +1,211 @@
+#
+#
+# Public Archive of Days Since Timers
+# Deployment Load Test Harness
+#
+#
+"""Measures the number of requests per second that running PADS instances
+serve on the public index and on a Timer's detail page. The first target
+is taken as the baseline that the other targets are compared against,
+for example the runserver demo container against the production profile:
+
+    python deploy/loadtest.py \\
+        --target demo=http://localhost:9180/pads/ \\
+        --target production=http://localhost:9181/pads/ --seed 20
+
+With --seed, a User with the specified number of public Timers is signed
+up on each target through the site itself before the test, as every
+target has its own database. Otherwise, the first Timer linked from each
+target's index is used. Only the Python standard library is needed.
+"""
+
+# Standard Library Imports
+import argparse, http.client, http.cookiejar, json, re, secrets
+import statistics, threading, time, urllib.parse, urllib.request
+
+#
+# Constants
+#
+CSRF_COOKIE_NAME = 'csrftoken'
+TIMER_LINK_RE = re.compile(r'/timer/([0-9]+)/')
+WARM_UP_REQUESTS = 10
+
+#
+# Seeding
+#
+class PADSSiteClient:
+    """Browses a PADS instance like a User would, keeping cookies between
+    requests and sending the CSRF token along with forms.
+    """
+    def get(self, path):
+        response = self.opener.open(urllib.parse.urljoin(self.base_url, path))
+        return response.read().decode('utf-8')
+
+    def post(self, path, data):
+        data = dict(data)
+        for c in self.cookies:
+            if c.name == CSRF_COOKIE_NAME:
+                data['csrfmiddlewaretoken'] = c.value
+        url = urllib.parse.urljoin(self.base_url, path)
+        response = self.opener.open(
+            url, urllib.parse.urlencode(data, doseq=True).encode('ascii'))
+        return response.read().decode('utf-8')
+
+    def seed(self, timer_count):
+        """Signs up and signs in a new User, and creates public Timers.
+        Returns the ids of the new Timers.
+        """
+        username = 'loadtest-{0}'.format(secrets.token_hex(4))
+        password = secrets.token_urlsafe(16)
+        self.get('sign_up/user/') # for the CSRF cookie
+        self.post('sign_up/user/', {'username' : username,
+            'password' : password, 'password_confirm' : password})
+        self.post('sign_in/', {'username' : username, 'password' : password})
+        now = time.gmtime()
+        for i in range(0, timer_count):
+            self.post('timer/new/', {
+                'description' : 'Load Test Timer {0}'.format(i),
+                'first_history_message' : 'Load Test',
+                'year' : now.tm_year, 'month' : now.tm_mon,
+                'day' : now.tm_mday, 'hour' : now.tm_hour,
+                'minute' : now.tm_min, 'second' : now.tm_sec,
+                'use_current_date_time' : 'on'})
+        timer_ids = sorted(set(TIMER_LINK_RE.findall(
+            self.get('timers/personal/'))))
+        self.post('timers/bulk/', {'operation' : 'share',
+                                   'timer_id' : timer_ids})
+        return timer_ids
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies))
+
+#
+# Load Testing
+#
+def measure(url, requests, concurrency):
+    """Sends a number of GET requests to a URL from concurrent clients,
+    each reusing its connection where the server allows it. Returns the
+    requests per second, latency percentiles and number of errors.
+    """
+    parsed_url = urllib.parse.urlsplit(url)
+    remaining = [requests]
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+
+    def connect():
+        return http.client.HTTPConnection(
+            parsed_url.hostname, parsed_url.port or 80, timeout=30)
+
+    def client():
+        connection = connect()
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    break
+                remaining[0] -= 1
+            start = time.perf_counter()
+            try:
+                connection.request('GET', parsed_url.path)
+                response = connection.getresponse()
+                response.read()
+                ok = (response.status == 200)
+                if response.will_close:
+                    connection.close()
+                    connection = connect()
+            except (OSError, http.client.HTTPException):
+                ok = False
+                connection.close()
+                connection = connect()
+            latency = time.perf_counter() - start
+            with lock:
+                latencies.append(latency)
+                if ok is False:
+                    errors[0] += 1
+        connection.close()
+
+    threads = [threading.Thread(target=client)
+               for t in range(0, concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        'requests' : requests,
+        'requests_per_second' : requests / elapsed,
+        'p50_ms' : quantiles[49] * 1000,
+        'p99_ms' : quantiles[98] * 1000,
+        'errors' : errors[0],
+        }
+
+def run(targets, requests, concurrency, seed=0, timer_id=None):
+    results = []
+    for name, base_url in targets:
+        if seed > 0:
+            timer_ids = PADSSiteClient(base_url).seed(seed)
+        else:
+            timer_ids = TIMER_LINK_RE.findall(
+                PADSSiteClient(base_url).get(''))
+        target_timer_id = timer_id or (timer_ids[0] if timer_ids else None)
+        pages = [('index', base_url)]
+        if target_timer_id is not None:
+            pages.append(('timer', urllib.parse.urljoin(
+                base_url, 'timer/{0}/'.format(target_timer_id))))
+        else:
+            print('{0}: no public Timers found, skipping the Timer page '
+                  '(use --seed)'.format(name))
+        for page, url in pages:
+            measure(url, WARM_UP_REQUESTS, 1)
+            result = measure(url, requests, concurrency)
+            result.update({'target' : name, 'page' : page, 'url' : url})
+            results.append(result)
+    return results
+
+def print_results(results):
+    baselines = dict()
+    print('{0:<16}{1:<8}{2:>10}{3:>10}{4:>10}{5:>8}{6:>10}'.format(
+        'target', 'page', 'req/s', 'p50 ms', 'p99 ms', 'errors', 'speedup'))
+    for r in results:
+        baseline = baselines.setdefault(r['page'], r['requests_per_second'])
+        print('{0:<16}{1:<8}{2:>10.1f}{3:>10.2f}{4:>10.2f}{5:>8}{6:>9.2f}x'
+              .format(r['target'], r['page'], r['requests_per_second'],
+                      r['p50_ms'], r['p99_ms'], r['errors'],
+                      r['requests_per_second'] / baseline))
+
+def parse_target(target):
+    name, separator, base_url = target.partition('=')
+    if separator == '':
+        name, base_url = base_url or name, name
+    if base_url.endswith('/') is False:
+        base_url = base_url + '/'
+    return (name, base_url)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument(
+        '--target', action='append', required=True, type=parse_target,
+        help='NAME=URL of the PADS app (e.g. http://localhost:9180/pads/), '
+             'the first is the baseline')
+    parser.add_argument('--requests', type=int, default=500,
+                        help='Requests per page per target')
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help='Number of concurrent clients')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Public Timers to create on each target first')
+    parser.add_argument('--timer-id', type=int,
+                        help='Timer to load on the Timer page')
+    parser.add_argument('--output', help='Also write the results to a '
+                        'JSON file')
+    args = parser.parse_args()
+    results = run(args.target, args.requests, args.concurrency, args.seed,
+                  args.timer_id)
+    print_results(results)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=4)
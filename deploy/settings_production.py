@@ -0,0 +1,108 @@
+#
+#
+# Public Archive of Days Since Timers
+# Production Deployment Settings
+#
+#
+"""Settings for running PADS in production with Gunicorn and PostgreSQL.
+This module is copied into the Django project created by deploy/Dockerfile,
+next to the project's own settings.py which it extends. It is configured
+with environment variables:
+
+    PADS_SECRET_KEY: the secret key, required in production
+    PADS_ALLOWED_HOSTS: comma-separated host names (default: localhost)
+    PADS_DB_ENGINE: 'postgresql' (default) or 'sqlite3'
+    PADS_DB_NAME, PADS_DB_USER, PADS_DB_PASSWORD, PADS_DB_HOST,
+    PADS_DB_PORT: PostgreSQL connection details (PADS_DB_NAME is the path
+    to the database file with SQLite)
+    PADS_DB_CONN_MAX_AGE: seconds to keep database connections open
+    between requests (default: 600, use 0 behind a transaction-pooling
+    PgBouncer)
+"""
+
+from .settings import *
+from django.core.exceptions import ImproperlyConfigured
+
+# Standard Library Imports
+import os
+
+DEBUG = False
+# The development key in settings.py is public, and must never be used to
+#  sign sessions in production
+SECRET_KEY = os.environ.get('PADS_SECRET_KEY', '')
+if SECRET_KEY.strip() == '':
+    raise ImproperlyConfigured('PADS_SECRET_KEY must be set in production')
+ALLOWED_HOSTS = os.environ.get('PADS_ALLOWED_HOSTS', 'localhost').split(',')
+
+#
+# Database
+#
+# Each Gunicorn worker keeps its connection open between requests, instead
+#  of connecting again on every request as with the default settings.
+DB_CONN_MAX_AGE = int(os.environ.get('PADS_DB_CONN_MAX_AGE', 600))
+if os.environ.get('PADS_DB_ENGINE', 'postgresql') == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('PADS_DB_NAME', 'pads'),
+            'USER': os.environ.get('PADS_DB_USER', 'pads'),
+            'PASSWORD': os.environ.get('PADS_DB_PASSWORD', ''),
+            'HOST': os.environ.get('PADS_DB_HOST', 'localhost'),
+            'PORT': os.environ.get('PADS_DB_PORT', '5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        }
+    }
+else:
+    # SQLite fallback, switched to WAL mode by entrypoint.sh so that page
+    #  loads are not blocked by writes
+    DATABASES['default']['NAME'] = os.environ.get(
+        'PADS_DB_NAME', DATABASES['default']['NAME'])
+    DATABASES['default']['CONN_MAX_AGE'] = DB_CONN_MAX_AGE
+
+#
+# Cache
+#
+# Rendered public Timers are cached, and must be invalidated across all
+#  workers (see padsweb.caching), thus a cache shared by every worker is
+#  needed. The database cache needs no extra services; its table is
+#  created by entrypoint.sh.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'padsweb_cache',
+    }
+}
+
+# Sign-in rate limits must also be shared by every worker, so the token
+#  buckets are kept in the cache (see padsweb.ratelimit)
+from padsweb.settings import defaults as pads_defaults
+from padsweb.strings import PADSStringDictionary
+pads_defaults.patch(PADSStringDictionary(
+    {'sign_in_rate_limit_backend' : 'cache'},
+    'PADS Production Profile Settings'))
+
+#
+# Static Files
+#
+# Static files are served by WhiteNoise from within the workers, with
+#  compression and far-future cache headers.
+STATIC_ROOT = os.path.join(BASE_DIR, 'static')
+STATICFILES_STORAGE = 'whitenoise.storage.CompressedStaticFilesStorage'
+MIDDLEWARE.insert(
+    MIDDLEWARE.index('django.middleware.security.SecurityMiddleware') + 1,
+    'whitenoise.middleware.WhiteNoiseMiddleware')
+
+#
+# Logging
+#
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'root': {
+        'handlers': ['console'],
+        'level': os.environ.get('PADS_LOG_LEVEL', 'WARNING'),
+    },
+}
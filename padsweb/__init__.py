@@ -1 +1 @@
-
+default_app_config = 'padsweb.apps.PadswebConfig'
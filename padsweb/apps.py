@@ -1,5 +1,11 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class PadswebConfig(AppConfig):
     name = 'padsweb'
+
+    def ready(self):
+        from padsweb.sqlite_tuning import tune_sqlite_connection
+        connection_created.connect(tune_sqlite_connection,
+                                   dispatch_uid='padsweb_tune_sqlite')
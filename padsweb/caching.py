@@ -0,0 +1,74 @@
+#
+#
+# Public Archive of Days Since Timers
+# Rendered Fragment Cache Keys and Invalidation
+#
+#
+"""The rendered Timers of the public Timer indexes are kept in Django's
+cache, so that they are not loaded from the database and rendered again
+on every request. Cached fragments are never deleted individually.
+Instead, their keys carry a generation number which is advanced whenever a
+public Timer is changed, leaving the outdated fragments to expire.
+
+Running times on the index are only shown to the minute, thus the keys
+also carry the current minute to keep running times correct.
+
+Deployments with more than one process need a cache shared between the
+processes (such as Memcached) for invalidations to reach every process.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+
+# Standard Library Imports
+import time
+
+#
+# Constants
+#
+PUBLIC_TIMERS_GENERATION_KEY = 'padsweb:public_timers_generation'
+
+#
+# Functions
+#
+def get_public_timers_generation():
+    """Returns the current generation number of the public Timers."""
+    generation = cache.get(PUBLIC_TIMERS_GENERATION_KEY)
+    if generation is None:
+        # Begin from the current time in microseconds, so that the numbers
+        #  of a previous generation are not reused after the number has
+        #  been evicted from the cache.
+        cache.add(PUBLIC_TIMERS_GENERATION_KEY, int(time.time() * 1000000),
+                  None)
+        generation = cache.get(PUBLIC_TIMERS_GENERATION_KEY)
+    return generation
+
+def advance_public_timers_generation():
+    try:
+        cache.incr(PUBLIC_TIMERS_GENERATION_KEY)
+    except ValueError:
+        # The generation number is not in the cache, start a new one
+        get_public_timers_generation()
+
+def invalidate_public_timers():
+    """Discards all cached fragments showing public Timers. Call this
+    whenever a public Timer is created, changed or deleted, or whenever
+    a Timer is shared or unshared.
+
+    When called inside a transaction, the fragments are discarded again
+    after the transaction is committed, as fragments rendered by other
+    requests in the meantime may still show the Timer as it was before
+    the change.
+    """
+    advance_public_timers_generation()
+    transaction.on_commit(advance_public_timers_generation)
+
+def get_public_timers_fragment_key(*args):
+    """Returns a key to cache a fragment showing public Timers, which is
+    valid until the next change to a public Timer, or the end of the
+    current minute. Arguments to identify the fragment, such as a page
+    number, may be supplied.
+    """
+    parts = [get_public_timers_generation(), int(time.time() // 60)]
+    parts.extend(args)
+    return ':'.join([str(p) for p in parts])
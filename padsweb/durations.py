@@ -0,0 +1,88 @@
+#
+#
+# Public Archive of Days Since Timers
+# Batch Running Time Calculation
+#
+#
+"""Works out the running times of many Timers in a single pass, such as
+all Timers on a page of an index. Running times are counted in whole
+minutes, and split into larger units by cumulative division.
+
+NumPy is used when it is installed, otherwise the running times are
+worked out in plain Python. Both give the same results.
+"""
+
+# Standard Library Imports
+import datetime
+
+# Optional Imports
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+#
+# Constants
+#
+MICROSECONDS_PER_MINUTE = 60000000
+ONE_MICROSECOND = datetime.timedelta(microseconds=1)
+
+#
+# Functions
+#
+def get_minutes_between(start_times, end_times):
+    """Returns the number of whole minutes from each start time to the
+    end time in the same position, as a list of ints. Partial minutes are
+    dropped, as with int(); negative spans round towards zero.
+    """
+    spans = [e - s for s, e in zip(start_times, end_times)]
+    if numpy is not None:
+        if len(spans) > 0:
+            spans_us = numpy.array(spans, dtype='timedelta64[us]').astype(
+                numpy.int64)
+            minutes = (numpy.sign(spans_us)
+                * (numpy.abs(spans_us) // MICROSECONDS_PER_MINUTE))
+            return minutes.tolist()
+        else:
+            return []
+    else:
+        output = []
+        for s in spans:
+            span_us = s // ONE_MICROSECOND
+            minutes = abs(span_us) // MICROSECONDS_PER_MINUTE
+            if span_us < 0:
+                minutes = -minutes
+            output.append(minutes)
+        return output
+
+def split_minutes(minutes, limits):
+    """Splits each of a list of whole minutes into measures by limits, as
+    NonMetricMeasureInt does. The limits are to be specified smallest
+    first, for example: (60, 24) for minutes, hours and days.
+
+    Returns a list of tuples of measures in the same order as the limits,
+    with the overflow measure (days in the example) at the end. Negative
+    minutes are measured by their absolute value.
+    """
+    if numpy is not None:
+        if len(minutes) > 0:
+            working_values = numpy.abs(numpy.array(minutes, dtype=numpy.int64))
+            columns = []
+            for limit in limits:
+                working_values, measures = numpy.divmod(working_values, limit)
+                columns.append(measures.tolist())
+            columns.append(working_values.tolist())
+            return list(zip(*columns))
+        else:
+            return []
+    else:
+        output = []
+        for m in minutes:
+            working_value = abs(m)
+            measures = []
+            for limit in limits:
+                working_value, measure = divmod(working_value, limit)
+                measures.append(measure)
+            measures.append(working_value)
+            output.append(tuple(measures))
+        return output
@@ -10,7 +10,9 @@ from django.utils import timezone
 
 from padsweb.settings import *
 from padsweb.strings import labels
-from padsweb.misc import get_timezones_all
+from padsweb.timezones import get_time_zone_choices, get_time_zone_region
+from padsweb.timezones import is_time_zone_name
+import functools
 
 # Python Beginner's PROTIP:
 #
@@ -208,7 +210,55 @@ class ReasonForm(forms.Form):
         max_length=MAX_MESSAGE_LENGTH_SHORT,
         min_length=1,)
 
+class TimerBulkForm(forms.Form):
+    """Form for operations on many Timers at once. The Timers are 
+    specified as a list of ids in the timer_id field of the request,
+    which is not part of this form.
+    """
+    operation = forms.ChoiceField(
+        label=labels['TIMER_BULK_OPERATION'],
+        choices=[('reset', labels['TIMER_BULK_RESET']),
+                 ('stop', labels['TIMER_BULK_STOP']),
+                 ('share', labels['TIMER_BULK_SHARE']),
+                 ('unshare', labels['TIMER_BULK_UNSHARE']),
+                 ('add_to_group', labels['TIMER_BULK_ADD_TO_GROUP']),],)
+    reason = forms.CharField(
+        label=labels['REASON'],
+        initial=labels['REASON_NONE'],
+        max_length=MAX_MESSAGE_LENGTH_SHORT,
+        required=False,)
+    timer_group = forms.IntegerField(
+        label=labels['TIMER_GROUP'],
+        required=False,)
+
+class TimeZoneChoiceField(forms.ChoiceField):
+    """ChoiceField for time zone names. Any time zone name is accepted, 
+    even if the choices have been limited to a region.
+    """
+    def valid_value(self, value):
+        return is_time_zone_name(value)
+
 class TimeZoneForm(forms.Form):
-    time_zone = forms.ChoiceField(
+    # The choices are passed as a callable, so that the 500+ choices are
+    # not copied into every new form
+    time_zone = TimeZoneChoiceField(
         label=labels['TIME_ZONE'],
-        choices=get_timezones_all(),)
+        choices=get_time_zone_choices,)
+
+    def __init__(self, *args, **kwargs):
+        # Only time zones from a region are shown if a region is specified,
+        # time zones may otherwise be grouped by region
+        region = kwargs.pop('region', None)
+        grouped = kwargs.pop('grouped', False)
+        super().__init__(*args, **kwargs)
+        if (region is not None) or (grouped is True):
+            self.fields['time_zone'].choices = functools.partial(
+                get_time_zone_choices, region, grouped)
+        # The initial time zone is always kept in the choices, so that it
+        # remains selected when it is outside of the region shown
+        initial_tz = self.initial.get('time_zone')
+        if (region is not None) and is_time_zone_name(initial_tz):
+            if get_time_zone_region(initial_tz) != region:
+                self.fields['time_zone'].choices = (
+                    ((initial_tz, initial_tz),) +
+                    get_time_zone_choices(region, grouped))
@@ -0,0 +1,193 @@
+#
+#
+# Public Archive of Days Since Timers
+# Password Hashers
+#
+#
+"""Password hashing for User and Quick List accounts.
+
+The PADSPasswordHasher hashes new passwords with the hasher named in the
+password_hasher setting, and verifies passwords hashed with any of the
+hashers in PASSWORD_HASHERS, so that the hasher can be changed without
+locking out existing Users. Password hashes made with another hasher, or
+with different parameters, are reported by must_update(), and are
+replaced by the User Helpers when the User next signs in.
+
+Hashing is deliberately slow, and takes up a whole core for as long as it
+runs. To keep a burst of sign-ins from starving the other requests, hashes
+are worked out on a process-wide pool of password_hash_workers threads
+while the requesting thread waits. Set password_hash_workers to 0 to hash
+on the requesting thread instead.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from django.contrib.auth.hashers import Argon2PasswordHasher
+from django.contrib.auth.hashers import BasePasswordHasher
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.utils.crypto import constant_time_compare
+from padsweb.settings import defaults
+
+# Standard Library Imports
+import base64, hashlib, threading
+
+#
+# Hashers
+#
+class PADSPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """Django's PBKDF2 hasher, with the number of iterations taken from
+    the password_pbkdf2_iterations setting. Hashes made with a different
+    number of iterations are still verified, but must be updated.
+    """
+    @property
+    def iterations(self):
+        return defaults['password_pbkdf2_iterations']
+
+
+class PADSScryptPasswordHasher(BasePasswordHasher):
+    """Password hasher using the scrypt function from the Python standard
+    library, with the work factor, block size and parallelism taken from
+    the password_scrypt_* settings. Hashes are stored in the same format
+    as the scrypt hasher in later versions of Django.
+    """
+    algorithm = 'scrypt'
+
+    def get_parameters(self):
+        return (defaults['password_scrypt_n'],
+                defaults['password_scrypt_r'],
+                defaults['password_scrypt_p'])
+
+    def get_hash(self, password, salt, n, r, p):
+        hash_bytes = hashlib.scrypt(
+            password.encode(), salt=salt.encode(), n=n, r=r, p=p,
+            maxmem=256 * n * r * p, dklen=64)
+        return base64.b64encode(hash_bytes).decode('ascii')
+
+    def decode(self, encoded):
+        algorithm, n, salt, r, p, hash_b64 = encoded.split('$', 5)
+        assert algorithm == self.algorithm
+        return {'algorithm' : algorithm, 'hash' : hash_b64, 'salt' : salt,
+                'n' : int(n), 'r' : int(r), 'p' : int(p),}
+
+    def encode(self, password, salt):
+        assert password is not None
+        assert salt and '$' not in salt
+        n, r, p = self.get_parameters()
+        hash_b64 = self.get_hash(password, salt, n, r, p)
+        return '{0}${1}${2}${3}${4}${5}'.format(
+            self.algorithm, n, salt, r, p, hash_b64)
+
+    def verify(self, password, encoded):
+        decoded = self.decode(encoded)
+        hash_b64 = self.get_hash(password, decoded['salt'], decoded['n'],
+                                 decoded['r'], decoded['p'])
+        return constant_time_compare(decoded['hash'], hash_b64)
+
+    def must_update(self, encoded):
+        decoded = self.decode(encoded)
+        return (decoded['n'], decoded['r'], decoded['p']) != \
+            self.get_parameters()
+
+    def safe_summary(self, encoded):
+        decoded = self.decode(encoded)
+        return {'algorithm' : decoded['algorithm'], 'n' : decoded['n'],
+                'r' : decoded['r'], 'p' : decoded['p'],}
+
+
+# Hashers by the names used in the password_hasher setting. The Argon2
+# hasher needs the optional argon2-cffi package.
+PASSWORD_HASHERS = {
+    'argon2' : Argon2PasswordHasher,
+    'pbkdf2' : PADSPBKDF2PasswordHasher,
+    'scrypt' : PADSScryptPasswordHasher,
+    }
+
+#
+# Functions
+#
+def get_password_hasher_names_available():
+    """Returns a list of the names of hashers in PASSWORD_HASHERS that
+    can be used with the packages installed.
+    """
+    names = []
+    for name, hasher_class in sorted(PASSWORD_HASHERS.items()):
+        try:
+            if hasher_class.library is not None:
+                hasher_class()._load_library()
+            names.append(name)
+        except ValueError:
+            continue
+    return names
+
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+
+def get_hash_pool():
+    """Returns the process-wide thread pool that password hashes are
+    worked out on, creating it on first use. Returns None if hashes are
+    to be worked out on the requesting thread.
+    """
+    global _hash_pool
+    if defaults['password_hash_workers'] <= 0:
+        return None
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            _hash_pool = ThreadPoolExecutor(
+                max_workers=defaults['password_hash_workers'],
+                thread_name_prefix='padsweb-hash')
+        return _hash_pool
+
+#
+# Main Hasher Class
+#
+class PADSPasswordHasher:
+    """Hashes passwords with the preferred hasher, and verifies passwords
+    hashed with any known hasher. Takes the same encode() and verify()
+    calls as Django's password hashers.
+    """
+    def get_hasher(self, name=None):
+        if name is None:
+            name = self.hasher_name or defaults['password_hasher']
+        return PASSWORD_HASHERS[name]()
+
+    def identify_hasher(self, encoded):
+        """Returns an instance of the hasher that made a password hash,
+        or None if the hasher is not known.
+        """
+        algorithm = encoded.partition('$')[0]
+        for hasher_class in PASSWORD_HASHERS.values():
+            if hasher_class.algorithm == algorithm:
+                return hasher_class()
+        return None
+
+    def run(self, function, *args):
+        pool = get_hash_pool()
+        if pool is None:
+            return function(*args)
+        else:
+            return pool.submit(function, *args).result()
+
+    def encode(self, password, salt):
+        return self.run(self.get_hasher().encode, password, salt)
+
+    def verify(self, password, encoded):
+        hasher = self.identify_hasher(encoded)
+        if hasher is None:
+            return False
+        return self.run(hasher.verify, password, encoded)
+
+    def must_update(self, encoded):
+        """Returns True if a password hash was made with a hasher other
+        than the preferred hasher, or with different parameters.
+        """
+        hasher = self.identify_hasher(encoded)
+        preferred_hasher = self.get_hasher()
+        if hasher is None:
+            return True
+        elif hasher.algorithm != preferred_hasher.algorithm:
+            return True
+        else:
+            return hasher.must_update(encoded)
+
+    def __init__(self, hasher_name=None):
+        # The hasher_name overrides the password_hasher setting
+        self.hasher_name = hasher_name
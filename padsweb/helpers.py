@@ -4,14 +4,15 @@
 # Model Helper Classes and Functions
 #
 #
-from django.contrib.auth.hashers import PBKDF2PasswordHasher
 from django.db import IntegrityError, transaction
-from django.db.models import Q
+from django.db.models import F, Q
 from django.utils import timezone
-from pytz import all_timezones
+from padsweb.caching import invalidate_public_timers
+from padsweb.hashers import PADSPasswordHasher
 from padsweb.settings import defaults
 from padsweb.strings import labels
-from padsweb.misc import split_posint_rand
+from padsweb.timezones import is_time_zone_name
+from padsweb.misc import get_one_or_none, split_posint_rand
 from padsweb.models import PADSUser
 from padsweb.models import PADSTimer, PADSTimerReset
 from padsweb.models import PADSTimerGroup, GroupInclusion
@@ -22,13 +23,25 @@ settings = defaults
 class PADSHelper:
     """Base class for other PADS helper classes"""
     def get_user_from_db(self):
-        if self.user_is_registered():
-            if self.user_model.objects.filter(pk=self.user_id).exists():
-                return self.user_model.objects.get(pk=self.user_id)
-            else:
-                return None
-        else:
+        """Returns the record of the User assigned to the Helper, or None if
+        the User is not in the database. The record is loaded from the 
+        database only once, and is kept until the User id is changed or
+        invalidate_user() is called.
+        """
+        if self.user_model is None:
             return None
+        if self.user_from_db is not None:
+            if self.user_from_db.id == self.user_id:
+                return self.user_from_db
+        self.user_from_db = get_one_or_none(
+                self.user_model.objects, pk=self.user_id)
+        return self.user_from_db
+    
+    def invalidate_user(self):
+        """Discards the User record kept by the Helper. Call this when the
+        User's account is changed or removed by other means.
+        """
+        self.user_from_db = None
     
     def set_user_id(self, user_id):
         """Assigns a Helper to a User id. This is intended to assist access 
@@ -49,6 +62,7 @@ class PADSHelper:
     def set_user_model(self, user_model=PADSUser):
         if user_model is not None:
             self.user_model = user_model
+            self.invalidate_user()
 
     def user_is_present(self):
         """Indicates if a User id has been assigned to the helper. Returns
@@ -57,12 +71,7 @@ class PADSHelper:
         return self.user_id != settings['user_id_signed_out']
 
     def user_is_registered(self):
-        if self.user_model is None:
-            return False
-        elif self.user_model.objects.filter(pk=self.user_id).exists():
-            return True
-        else:
-            return False
+        return self.get_user_from_db() is not None
     
     def __init__(self, user_id=settings['user_id_signed_out'], **kwargs):
         # Local Variables
@@ -71,8 +80,12 @@ class PADSHelper:
         self.class_desc = 'PADS Helper Base Class'
         self.models = kwargs.get('models', dict())
         self.user_model = None
+        self.user_from_db = None
         # Constructor Routine
         self.set_user_model()
+        # A User record already loaded elsewhere, such as by the View, may
+        #  be supplied to save loading it again
+        self.user_from_db = kwargs.get('user_from_db')
         self.set_user_id(user_id)        
 
     def __repr__(self):
@@ -135,10 +148,7 @@ class PADSReadTimerHelper(PADSReadHelper):
             return self.timer_model.objects.filter(public=True)
 
     def get_from_db(self, timer_id):
-        if self.get_all_from_db().filter(pk=timer_id).exists() is True:
-            return self.get_all_from_db().get(pk=timer_id)
-        else:
-            return None
+        return get_one_or_none(self.get_all_from_db(), pk=timer_id)
     
     def get_from_db_by_description(self, description):
         return self.get_all_from_db().filter(
@@ -147,11 +157,8 @@ class PADSReadTimerHelper(PADSReadHelper):
     def get_from_db_by_permalink_code(self, link_code):
         if isinstance(link_code, str) is False:
             return None
-        if self.get_all_from_db().filter(
-                permalink_code=link_code).exists() is True:
-            return self.get_all_from_db().get(permalink_code=link_code)
-        else:
-            return None
+        return get_one_or_none(self.get_all_from_db(), 
+                               permalink_code=link_code)
     
     def get_by_group_id(self, group_id):
         return self.get_all_from_db().filter(in_groups=group_id)
@@ -168,11 +175,9 @@ class PADSReadTimerHelper(PADSReadHelper):
         return self.get_groups_all().filter(name__icontains=name)
 
     def get_groups_by_timer_id(self, timer_id):
-        timer_exists = self.get_all_from_db().filter(
-                pk=timer_id, creator_user_id=self.user_id).exists()
-        if timer_exists is True:
-            timer = self.get_all_from_db().get(pk=timer_id, 
-                                        creator_user_id=self.user_id)
+        timer = get_one_or_none(self.get_all_from_db(), 
+                                pk=timer_id, creator_user_id=self.user_id)
+        if timer is not None:
             groups = timer.in_groups.all()
             return groups
         return None
@@ -226,6 +231,8 @@ class PADSWriteTimerHelper(PADSWriteHelper):
                 message = kwargs.get('message', 
                                       labels['TIMER_DEFAULT_CREATION_REASON'])
                 self.new_log_entry(new_timer.id, message)
+            if new_timer.public is True:
+                invalidate_public_timers()
             return new_timer.id
     
     def new_group(self, name):
@@ -267,17 +274,24 @@ class PADSWriteTimerHelper(PADSWriteHelper):
         elif description.isspace() is True:
             return None
         else:
-            timer_exists = self.user_timers.filter(pk=timer_id).exists()
-            if timer_exists is True:
-                log_time = timezone.now()
+            log_time = timezone.now()
+            with transaction.atomic(savepoint=False):
+                # Keep the Timer's reset count and times up to date. This
+                # also checks if the Timer exists. The previous time must
+                # be assigned before the latest time, as some databases 
+                # apply assignments in order.
+                timers_updated = self.user_timers.filter(pk=timer_id).update(
+                    reset_count=F('reset_count') + 1,
+                    reset_previous_date_time=F('reset_latest_date_time'),
+                    reset_latest_date_time=log_time)
+                if timers_updated <= 0:
+                    return None
                 new_log_entry = PADSTimerReset()
                 new_log_entry.reason = description
                 new_log_entry.timer_id = timer_id
                 new_log_entry.date_time = log_time
                 new_log_entry.save()
-                return new_log_entry.id
-            else:
-                return None
+            return new_log_entry.id
         
     def add_to_group(self, timer_id, group_id):
         if self.user_is_registered() is False:
@@ -287,13 +301,11 @@ class PADSWriteTimerHelper(PADSWriteHelper):
         else:
             # Note: any user can add any Public Timer to own groups, even
             #  if they were created/owned by another user
-            public_timer_exists = self.timer_model.objects.filter(
-                    pk=timer_id, public=True).exists()
-            user_timer_exists = self.user_timers.filter(
+            timer_exists = self.timer_model.objects.filter(
+                    Q(public=True) | Q(creator_user_id=self.user_id), 
                     pk=timer_id).exists()
             group_exists = self.user_timer_groups.filter(
                     pk=group_id).exists()
-            timer_exists = public_timer_exists | user_timer_exists
             if (timer_exists is True) & (group_exists is True):
                 group_inclusion = GroupInclusion()
                 group_inclusion.group_id = group_id
@@ -317,11 +329,9 @@ class PADSWriteTimerHelper(PADSWriteHelper):
             if timer_exists & group_exists is False:
                 return False
             else:
-                group_incl_exists = self.group_incl_model.objects.filter(
-                        timer_id=timer_id, group_id=group_id).exists()
-                if group_incl_exists is True:
-                    group_incl= self.group_incl_model.objects.get(
-                            timer_id=timer_id, group_id=group_id)
+                group_incl = get_one_or_none(self.group_incl_model.objects,
+                        timer_id=timer_id, group_id=group_id)
+                if group_incl is not None:
                     group_incl.delete()                    
                     return True
                 else:
@@ -335,10 +345,11 @@ class PADSWriteTimerHelper(PADSWriteHelper):
         else:
             # Restrict access of Timers to those created by assigned User
             # of matching id
-            timer_exists = self.user_timers.filter(pk=timer_id).exists()
-            if timer_exists is True:
-                timer = self.user_timers.get(pk=timer_id)
+            timer = get_one_or_none(self.user_timers, pk=timer_id)
+            if timer is not None:
                 timer.delete()
+                if timer.public is True:
+                    invalidate_public_timers()
                 return True
             else:
                 return False
@@ -349,10 +360,9 @@ class PADSWriteTimerHelper(PADSWriteHelper):
         elif isinstance(timer_group_id, int) is False:
             return False
         else:
-            timer_group_exists = self.user_timer_groups.filter(
-                    pk=timer_group_id).exists()
-            if timer_group_exists is True:
-                timer_group = self.user_timer_groups.get(pk=timer_group_id)
+            timer_group = get_one_or_none(self.user_timer_groups, 
+                                          pk=timer_group_id)
+            if timer_group is not None:
                 timer_group.delete()
                 return True
             else:
@@ -370,21 +380,23 @@ class PADSWriteTimerHelper(PADSWriteHelper):
             return False
         else:
             if isinstance(timer_id, int) is True:
-                timer_exists = self.user_timers.filter(pk=timer_id).exists()
-                if timer_exists is True:
-                    timer = self.user_timers.get(pk=timer_id)
+                timer = get_one_or_none(self.user_timers, pk=timer_id)
+                if timer is not None:
                     if timer.historical is False:
                         with transaction.atomic():
                             timer.description = description
                             if timer.running is True:
                                 # Reset timer if it is running
                                 timer.count_from_date_time = edit_time 
+                            timer.save(update_fields=[
+                                'description', 'count_from_date_time'])
                             # Log the change in description
                             notice = labels['TIMER_RENAME_NOTICE'].format(
                                     description)
                             self.new_log_entry(timer_id, notice)
-                            timer.save()
-                            return True
+                        if timer.public is True:
+                            invalidate_public_timers()
+                        return True
                     else:
                         # Historical Timers must not have their description
                         # changed
@@ -407,20 +419,25 @@ class PADSWriteTimerHelper(PADSWriteHelper):
         elif (len(reason) <= 0):
             return False
         if isinstance(timer_id, int) is True:
-            timer_exists = self.user_timers.filter(pk=timer_id).exists()
+            timer = get_one_or_none(self.user_timers, pk=timer_id)
 
-            if timer_exists is False:
+            if timer is None:
                 return False
             else:
-                timer = self.user_timers.get(pk=timer_id)            
                 if timer.historical is False:
                     with transaction.atomic():
                         timer.count_from_date_time = reset_time
                         timer.running = True
+                        # Only the changed fields are saved, so that the 
+                        #  reset count and times loaded earlier do not 
+                        #  overwrite newer ones
+                        timer.save(
+                            update_fields=['count_from_date_time', 'running'])
                         # Log the reset
                         notice = labels['TIMER_RESET_NOTICE'].format(reason)
                         self.new_log_entry(timer_id, notice)
-                        timer.save()
+                    if timer.public is True:
+                        invalidate_public_timers()
                     return True
                 else:
                     # Historical Timers shall not be reset 
@@ -437,18 +454,18 @@ class PADSWriteTimerHelper(PADSWriteHelper):
         elif (len(reason) <= 0):
             return False
         else:
-            timer_exists = self.user_timers.filter(
-                    pk=timer_id).exists()
+            timer = get_one_or_none(self.user_timers, pk=timer_id)
 
-        if timer_exists is False:
+        if timer is None:
             return False
         else:
-            timer = self.user_timers.get(pk=timer_id)
             timer_historical = timer.historical
             timer.count_from_date_time = stop_time # Stopping a timer resets it
             timer.running = False
         
             with transaction.atomic():
+                timer.save(
+                    update_fields=['count_from_date_time', 'running'])
                 # Log the edit
                 if timer_historical is False:
                     notice = labels['TIMER_SUSPEND_NOTICE'].format(
@@ -457,10 +474,145 @@ class PADSWriteTimerHelper(PADSWriteHelper):
                     notice = labels['TIMER_STOP_NOTICE'].format(
                             reason)
                 self.new_log_entry(timer_id, notice)
-                timer.save()
+            if timer.public is True:
+                invalidate_public_timers()
             
             return True
         
+    #
+    # Bulk Editing Methods
+    #
+    def get_timer_ids_valid(self, timer_ids):
+        """Returns a list of the Timer ids in timer_ids that are ints, 
+        in the same order, without repeats.
+        """
+        return list(dict.fromkeys(
+            [i for i in timer_ids if isinstance(i, int)]))
+
+    def new_log_entries(self, timer_ids, description, log_time):
+        """Creates a Log Entry with the same description and time for each
+        of a list of Timers, and updates their reset counts and times, 
+        with one UPDATE and one INSERT. The Timers must have already been
+        checked to belong to the User.
+        """
+        with transaction.atomic(savepoint=False):
+            self.user_timers.filter(pk__in=timer_ids).update(
+                reset_count=F('reset_count') + 1,
+                reset_previous_date_time=F('reset_latest_date_time'),
+                reset_latest_date_time=log_time)
+            self.timer_log_model.objects.bulk_create(
+                [self.timer_log_model(timer_id=i, reason=description, 
+                                      date_time=log_time) 
+                 for i in timer_ids])
+
+    def reset_many_by_id(self, timer_ids, reason):
+        """Resets many of the User's Timers at once. Historical Timers and
+        Timers that are not found are skipped. Returns the number of 
+        Timers reset.
+        """
+        reset_time = timezone.now()
+        if self.user_is_registered() is False:
+            return 0
+        elif isinstance(reason, str) is False:
+            return 0
+        elif reason.isspace() is True:
+            return 0
+        elif (len(reason) <= 0):
+            return 0
+        timer_ids = self.get_timer_ids_valid(timer_ids)
+        with transaction.atomic():
+            timers = self.user_timers.select_for_update().filter(
+                pk__in=timer_ids, historical=False)
+            timers_reset = list(timers.values_list('pk', 'public'))
+            timer_ids_reset = [t[0] for t in timers_reset]
+            if len(timer_ids_reset) <= 0:
+                return 0
+            self.user_timers.filter(pk__in=timer_ids_reset).update(
+                count_from_date_time=reset_time, running=True)
+            notice = labels['TIMER_RESET_NOTICE'].format(reason)
+            self.new_log_entries(timer_ids_reset, notice, reset_time)
+        if True in [t[1] for t in timers_reset]:
+            invalidate_public_timers()
+        return len(timer_ids_reset)
+
+    def stop_many_by_id(self, timer_ids, reason):
+        """Stops (or suspends) many of the User's running Timers at once.
+        Timers that are not running or not found are skipped. Returns the
+        number of Timers stopped.
+        """
+        stop_time = timezone.now()
+        if self.user_is_registered() is False:
+            return 0
+        elif isinstance(reason, str) is False:
+            return 0
+        elif reason.isspace() is True:
+            return 0
+        elif (len(reason) <= 0):
+            return 0
+        timer_ids = self.get_timer_ids_valid(timer_ids)
+        with transaction.atomic():
+            timers = self.user_timers.select_for_update().filter(
+                pk__in=timer_ids, running=True)
+            timers_stopped = list(timers.values_list(
+                'pk', 'historical', 'public'))
+            if len(timers_stopped) <= 0:
+                return 0
+            self.user_timers.filter(
+                pk__in=[t[0] for t in timers_stopped]).update(
+                    count_from_date_time=stop_time, running=False)
+            # Historical Timers are stopped, others are suspended
+            timer_ids_historical = [t[0] for t in timers_stopped if t[1]]
+            timer_ids_suspended = [
+                t[0] for t in timers_stopped if not t[1]]
+            if len(timer_ids_historical) > 0:
+                notice = labels['TIMER_STOP_NOTICE'].format(reason)
+                self.new_log_entries(timer_ids_historical, notice, stop_time)
+            if len(timer_ids_suspended) > 0:
+                notice = labels['TIMER_SUSPEND_NOTICE'].format(reason)
+                self.new_log_entries(timer_ids_suspended, notice, stop_time)
+        if True in [t[2] for t in timers_stopped]:
+            invalidate_public_timers()
+        return len(timers_stopped)
+
+    def set_public_many_by_id(self, timer_ids, public):
+        """Shares (public=True) or unshares (public=False) many of the 
+        User's Timers at once. Returns the number of Timers changed.
+        """
+        if self.user_is_registered() is False:
+            return 0
+        elif isinstance(public, bool) is False:
+            return 0
+        timer_ids = self.get_timer_ids_valid(timer_ids)
+        timers_changed = self.user_timers.filter(pk__in=timer_ids).exclude(
+            public=public).update(public=public)
+        if timers_changed > 0:
+            invalidate_public_timers()
+        return timers_changed
+
+    def add_many_to_group(self, timer_ids, group_id):
+        """Adds many Timers to one of the User's Timer Groups at once.
+        As with add_to_group(), the Timers may be the User's own Timers or
+        public Timers. Timers already in the Group are skipped. Returns the
+        number of Timers added.
+        """
+        if self.user_is_registered() is False:
+            return 0
+        elif isinstance(group_id, int) is False:
+            return 0
+        timer_ids = self.get_timer_ids_valid(timer_ids)
+        with transaction.atomic():
+            if self.user_timer_groups.filter(pk=group_id).exists() is False:
+                return 0
+            timer_ids_added = list(self.timer_model.objects.filter(
+                Q(public=True) | Q(creator_user_id=self.user_id), 
+                pk__in=timer_ids).exclude(
+                    groupinclusion__group_id=group_id).values_list(
+                        'pk', flat=True))
+            self.group_incl_model.objects.bulk_create(
+                [self.group_incl_model(timer_id=i, group_id=group_id) 
+                 for i in timer_ids_added])
+        return len(timer_ids_added)
+
     #
     # New Timer Preparation Method
     #
@@ -530,11 +682,8 @@ class PADSUserHelper(PADSHelper):
     """    
     def get_user_from_db_by_username(self, user_name):
         if isinstance(user_name, str):
-            if self.user_model.objects.filter(
-                    nickname_short=user_name).exists():
-                return self.user_model.objects.get(nickname_short=user_name)
-            else:
-                return None
+            return get_one_or_none(self.user_model.objects, 
+                                   nickname_short=user_name)
         else:
             return None
         
@@ -542,6 +691,7 @@ class PADSUserHelper(PADSHelper):
         user = self.get_user_from_db_by_username(user_name)
         if user is not None:
             self.user_id = user.id
+            self.user_from_db = user
         else:
             self.user_id = settings['user_id_signed_out']
 
@@ -554,7 +704,16 @@ class PADSUserHelper(PADSHelper):
             return False
         
         user = self.get_user_from_db()
-        return self.password_hasher.verify(password, user.password_hash)
+        if self.password_hasher.verify(password, user.password_hash):
+            # Replace outdated password hashes while the password is known
+            if self.password_hasher.must_update(user.password_hash):
+                salt = secrets.token_urlsafe(settings['password_salt_bytes'])
+                user.password_hash = self.password_hasher.encode(
+                    password, salt)
+                user.save(update_fields=['password_hash'])
+            return True
+        else:
+            return False
     
     def check_ql_password(self, ql_password):
         ql_raw_password = self.split_ql_password(ql_password)[1]
@@ -591,8 +750,7 @@ class PADSUserHelper(PADSHelper):
     def user_is_ql(self):
         """Returns True if a User is a QL User.
         """
-        return self.user_from_db.nickname_short.startswith(
-                settings['ql_user_name_prefix'])
+        return self.user_from_db.is_quick_list
 
     def user_has_signed_in(self):
         user = self.get_user_from_db()
@@ -604,7 +762,7 @@ class PADSUserHelper(PADSHelper):
     def __init__(self, user_id=settings['user_id_signed_out'], **kwargs):
         self.class_desc = 'PADS User Helper (for read operations)'
         self.password_hasher = kwargs.get('password_hasher', 
-                                          PBKDF2PasswordHasher())
+                                          PADSPasswordHasher())
         super().__init__(user_id, **kwargs)
         self.set_user_id(user_id)
     
@@ -622,8 +780,13 @@ class PADSWriteUserHelper(PADSWriteHelper):
         Returns True on success.
         """
         if self.user_is_present():
-            user_from_db = self.user_model.objects.get(id=self.user_id)
+            user_from_db = self.get_user_from_db()
+            if user_from_db is None:
+                return False
             user_from_db.delete()
+            self.invalidate_user()
+            # The User's public Timers were deleted along with the account
+            invalidate_public_timers()
             return True
         else:
             return False
@@ -720,7 +883,7 @@ class PADSWriteUserHelper(PADSWriteHelper):
     def set_time_zone(self, timezone_name):
         user = self.get_user_from_db()
         if user is not None:
-            if timezone_name in all_timezones:
+            if is_time_zone_name(timezone_name):
                 user.time_zone = timezone_name
                 user.save()
                 return True
@@ -730,31 +893,78 @@ class PADSWriteUserHelper(PADSWriteHelper):
             return False
 
     def merge_users_by_id(self, source_user_id, **kwargs):
-        # TODO: Replace this with a more efficient implementation.
-        with transaction.atomic():
-            source_user = self.get_user_from_db_by_id(source_user_id)
+        """Transfers all Timers and Timer Groups of a User to the User 
+        assigned to this helper, then deletes the first User's account.
+        This is used to import Quick Lists into regular accounts.
+        
+        Timer Groups with the same name as one of the assigned User's Groups
+        are combined into the latter. If a Timer Group id is specified as
+        default_group_id, Timers not in any Group are added to that Group,
+        if it belongs to the assigned User.
+        
+        The merge is carried out with a fixed number of bulk operations, 
+        plus two for every pair of Groups combined, regardless of the number
+        of Timers. Returns True on success, False on failure.
+        """
+        if self.user_is_registered() is False:
+            return False
+        elif source_user_id == self.user_id:
+            return False
+        source_user = get_one_or_none(self.user_model.objects, 
+                                      pk=source_user_id)
+        if source_user is None:
+            return False
+        
+        default_group_id = kwargs.get('default_group_id')
+        source_groups = PADSTimerGroup.objects.filter(
+                creator_user_id=source_user_id)
+        target_groups = PADSTimerGroup.objects.filter(
+                creator_user_id=self.user_id)
+        source_timers = PADSTimer.objects.filter(
+                creator_user_id=source_user_id)
 
-            # Transfer Timer Groups
-            timer_groups_in_db = source_user.padstimergroup_set.all()
-            for tg in timer_groups_in_db:
-                tg.creator_user_id = self.user_id
-                tg.save()
+        with transaction.atomic():
+            # Combine Timer Groups with clashing names, as a User may only
+            # have one Group of the same name
+            target_group_ids = dict(target_groups.values_list('name', 'id'))
+            clashing_groups = source_groups.filter(
+                    name__in=target_group_ids.keys()).values_list('id', 'name')
+            for source_group_id, name in clashing_groups:
+                target_group_id = target_group_ids[name]
+                # A Timer may only be in a Group once
+                GroupInclusion.objects.filter(
+                    group_id=source_group_id,
+                    timer_id__in=GroupInclusion.objects.filter(
+                        group_id=target_group_id).values('timer_id')
+                    ).delete()
+                GroupInclusion.objects.filter(
+                        group_id=source_group_id).update(
+                                group_id=target_group_id)
+            source_groups.filter(name__in=target_group_ids.keys()).delete()
+            
+            # Transfer the remaining Timer Groups
+            source_groups.update(creator_user_id=self.user_id)
+            
+            # Optionally transfer ungrouped Timers into a default group
+            if default_group_id is not None:
+                if target_groups.filter(pk=default_group_id).exists():
+                    ungrouped_timer_ids = source_timers.filter(
+                            groupinclusion__isnull=True).values_list(
+                                    'id', flat=True)
+                    GroupInclusion.objects.bulk_create(
+                        [GroupInclusion(timer_id=i, group_id=default_group_id)
+                         for i in ungrouped_timer_ids])
             
             # Transfer Timers
-            timers_in_db = source_user.padstimer_set.all()
-            for t in timers_in_db:
-                t.creator_user_id = self.user_id    
-                t.save()
-                # Optionally transfer ungrouped timers into a default group
-                default_group_id = kwargs.get("default_group_id")
-                if default_group_id:
-                    if t.groupinclusion_set.count() <= 0:
-                        inclusion = GroupInclusion()
-                        inclusion.group_id = default_group_id
-                        inclusion.timer_id = t.id
-                        inclusion.save()
+            timers_transferred = source_timers.update(
+                    creator_user_id=self.user_id)
+            
             # Delete Source User
-            self.delete_user(source_user_id)
+            source_user.delete()
+        if timers_transferred > 0:
+            # Public Timers show their creator
+            invalidate_public_timers()
+        return True
 
     def generate_ql_password(self, length, segments, 
         chars, separator=settings['ql_password_seg_separator']):
@@ -834,6 +1044,7 @@ class PADSWriteUserHelper(PADSWriteHelper):
         nickname_short = "{0}{1}".format(
             settings['ql_user_name_prefix'], nickname_suffix)
         new_user = self.prepare_user_in_db(nickname_short, raw_password)
+        new_user.is_quick_list = True
         
         output = (new_user, raw_password)
         return output
@@ -850,4 +1061,4 @@ class PADSWriteUserHelper(PADSWriteHelper):
 
         # Other stuff
         self.password_hasher = kwargs.get('password_hasher', 
-                                          PBKDF2PasswordHasher())
+                                          PADSPasswordHasher())
@@ -0,0 +1,43 @@
+#
+#
+# Public Archive of Days Since Timers
+# Timer Reset Count Backfill Command
+#
+#
+"""Recalculates the reset count and the times of the two latest resets of
+every Timer from the Reset History, including archived entries. The
+counts are first filled in by migration 0003; run this if they are ever
+found to be out of step with the Reset History:
+    python manage.py backfill_timer_resets
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from padsweb.models import PADSArchivedTimerReset, PADSTimer
+from padsweb.models import PADSTimerReset
+
+class Command(BaseCommand):
+    help = 'Recalculates the reset counts and times of all Timers'
+
+    def handle(self, *args, **options):
+        resets = PADSTimerReset.objects.filter(timer_id=OuterRef('pk'))
+        resets_latest_first = resets.order_by('-date_time').values(
+            'date_time')
+        reset_counts = resets.order_by().values('timer_id').annotate(
+            c=Count('pk')).values('c')
+        archived_reset_counts = PADSArchivedTimerReset.objects.filter(
+            timer_id=OuterRef('pk')).order_by().values('timer_id').annotate(
+                c=Count('pk')).values('c')
+        # All Timers are updated with a single query
+        with transaction.atomic():
+            timers_updated = PADSTimer.objects.update(
+                reset_count=Coalesce(
+                    Subquery(reset_counts, output_field=IntegerField()), 0)
+                    + Coalesce(Subquery(archived_reset_counts, 
+                                        output_field=IntegerField()), 0),
+                reset_latest_date_time=Subquery(resets_latest_first[:1]),
+                reset_previous_date_time=Subquery(resets_latest_first[1:2]))
+        self.stdout.write(
+            'Updated reset counts of {0} Timers'.format(timers_updated))
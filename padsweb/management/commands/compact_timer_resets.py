@@ -0,0 +1,113 @@
+#
+#
+# Public Archive of Days Since Timers
+# Timer Reset History Compaction Command
+#
+#
+"""Moves old entries of the Reset History of every Timer into the archive,
+and counts them in yearly summaries which are shown on the Timer's page
+instead. Archived entries are still included in exports. Run this from
+time to time on long-lived databases, for example daily from cron:
+    python manage.py compact_timer_resets
+
+The entries of the two latest resets of each Timer are never archived.
+These are found from the Reset History itself, so that Timers whose reset
+times have not been filled in by backfill_timer_resets are also safe.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+from padsweb.models import PADSArchivedTimerReset, PADSTimerReset
+from padsweb.models import PADSTimerResetSummary
+from padsweb.settings import defaults
+
+# Standard Library Imports
+import datetime
+
+class Command(BaseCommand):
+    help = 'Archives old Reset History entries and counts them by year'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--keep-days', type=int,
+            default=defaults['timer_reset_archive_age'],
+            help='Archive entries older than this many days')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Number of entries to archive per transaction')
+
+    def compact_batch(self, resets):
+        """Archives a batch of Reset History entries and adds them to
+        the yearly summaries of their Timers.
+        """
+        # Work out the summaries of the batch
+        summaries_new = dict()
+        for r in resets:
+            key = (r.timer_id, timezone.localtime(r.date_time).year)
+            summary = summaries_new.get(key)
+            if summary is None:
+                summaries_new[key] = PADSTimerResetSummary(
+                    timer_id=r.timer_id, year=key[1], reset_count=1,
+                    first_date_time=r.date_time, last_date_time=r.date_time)
+            else:
+                summary.reset_count += 1
+                summary.first_date_time = min(summary.first_date_time,
+                                              r.date_time)
+                summary.last_date_time = max(summary.last_date_time,
+                                             r.date_time)
+
+        # Merge with summaries from earlier runs
+        timer_ids = set([k[0] for k in summaries_new.keys()])
+        years = set([k[1] for k in summaries_new.keys()])
+        summaries_existing = PADSTimerResetSummary.objects.select_for_update(
+            ).filter(timer_id__in=timer_ids, year__in=years)
+        summaries_updated = []
+        for s in summaries_existing:
+            summary = summaries_new.pop((s.timer_id, s.year), None)
+            if summary is not None:
+                s.reset_count += summary.reset_count
+                s.first_date_time = min(s.first_date_time,
+                                        summary.first_date_time)
+                s.last_date_time = max(s.last_date_time,
+                                       summary.last_date_time)
+                summaries_updated.append(s)
+        PADSTimerResetSummary.objects.bulk_update(
+            summaries_updated,
+            ['reset_count', 'first_date_time', 'last_date_time'])
+        PADSTimerResetSummary.objects.bulk_create(summaries_new.values())
+
+        # Move the entries into the archive
+        PADSArchivedTimerReset.objects.bulk_create(
+            [PADSArchivedTimerReset(timer_id=r.timer_id,
+                                    date_time=r.date_time, reason=r.reason)
+             for r in resets])
+        PADSTimerReset.objects.filter(
+            pk__in=[r.pk for r in resets]).delete()
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - datetime.timedelta(
+            days=options['keep_days'])
+        batch_size = max(options['batch_size'], 1)
+        # Only entries older than the second latest entry of their Timer
+        #  are archived. Timers with fewer than two entries get NULL from
+        #  the subquery, and have none of their entries archived.
+        resets_previous = PADSTimerReset.objects.filter(
+            timer_id=OuterRef('timer_id')).order_by('-date_time').values(
+                'date_time')[1:2]
+        resets_old = PADSTimerReset.objects.filter(
+            date_time__lt=cutoff).filter(
+                date_time__lt=Subquery(resets_previous)).order_by('pk')
+        resets_archived = 0
+        last_pk = 0
+        while True:
+            with transaction.atomic():
+                resets = list(resets_old.filter(pk__gt=last_pk)[:batch_size])
+                if len(resets) <= 0:
+                    break
+                self.compact_batch(resets)
+            resets_archived += len(resets)
+            last_pk = resets[-1].pk
+        self.stdout.write(
+            'Archived {0} Reset History entries'.format(resets_archived))
@@ -0,0 +1,85 @@
+# Generated by Django 2.2.28 on 2026-10-18 15:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupInclusion',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PADSUser',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('password_hash', models.CharField(max_length=280)),
+                ('sign_up_date_time', models.DateTimeField()),
+                ('last_login_date_time', models.DateTimeField()),
+                ('nickname_short', models.SlugField(max_length=24, unique=True)),
+                ('nickname', models.CharField(max_length=255)),
+                ('time_zone', models.CharField(max_length=255)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PADSTimerGroup',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=280)),
+                ('creator_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='padsweb.PADSUser')),
+            ],
+            options={
+                'unique_together': {('creator_user', 'name')},
+            },
+        ),
+        migrations.CreateModel(
+            name='PADSTimer',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('creation_date_time', models.DateTimeField()),
+                ('count_from_date_time', models.DateTimeField()),
+                ('description', models.CharField(max_length=280)),
+                ('public', models.BooleanField()),
+                ('historical', models.BooleanField()),
+                ('running', models.BooleanField()),
+                ('permalink_code', models.CharField(max_length=10)),
+                ('creator_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='padsweb.PADSUser')),
+                ('in_groups', models.ManyToManyField(through='padsweb.GroupInclusion', to='padsweb.PADSTimerGroup')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='groupinclusion',
+            name='group',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='padsweb.PADSTimerGroup'),
+        ),
+        migrations.AddField(
+            model_name='groupinclusion',
+            name='timer',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='padsweb.PADSTimer'),
+        ),
+        migrations.CreateModel(
+            name='PADSTimerReset',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date_time', models.DateTimeField()),
+                ('reason', models.CharField(max_length=280)),
+                ('timer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='padsweb.PADSTimer')),
+            ],
+            options={
+                'unique_together': {('timer', 'date_time')},
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='groupinclusion',
+            unique_together={('timer', 'group')},
+        ),
+    ]
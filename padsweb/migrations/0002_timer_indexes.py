@@ -0,0 +1,30 @@
+# Generated by Django 2.2.28 on 2026-10-18 15:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('padsweb', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='padstimer',
+            name='permalink_code',
+            field=models.CharField(max_length=10, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='padstimer',
+            index=models.Index(fields=['public', 'count_from_date_time', 'id'], name='padsweb_timer_pub_cfdt_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='padstimer',
+            index=models.Index(fields=['public', 'creation_date_time', 'id'], name='padsweb_timer_pub_cdt_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='padstimer',
+            index=models.Index(fields=['creator_user', 'public', 'count_from_date_time'], name='padsweb_timer_usr_pub_cfdt_idx'),
+        ),
+    ]
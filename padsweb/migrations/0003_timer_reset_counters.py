@@ -0,0 +1,49 @@
+# Generated by Django 2.2.28 on 2026-10-18 15:11
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_timer_resets(apps, schema_editor):
+    # The same calculation as the backfill_timer_resets command, done
+    # with the models of this migration. There is no Reset History
+    # archive yet at this point.
+    PADSTimer = apps.get_model('padsweb', 'PADSTimer')
+    PADSTimerReset = apps.get_model('padsweb', 'PADSTimerReset')
+    resets = PADSTimerReset.objects.filter(timer_id=OuterRef('pk'))
+    resets_latest_first = resets.order_by('-date_time').values('date_time')
+    reset_counts = resets.order_by().values('timer_id').annotate(
+        c=Count('pk')).values('c')
+    PADSTimer.objects.update(
+        reset_count=Coalesce(
+            Subquery(reset_counts, output_field=IntegerField()), 0),
+        reset_latest_date_time=Subquery(resets_latest_first[:1]),
+        reset_previous_date_time=Subquery(resets_latest_first[1:2]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('padsweb', '0002_timer_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='padstimer',
+            name='reset_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='padstimer',
+            name='reset_latest_date_time',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='padstimer',
+            name='reset_previous_date_time',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_timer_resets,
+                             migrations.RunPython.noop),
+    ]
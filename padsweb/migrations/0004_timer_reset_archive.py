@@ -0,0 +1,40 @@
+# Generated by Django 2.2.28 on 2026-10-18 15:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('padsweb', '0003_timer_reset_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PADSTimerResetSummary',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('reset_count', models.PositiveIntegerField(default=0)),
+                ('first_date_time', models.DateTimeField()),
+                ('last_date_time', models.DateTimeField()),
+                ('timer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='padsweb.PADSTimer')),
+            ],
+            options={
+                'unique_together': {('timer', 'year')},
+            },
+        ),
+        migrations.CreateModel(
+            name='PADSArchivedTimerReset',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date_time', models.DateTimeField()),
+                ('reason', models.CharField(max_length=280)),
+                ('timer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='padsweb.PADSTimer')),
+            ],
+            options={
+                'unique_together': {('timer', 'date_time')},
+            },
+        ),
+    ]
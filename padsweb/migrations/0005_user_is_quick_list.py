@@ -0,0 +1,34 @@
+# Generated by Django 2.2.28 on 2026-10-18 15:41
+
+from django.db import migrations, models
+from django.db.models import Q
+
+
+# Short Nickname prefixes of Quick List Users created before the
+# is_quick_list field was added, by PADSUserHelper and by
+# PADSWriteUserHelper respectively
+QUICK_LIST_PREFIXES = ('Quick List User', 'QuickList')
+
+def flag_quick_list_users(apps, schema_editor):
+    PADSUser = apps.get_model('padsweb', 'PADSUser')
+    prefix_q = Q()
+    for p in QUICK_LIST_PREFIXES:
+        prefix_q |= Q(nickname_short__startswith=p)
+    PADSUser.objects.filter(prefix_q).update(is_quick_list=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('padsweb', '0004_timer_reset_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='padsuser',
+            name='is_quick_list',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.RunPython(flag_quick_list_users,
+                             migrations.RunPython.noop),
+    ]
@@ -8,7 +8,7 @@
 #
 # Imports
 #
-from pytz import all_timezones
+from padsweb.timezones import get_time_zone_choices
 
 # Standard Library Imports
 import random
@@ -24,6 +24,9 @@ class NonMetricMeasureInt:
 	measure, and in PADS, the days-hours-minutes-seconds measure of time.
 	
 	At the moment, this class only supports integer measures.
+	
+	Measures are worked out with integer division only once for every
+	value, and kept until the value is changed.
 	"""
 	
 	#
@@ -34,71 +37,79 @@ class NonMetricMeasureInt:
 	# are totally fine.
 	DEFAULT_SEPARATOR_STR = ", "
 	
+	__slots__ = ('decimal_int_value', 'formatter', 'limits', 
+		'measures_cached', 'negative', 'overflow_unit_label', 
+		'separator_str', 'unit_labels')
+	
+	# Formatters are shared by all measures of the same unit system, 
+	# by units and separator.
+	formatters = dict()
+	
 	def set_value(self, decimal_int_value):
-		self.decimal_int_value = decimal_int_value
+		decimal_int_value = int(decimal_int_value)
+		self.negative = decimal_int_value < 0
+		self.decimal_int_value = abs(decimal_int_value)
+		self.measures_cached = None
 
 	def set_separator_str(self, separator_str):
 		self.separator_str = separator_str
+		self.formatter = self.get_formatter()
 
 	def get_measure(self, measure):
 		"""Returns a single measure."""
-		self.measures = self.get_measures()
-		return self.measures.get(measure)
+		try:
+			return self.get_measures_tuple()[
+				self.formatter.unit_positions[measure]]
+		except KeyError:
+			return None
 
 	def get_measures(self):
 		"""Returns all measures in a dictionary."""
-		output = dict()
-		working_value = self.decimal_int_value
-	
-		# The number of labels and radixes should match. In case of a
-		# mismatch, excess labels or radixes will be ignored.
-		pairs = zip(self.unit_labels, self.limits)
-		
-		# The measures are derived by cumulative division, and recording
-		# the result of every division. 
-		for p in list(pairs):
-			label = p[0]
-			radix = p[1]
-			output[label] = int(working_value % radix)
-			working_value /= radix
+		return dict(zip(self.formatter.units, self.get_measures_tuple()))
+
+	def get_measures_tuple(self):
+		"""Returns all measures in a tuple, in the same order as the units
+		from get_units().
+		"""
+		if self.measures_cached is None:
+			output = []
+			working_value = self.decimal_int_value
 			
-		# If there is some value left after positions have been filled
-		output[self.overflow_unit_label] = int(working_value)
-		return output
+			# The number of labels and radixes should match. In case of a
+			# mismatch, excess labels or radixes will be ignored.
+			# The measures are derived by cumulative division, and recording
+			# the remainder of every division. 
+			for radix in self.limits[:len(self.unit_labels)]:
+				working_value, measure = divmod(working_value, radix)
+				output.append(measure)
+			
+			# If there is some value left after positions have been filled
+			output.append(working_value)
+			self.measures_cached = tuple(output)
+		return self.measures_cached
 	
 	def get_string(self, **kwargs):
 		"""Returns all measures in a string.
 		When the zeroes option is set to True, zero measures will be
 		included in the string.
 		"""
-		output = ""
-		measures = self.get_measures()
-		zeroes = kwargs.get('zeroes', True)
-		
-		# Build string from measures in dictionary, one-by-one
-		for u in self.get_units():
-			u_value = measures[u]
-			if ( (u_value == 0) & (zeroes != True) ):
-				pass
-			else:
-				current_measure = "{0} {1}{2}".format(
-					u_value, u, self.separator_str)
-				output = ''.join([current_measure, output])
-				
-		# Add a negative sign if negative
-		if self.negative == True:
-			output = ''.join(['-', output])
-			
-		# Clean up and return string
-		# TODO: Find a more elegant way to build strings without 
-		# needing to rstrip.
-		return output.rstrip(self.separator_str)
+		return self.formatter.format(
+			self.get_measures_tuple(), self.negative, 
+			kwargs.get('zeroes', True))
 		
 	def get_units(self):
 		"""Returns all units including the overflow unit in a tuple."""
-		output = list(self.unit_labels)
-		output.append(self.overflow_unit_label)
-		return tuple(output)
+		return self.formatter.units
+	
+	def get_formatter(self):
+		key = (tuple(self.unit_labels[:len(self.limits)]), 
+			self.overflow_unit_label, self.separator_str)
+		formatter = self.formatters.get(key)
+		if formatter is None:
+			formatter = NonMetricMeasureFormatter(
+				key[0], self.overflow_unit_label, self.separator_str)
+			self.formatters[key] = formatter
+		return formatter
 		
 	#
 	# Special Methods
@@ -136,19 +147,13 @@ class NonMetricMeasureInt:
 		  You should get a measure of exactly 1 pound.
 		"""
 		
-		self.decimal_int_value = 0
-		self.limits = limits
-		self.negative = False
+		self.limits = tuple(limits)
 		self.overflow_unit_label = overflow_unit_label
-		self.separator_str = self.DEFAULT_SEPARATOR_STR
-		self.unit_labels = unit_labels
+		self.unit_labels = tuple(unit_labels)
 
 		# Set the initial decimal_int_value
-		if decimal_int_value < 0:
-			self.negative = True
-			self.decimal_int_value = abs(decimal_int_value)
-		else:
-			self.decimal_int_value = decimal_int_value
+		self.set_value(decimal_int_value)
+		self.set_separator_str(self.DEFAULT_SEPARATOR_STR)
 	
 	def __str__(self):
 		return self.get_string(zeroes=True)
@@ -157,19 +162,67 @@ class NonMetricMeasureInt:
 		return self.__str__()
 
 
+class NonMetricMeasureFormatter:
+	"""Formats the measures of a NonMetricMeasureInt into a string. The
+	format is prepared once for every unit system and separator, and
+	shared by all measures of the system.
+	"""
+	
+	__slots__ = ('separator_str', 'template', 'unit_positions', 'units')
+	
+	def format(self, measures, negative=False, zeroes=True):
+		"""Returns measures as a string, largest unit first. The measures
+		are to be in a tuple, in the same order as the units.
+		"""
+		if zeroes is True:
+			output = self.template.format(*measures)
+		else:
+			output = self.separator_str.join(
+				['{0} {1}'.format(measures[i], self.units[i])
+					for i in range(len(measures) - 1, -1, -1)
+					if measures[i] != 0])
+		
+		# Add a negative sign if negative
+		if negative is True:
+			output = ''.join(['-', output])
+		return output
+	
+	def __init__(self, unit_labels, overflow_unit_label, separator_str):
+		self.separator_str = separator_str
+		self.units = tuple(unit_labels) + (overflow_unit_label,)
+		self.unit_positions = dict(
+			[(u, i) for i, u in enumerate(self.units)])
+		# Braces in unit labels must not be mistaken for fields
+		self.template = separator_str.replace('{', '{{').replace(
+			'}', '}}').join(
+			['{{{0}}} {1}'.format(i, self.units[i].replace(
+				'{', '{{').replace('}', '}}'))
+				for i in range(len(self.units) - 1, -1, -1)])
+
+
 #
 # Functions
 #
+def get_one_or_none(queryset, **kwargs):
+	"""Looks up a single item from a QuerySet by the field lookups in 
+	kwargs, using one database query. Returns None if there is no such item.
+	
+	Beginner's PROTIP: Checking if an item exists() before calling get()
+	on the same lookup costs two trips to the database.
+	"""
+	try:
+		return queryset.get(**kwargs)
+	except queryset.model.DoesNotExist:
+		return None
+
 def get_timezones_all():
 	"""Dump the list of timezones from ptyz into a format suitable 
-	for use with the Django Forms API's ChoiceField
+	for use with the Django Forms API's ChoiceField.
+	
+	The choices are prepared only once, see padsweb.timezones for 
+	choices limited to a region.
 	"""
-	# TODO: Find a more user-friendly way of managing 500+ timezones
-
-	output = []
-	for tz in all_timezones:
-		output.append( (tz, tz) )
-	return output
+	return list(get_time_zone_choices())
 
 def split_posint_rand(i, n):
 	""" Split a positive integer i into four random numbers that add up
@@ -26,6 +26,10 @@ class PADSUser(models.Model):
     # TODO: Find out the maximum length of a tz database entry name
     time_zone = models.CharField(
             max_length=settings['name_max_length_long'])
+    # Quick List Users are flagged when their accounts are created, so
+    # that they can be told apart from regular Users without checking
+    # the prefix of their Short Nicknames.
+    is_quick_list = models.BooleanField(default=False, db_index=True)
     def __str__(self):
         return "{0} ({1})".format(self.nickname_short, self.nickname)
     
@@ -54,12 +58,34 @@ class PADSTimer(models.Model):
     historical = models.BooleanField()
     running = models.BooleanField()
     permalink_code = models.CharField(
-            max_length=settings['timer_permalink_code_length'])
+            max_length=settings['timer_permalink_code_length'], unique=True)
     in_groups = models.ManyToManyField(
         PADSTimerGroup,
         through = 'GroupInclusion',
         through_fields = ('timer','group')
     )
+    # The number of entries in the Timer's Reset History, and the times of
+    # the two latest entries. These are kept up to date by the Timer Helpers
+    # whenever an entry is added, so that the Reset History need not be
+    # loaded just to be counted.
+    reset_count = models.PositiveIntegerField(default=0)
+    reset_latest_date_time = models.DateTimeField(null=True, blank=True)
+    reset_previous_date_time = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # For the public Timer indexes, including keyset pagination
+            #  of the longest running and recently reset Timers...
+            models.Index(fields=['public', 'count_from_date_time', 'id'], 
+                         name='padsweb_timer_pub_cfdt_idx'),
+            #  ...and of the newest Timers
+            models.Index(fields=['public', 'creation_date_time', 'id'], 
+                         name='padsweb_timer_pub_cdt_idx'),
+            # For a User's own Timers
+            models.Index(
+                fields=['creator_user', 'public', 'count_from_date_time'],
+                name='padsweb_timer_usr_pub_cfdt_idx'),
+            ]
 
     def __str__(self):
         if len(self.description) > settings['name_max_length_short']:
@@ -94,3 +120,37 @@ class PADSTimerReset(models.Model):
     class Meta:
         # A timer may only be reset once at the same exact moment
         unique_together = (("timer", "date_time"))
+
+
+class PADSArchivedTimerReset(models.Model):
+    """An entry in a Timer's Reset History that has been moved out of the
+    PADSTimerReset table by the compact_timer_resets command. Archived 
+    entries are not shown on the Timer's page, but are still exported.
+    """
+    timer = models.ForeignKey(PADSTimer, on_delete=models.CASCADE)
+    date_time = models.DateTimeField()
+    reason = models.CharField(max_length=settings['message_max_length_short'])
+
+    def __str__(self):
+        return "({0}) {1}".format(self.date_time,self.reason)
+
+    class Meta:
+        unique_together = (("timer", "date_time"))
+
+
+class PADSTimerResetSummary(models.Model):
+    """The number and times of the first and last archived Reset History
+    entries of a Timer in a single year
+    """
+    timer = models.ForeignKey(PADSTimer, on_delete=models.CASCADE)
+    year = models.PositiveSmallIntegerField()
+    reset_count = models.PositiveIntegerField(default=0)
+    first_date_time = models.DateTimeField()
+    last_date_time = models.DateTimeField()
+
+    def __str__(self):
+        return "{0}: {1} resets".format(self.year, self.reset_count)
+
+    class Meta:
+        # A Timer has only one summary per year
+        unique_together = (("timer", "year"))
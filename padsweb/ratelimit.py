@@ -0,0 +1,222 @@
+#
+#
+# Public Archive of Days Since Timers
+# Sign-in Rate Limiting
+#
+#
+"""Limits the rate of sign-in attempts with token buckets, so that a burst
+of guessed passwords cannot tie up every worker with password hashing.
+
+Every sign-in attempt takes a token from a bucket for the client's IP
+address, and another from a bucket for the account (a username or Quick
+List id). An attempt is turned away, before the password is checked, if
+either bucket is empty. Buckets refill at a steady rate up to their size,
+and the tokens of a successful sign-in are given back, so that only
+failed attempts count against the limit.
+
+The buckets are kept in the memory of each process by default. As each
+process then has its own buckets, deployments with more than one process
+should set sign_in_rate_limit_backend to 'cache', to keep the buckets in
+Django's cache (such as Memcached or the database cache) instead.
+Updates to buckets in the cache are not atomic, thus concurrent attempts
+in different processes may occasionally take the same token.
+"""
+
+from django.core.cache import cache
+from padsweb.settings import defaults
+
+# Standard Library Imports
+import abc, threading, time
+
+#
+# Constants
+#
+RATE_LIMIT_KEY_PREFIX = 'padsweb:ratelimit'
+
+#
+# Token Bucket Backends
+#
+class PADSRateLimitBackend(abc.ABC):
+    """Base class for token bucket backends. Buckets are kept as tuples
+    of the number of tokens, and the time the tokens were counted.
+    Backends must implement take(), give_back() and clear().
+    """
+    def get_tokens(self, bucket, size, rate, now):
+        """Returns the number of tokens in a bucket as of the time now,
+        after refilling it at the rate of tokens per second.
+        """
+        if bucket is None:
+            return size
+        tokens, counted_time = bucket
+        return min(size, tokens + (now - counted_time) * rate)
+
+    @abc.abstractmethod
+    def take(self, key, size, rate):
+        """Takes a token from the bucket of a key, if there is one.
+        Returns True if a token was taken.
+        """
+
+    @abc.abstractmethod
+    def give_back(self, key, size, rate):
+        """Returns a token to the bucket of a key, up to the bucket size."""
+
+    @abc.abstractmethod
+    def clear(self):
+        """Empties all buckets where possible. This is intended for
+        testing.
+        """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+
+
+class PADSMemoryRateLimitBackend(PADSRateLimitBackend):
+    """Keeps token buckets in a dictionary in the memory of the process.
+    Buckets are forgotten once full, to keep the dictionary small.
+    """
+    def update(self, key, size, rate, change):
+        with self.lock:
+            now = self.clock()
+            tokens = self.get_tokens(self.buckets.get(key), size, rate, now)
+            if tokens + change < 0:
+                return False
+            tokens = min(size, tokens + change)
+            if tokens >= size:
+                self.buckets.pop(key, None)
+            else:
+                self.buckets[key] = (tokens, now)
+            return True
+
+    def take(self, key, size, rate):
+        return self.update(key, size, rate, -1)
+
+    def give_back(self, key, size, rate):
+        self.update(key, size, rate, 1)
+
+    def clear(self):
+        with self.lock:
+            self.buckets.clear()
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.buckets = dict()
+        self.lock = threading.Lock()
+
+
+class PADSCacheRateLimitBackend(PADSRateLimitBackend):
+    """Keeps token buckets in Django's cache, to share them between
+    processes. Buckets expire from the cache once they would have been
+    refilled. The clock must be the same in every process, so the
+    wall clock time is used by default.
+    """
+    def get_cache_key(self, key):
+        return '{0}:{1}'.format(RATE_LIMIT_KEY_PREFIX, key)
+
+    def update(self, key, size, rate, change):
+        cache_key = self.get_cache_key(key)
+        now = self.clock()
+        tokens = self.get_tokens(self.cache.get(cache_key), size, rate, now)
+        if tokens + change < 0:
+            return False
+        tokens = min(size, tokens + change)
+        if tokens >= size:
+            self.cache.delete(cache_key)
+        else:
+            timeout = int((size - tokens) / rate) + 1
+            self.cache.set(cache_key, (tokens, now), timeout)
+        return True
+
+    def take(self, key, size, rate):
+        return self.update(key, size, rate, -1)
+
+    def give_back(self, key, size, rate):
+        self.update(key, size, rate, 1)
+
+    def clear(self):
+        # Not every cache can list its keys to find the buckets. Buckets
+        #  in the cache expire by themselves.
+        pass
+
+    def __init__(self, clock=time.time, **kwargs):
+        super().__init__(clock=clock)
+        self.cache = kwargs.get('cache', cache)
+
+#
+# Rate Limiter
+#
+class PADSSignInRateLimiter:
+    """Decides if sign-in attempts may go ahead, by the buckets of the
+    client's IP address and of the account.
+    """
+    def get_backend(self):
+        name = defaults['sign_in_rate_limit_backend']
+        if name is None:
+            return None
+        if name not in self.backends:
+            self.backends[name] = self.backend_classes[name]()
+        return self.backends[name]
+
+    def get_buckets(self, ip_address, account):
+        """Returns a list of (key, size, rate) tuples of the buckets
+        that an attempt takes tokens from.
+        """
+        buckets = []
+        if ip_address:
+            buckets.append(('ip:{0}'.format(ip_address),
+                            defaults['sign_in_rate_limit_ip_burst'],
+                            defaults['sign_in_rate_limit_ip_per_minute']/60))
+        if account:
+            buckets.append(('account:{0}'.format(str(account).lower()),
+                            defaults['sign_in_rate_limit_account_burst'],
+                            defaults['sign_in_rate_limit_account_per_minute']
+                            /60))
+        return buckets
+
+    def allow(self, ip_address, account):
+        """Takes a token from the buckets of an attempt. Returns True if
+        the attempt may go ahead. Tokens already taken are given back if
+        any of the buckets is empty.
+        """
+        backend = self.get_backend()
+        if backend is None:
+            return True
+        taken = []
+        for b in self.get_buckets(ip_address, account):
+            if backend.take(*b) is False:
+                for t in taken:
+                    backend.give_back(*t)
+                return False
+            taken.append(b)
+        return True
+
+    def succeeded(self, ip_address, account):
+        """Gives back the tokens of a successful sign-in attempt."""
+        backend = self.get_backend()
+        if backend is None:
+            return
+        for b in self.get_buckets(ip_address, account):
+            backend.give_back(*b)
+
+    def clear(self):
+        for b in self.backends.values():
+            b.clear()
+
+    def __init__(self, **kwargs):
+        self.backend_classes = kwargs.get('backend_classes', {
+            'cache' : PADSCacheRateLimitBackend,
+            'memory' : PADSMemoryRateLimitBackend,
+            })
+        self.backends = dict()
+
+sign_in_rate_limiter = PADSSignInRateLimiter()
+
+#
+# Functions
+#
+def get_client_ip_address(request):
+    """Returns the IP address of the client that sent a request.
+    Forwarding headers such as X-Forwarded-For can be made up by clients,
+    and are not read. Behind a proxy, REMOTE_ADDR must be set to the
+    client's address before the request reaches PADS.
+    """
+    return request.META.get('REMOTE_ADDR')
@@ -27,12 +27,47 @@ defaults_content = {
         'ql_password_seg_separator' : '-',
         'ql_user_name_prefix' : 'QuickList',
         'ql_user_name_suffix_length' : 12,
+        # Password hashing, see padsweb.hashers
+        'password_hasher' : 'pbkdf2', # or 'scrypt', or 'argon2'
+        'password_hash_workers' : 2, # set to 0 to hash on request threads
+        'password_pbkdf2_iterations' : 150000,
         'password_salt_bytes' : 48,
+        'password_scrypt_n' : 16384,
+        'password_scrypt_p' : 1,
+        'password_scrypt_r' : 8,
+        # Sign-in attempt rate limits, see padsweb.ratelimit. The backend
+        # may be 'memory', 'cache', or None to turn off rate limiting.
+        'sign_in_rate_limit_backend' : 'memory',
+        'sign_in_rate_limit_account_burst' : 5,
+        'sign_in_rate_limit_account_per_minute' : 5,
+        'sign_in_rate_limit_ip_burst' : 30,
+        'sign_in_rate_limit_ip_per_minute' : 30,
+        # Pragmas set on new SQLite connections, see padsweb.sqlite_tuning
+        'sqlite_tuning' : True,
+        'sqlite_busy_timeout' : 5000, # milliseconds
+        'sqlite_cache_size' : -16384, # negative sizes are in KiB
+        'sqlite_journal_mode' : 'WAL',
+        'sqlite_mmap_size' : 134217728, # 128 MiB
+        'sqlite_synchronous' : 'NORMAL',
+        # Most Timers that may be changed at once from the Personal index,
+        # SQLite allows up to 999 variables in a single query
+        'timer_bulk_max' : 500,
         'timer_recent_max_age' : 7,
+        # Reset History entries older than this many days are archived by
+        # the compact_timer_resets command
+        'timer_reset_archive_age' : 365,
         'timer_description_length_short' : 140, # One Tweet
+        'timer_export_chunk_size' : 100, # Timers loaded at once for export
         'timer_permalink_code_length' : 10,
         'user_id_signed_out' : -1, # User id when no User has signed in
+        # Seconds to keep the rendered public Timer indexes in the cache,
+        # set to 0 to disable caching
+        'view_fragment_cache_timeout' : 60,
         'view_items_per_page' : 6,
+        'view_reset_history_page_size' : 20,
+        # Paginate the longest running, recently reset and newest Timer 
+        # indexes by cursor instead of page number
+        'view_keyset_pagination' : False,
         }
 defaults = PADSStringDictionary(defaults_content,
                                 "PADS Hard-coded Default Settings")
@@ -0,0 +1,45 @@
+#
+#
+# Public Archive of Days Since Timers
+# SQLite Connection Tuning
+#
+#
+"""Tunes new SQLite database connections for sites served from a single
+node, such as the demo container. By default, SQLite blocks all readers
+while a Timer is being reset. In WAL (write-ahead log) mode, readers
+carry on during writes, and with synchronous=NORMAL, writes are synced
+to disk only at checkpoints instead of at every commit.
+
+The pragmas are taken from the sqlite_* settings in padsweb.settings, and
+are set on every new connection by the connection_created signal receiver
+connected in PadswebConfig.ready(). Other databases are left alone.
+"""
+
+from padsweb.settings import defaults
+
+#
+# Functions
+#
+def get_sqlite_pragmas():
+    """Returns a list of (name, value) tuples of the pragmas to be set on
+    new SQLite connections, in the order they are to be set.
+    """
+    return [
+        ('journal_mode', defaults['sqlite_journal_mode']),
+        ('synchronous', defaults['sqlite_synchronous']),
+        ('busy_timeout', defaults['sqlite_busy_timeout']),
+        ('cache_size', defaults['sqlite_cache_size']),
+        ('mmap_size', defaults['sqlite_mmap_size']),
+        ]
+
+def tune_sqlite_connection(sender, connection, **kwargs):
+    """Receiver for Django's connection_created signal which sets the
+    pragmas from get_sqlite_pragmas() on new SQLite connections.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    if defaults['sqlite_tuning'] is False:
+        return
+    with connection.cursor() as cursor:
+        for name, value in get_sqlite_pragmas():
+            cursor.execute('PRAGMA {0} = {1}'.format(name, value))
@@ -26,30 +26,62 @@ class PADSStringDictionary:
     def get_patch_level(self):
         return (len(self.patches) ) - 1
 
+    def get_flat(self):
+        """Returns a dictionary of all strings in the dictionary and its
+        patches, as they would be looked up. The dictionary is merged
+        only when first needed after a patch, and kept for later lookups.
+
+        Unpatched dictionaries return their own strings, thus changes to
+        the strings are seen immediately. The strings of patched 
+        dictionaries are best changed by applying another patch, as 
+        changes made by other means may not be seen until then.
+        """
+        if self.flat is None:
+            if self.get_patch_level() <= 0:
+                self.flat = self.strings
+            else:
+                flat = dict(self.strings)
+                for p in self.patches[1:]:
+                    if isinstance(p, PADSStringDictionary):
+                        flat.update(p.get_flat())
+                    else:
+                        flat.update(p)
+                self.flat = flat
+        return self.flat
+
     def get_string(self, name):
         """Gets a string of a specified name from the string dictionary.
-        For unpatched dictionaries, a straightforward string lookup
-        is performed from the internal dictionary.
-
-        For patched dictonaries, a recursive search is peformed, starting
-        with the string dictionary at the highest patch level, moving on
-        to the lower levels if the string cannot be found.
 
-        PADSStringDictionary is aware of recursion loops, but this
-        awareness is dependent upon the host Python interpreter to detect
-        the recursion loop.
+        For patched dictonaries, strings are taken from the patch at the
+        highest patch level containing the string, and then from the
+        lower levels if the string cannot be found. Rather than searching
+        the patches on every lookup, the strings of all levels are merged
+        into a single dictionary (see get_flat()).
         """
-
-        level = self.get_patch_level()
-        while(level >= 1):
-            try:
-                return self.patches[level][name]
-            except KeyError:
-                level -= 1
-            except RecursionError:
-                self.infinite_loop = True
-                break
-        return self.strings[name]
+        flat = self.flat
+        if flat is None:
+            flat = self.get_flat()
+        return flat[name]
+
+    def depends_on(self, string_dict):
+        """Returns True if string_dict is this dictionary, or one of its 
+        patches at any level.
+        """
+        if string_dict is self:
+            return True
+        for p in self.patches[1:]:
+            if isinstance(p, PADSStringDictionary):
+                if p.depends_on(string_dict):
+                    return True
+        return False
+
+    def invalidate(self):
+        """Discards the merged strings of the dictionary, and of all
+        dictionaries patched with it.
+        """
+        self.flat = None
+        for d in self.dependents:
+            d.invalidate()
 
     def patch(self, string_dict):
         """Attaches a patch PADSStringDictionary. Patch dictionaries
@@ -59,31 +91,47 @@ class PADSStringDictionary:
         patching dictionary.
 
         Multiple patches can be applied to a single dictionary. Please
-        be aware that patched dictionaries can also be used as patches,
-        so take care to avoid recursion loops (e.g. dict_a patched by
-        dict_b, which is patched by dict_a).
+        be aware that patched dictionaries can also be used as patches.
+        Patches that would cause a recursion loop (e.g. dict_a patched by 
+        dict_b, which is patched by dict_a) are refused, and both 
+        dictionaries are flagged with infinite_loop.
         """
         if(string_dict != self):
+            if isinstance(string_dict, PADSStringDictionary):
+                if string_dict.depends_on(self):
+                    self.infinite_loop = True
+                    string_dict.infinite_loop = True
+                    return
+                string_dict.dependents.append(self)
             self.patches.append(string_dict)
             self.description = None
+            self.invalidate()
 
     def __getitem__(self, key):
-        return self.get_string(key)
+        # Same as get_string(), without the extra call
+        flat = self.flat
+        if flat is None:
+            flat = self.get_flat()
+        return flat[key]
 
     def __init__(self, init_dict, description):
         self.description = description
         self.patches = [self]  # First entry in patch list is self
         self.strings = init_dict
         self.infinite_loop = False
+        # Merged strings, see get_flat()
+        self.flat = None
+        # Dictionaries patched with this dictionary
+        self.dependents = []
 
     def __repr__(self):
         return self.__str__()
 
     def __str__(self):
         pre_output = 'String Dictionary: {0}'.format(self.description)
-        has_inf_loop = None
+        has_inf_loop = ''
         if self.infinite_loop:
-            has_inf_loop = '(has Infinite Loop)'
+            has_inf_loop = ' (has Infinite Loop)'
         return ''.join([pre_output, has_inf_loop])
 
 #
@@ -127,6 +175,12 @@ labels_en_au_dict = {
     'REASON_NONE' : 'No Reason Given',
     'SECOND' : 'Second',
     'TIME_ZONE' : 'Time Zone',
+    'TIMER_BULK_ADD_TO_GROUP' : 'Add to Timer Group',
+    'TIMER_BULK_OPERATION' : 'Operation',
+    'TIMER_BULK_RESET' : 'Reset',
+    'TIMER_BULK_SHARE' : 'Share',
+    'TIMER_BULK_STOP' : 'Stop or Suspend',
+    'TIMER_BULK_UNSHARE' : 'Make Private',
     'TIMER_CREATE_HISTORICAL' : 'Create a Historical Timer',
     'TIMER_FIRST_HISTORY' : 'First History Entry',
     'TIMER_USE_CURRENT_DATE_TIME' : 'Use the current Date and Time',
@@ -181,6 +235,13 @@ messages_en_au_dict = {
 
         'TIMER_NOT_FOUND' : '''Timer not found or available. ''',
 
+        'TIMER_SETTINGS_BULK_DONE'
+            : '''{0} of your Timers have been updated.''',
+
+        'TIMER_SETTINGS_BULK_TOO_MANY'
+            : '''Only up to {0} Timers may be updated at once, please
+            select fewer Timers.''',
+
         'TIMER_SETTINGS_ADDED_TO_GROUP'
             : '''Your Timer has been added to the group.''',
 
@@ -283,6 +344,10 @@ messages_en_au_dict = {
             This may be because your have attempted to sign in with
             a blank username or password.''',
 
+        'USER_SIGN_IN_RATE_LIMITED'
+            : '''There have been too many attempts to sign in. Please
+            wait a minute before trying again.''',
+
         'USER_SIGN_IN_REDIRECT'
             : '''Please sign in with your username and password,
             or with a Quick List password from the sign-in screen.''',
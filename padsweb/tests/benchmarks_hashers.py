@@ -0,0 +1,86 @@
+#
+#
+# Public Archive of Days Since Timers
+# Password Hasher Benchmarks
+#
+#
+"""Measures the number of password checks, as made on every sign-in, that
+each available password hasher gets through per second on a single core.
+The checks are also run from many threads at once through the hashing
+pool, to show the throughput when the pool is saturated.
+
+This module is not picked up by the test runner by default. To run the
+benchmarks, name the module explicitly:
+    python manage.py test padsweb.tests.benchmarks_hashers
+
+The seconds per run and the number of threads are set through environment
+variables, for example:
+    PADS_BENCHMARK_SECONDS=5 PADS_BENCHMARK_THREADS=16 \\
+    python manage.py test padsweb.tests.benchmarks_hashers
+"""
+
+# Django Features
+from django.test import SimpleTestCase
+
+# Standard Library Imports
+import os, threading, time
+from unittest import mock
+
+# Modules to be tested
+from padsweb.hashers import PADSPasswordHasher
+from padsweb.hashers import get_password_hasher_names_available
+from padsweb.settings import defaults
+
+#
+# Benchmark Settings
+#
+def get_setting(name, default):
+    return type(default)(os.environ.get(
+        'PADS_BENCHMARK_{0}'.format(name), default))
+
+BENCHMARK_SECONDS = get_setting('SECONDS', 2.0)
+BENCHMARK_THREADS = get_setting('THREADS', 8)
+
+class PasswordHasherBenchmarks(SimpleTestCase):
+    password = '    abcdABCD1234'
+    salt = 'benchmark-salt'
+
+    def run_checks(self, password_hasher, encoded, threads):
+        """Checks the password from a number of threads at once for
+        BENCHMARK_SECONDS. Returns the number of checks per second.
+        """
+        counts = [0] * threads
+        deadline = time.perf_counter() + BENCHMARK_SECONDS
+
+        def work(i):
+            while time.perf_counter() < deadline:
+                password_hasher.verify(self.password, encoded)
+                counts[i] += 1
+
+        worker_threads = [threading.Thread(target=work, args=(i,))
+                          for i in range(0, threads)]
+        start = time.perf_counter()
+        for t in worker_threads:
+            t.start()
+        for t in worker_threads:
+            t.join()
+        return sum(counts) / (time.perf_counter() - start)
+
+    def test_sign_ins_per_second(self):
+        workers = defaults['password_hash_workers']
+        print('\n{0}s per run, {1} request threads, {2} hashing '
+              'workers'.format(BENCHMARK_SECONDS, BENCHMARK_THREADS, workers))
+        print('{0:<12}{1:>20}{2:>20}{3:>20}'.format(
+            'hasher', 'sign-ins/s/core', 'sign-ins/s (pool)',
+            '/s/worker (pool)'))
+        for name in get_password_hasher_names_available():
+            password_hasher = PADSPasswordHasher(name)
+            encoded = password_hasher.encode(self.password, self.salt)
+            with mock.patch.dict(defaults.strings,
+                                 {'password_hash_workers' : 0}):
+                single_rate = self.run_checks(password_hasher, encoded, 1)
+            pool_rate = self.run_checks(
+                password_hasher, encoded, BENCHMARK_THREADS)
+            print('{0:<12}{1:>20.1f}{2:>20.1f}{3:>20.1f}'.format(
+                name, single_rate, pool_rate, pool_rate / max(workers, 1)))
+            self.assertGreater(single_rate, 0)
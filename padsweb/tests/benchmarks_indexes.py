@@ -0,0 +1,144 @@
+#
+#
+# Public Archive of Days Since Timers
+# Timer Index Benchmarks
+#
+#
+"""Compares the query plans and run times of the hot Timer queries with
+and without the Timer indexes, on a seeded database. The database is
+migrated back to the schema from before the indexes were introduced, and
+then forward again. Timers are seeded through the models of that schema,
+and the queries only load its columns, so that columns added by later 
+migrations do not break the benchmarks.
+
+This module is not picked up by the test runner by default. To run the
+benchmarks, name the module explicitly:
+    python manage.py test padsweb.tests.benchmarks_indexes
+"""
+
+# Django Features
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+# Standard Library Imports
+import datetime, statistics, time
+
+# Modules to be tested
+from padsweb.models import PADSTimer
+from padsweb.timers import PADSLongestRunningTimerGroup
+from padsweb.timers import PADSNewestTimerGroup
+from padsweb.timers import PADSPrivateTimerGroup
+from padsweb.timers import PADSPublicTimerHelper
+from padsweb.timers import PADSRecentlyResetTimerGroup
+from padsweb.timers import PADSSharedTimerGroup
+
+#
+# Benchmark Settings
+#
+BENCHMARK_USERS = 100
+BENCHMARK_TIMERS_PER_USER = 200
+BENCHMARK_RUNS = 50
+MIGRATION_BEFORE = [('padsweb', '0001_initial')]
+MIGRATION_AFTER = [('padsweb', '0002_timer_indexes')]
+
+class PADSTimerIndexBenchmarks(TransactionTestCase):
+
+    def migrate(self, targets=None):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        if targets is None:
+            # Return to the latest schema
+            targets = executor.loader.graph.leaf_nodes('padsweb')
+        executor.migrate(targets)
+
+    def get_historical_apps(self):
+        """Returns the app registry with the models as they were at
+        MIGRATION_BEFORE.
+        """
+        executor = MigrationExecutor(connection)
+        return executor.loader.project_state(MIGRATION_BEFORE).apps
+
+    def seed(self):
+        apps = self.get_historical_apps()
+        PADSTimer = apps.get_model('padsweb', 'PADSTimer')
+        PADSUser = apps.get_model('padsweb', 'PADSUser')
+        now = timezone.now()
+        PADSUser.objects.bulk_create([PADSUser(
+            password_hash='-', sign_up_date_time=now,
+            last_login_date_time=now, nickname_short='bench-{0}'.format(u),
+            nickname='Benchmark User {0}'.format(u), time_zone='UTC')
+            for u in range(0, BENCHMARK_USERS)])
+        users = PADSUser.objects.order_by('id')
+        timers = []
+        for u in users:
+            for i in range(0, BENCHMARK_TIMERS_PER_USER):
+                n = len(timers)
+                date_time = now - datetime.timedelta(hours=n)
+                timers.append(PADSTimer(
+                    creation_date_time=date_time,
+                    count_from_date_time=date_time + datetime.timedelta(
+                        minutes=n % 97),
+                    description='Benchmark Timer {0}'.format(n),
+                    creator_user=u, public=(n % 3 != 0), historical=False,
+                    running=True, permalink_code='b{0:09d}'.format(n)))
+        PADSTimer.objects.bulk_create(timers, batch_size=500)
+        return users.first().id
+
+    def get_querysets(self, user_id):
+        public_timer_helper = PADSPublicTimerHelper()
+        querysets = {
+            'longest_running' : PADSLongestRunningTimerGroup(
+                public_timer_helper).timers_from_db,
+            'recently_reset' : PADSRecentlyResetTimerGroup(
+                public_timer_helper).timers_from_db,
+            'newest' : PADSNewestTimerGroup(
+                public_timer_helper).timers_from_db,
+            'shared_by_user' : PADSSharedTimerGroup(user_id).timers_from_db,
+            'private_by_user' : PADSPrivateTimerGroup(user_id).timers_from_db,
+            'permalink' : PADSTimer.objects.filter(
+                permalink_code='b{0:09d}'.format(
+                    (BENCHMARK_USERS * BENCHMARK_TIMERS_PER_USER) // 2)),
+            }
+        return querysets
+
+    def measure(self, user_id):
+        results = {}
+        # Only load the columns found in the schema before the indexes
+        field_names = [f.name for f in self.get_historical_apps().get_model(
+            'padsweb', 'PADSTimer')._meta.fields]
+        for name, qs in self.get_querysets(user_id).items():
+            page = qs.only(*field_names)[:6]
+            run_times = []
+            for r in range(0, BENCHMARK_RUNS):
+                start = time.perf_counter()
+                list(page)
+                run_times.append(time.perf_counter() - start)
+                page = page.all() # discard the result cache
+            results[name] = (page.explain(), statistics.median(run_times))
+        return results
+
+    def test_timer_indexes(self):
+        self.migrate(MIGRATION_BEFORE)
+        try:
+            user_id = self.seed()
+            before = self.measure(user_id)
+            self.migrate(MIGRATION_AFTER)
+            after = self.measure(user_id)
+        finally:
+            self.migrate()
+        print('\n{0} Timers, median of {1} runs'.format(
+            BENCHMARK_USERS * BENCHMARK_TIMERS_PER_USER, BENCHMARK_RUNS))
+        for name in before.keys():
+            print('\n[{0}] {1:.3f}ms -> {2:.3f}ms'.format(
+                name, before[name][1] * 1000, after[name][1] * 1000))
+            print(' Before:\n  {0}'.format(
+                before[name][0].replace('\n', '\n  ')))
+            print(' After:\n  {0}'.format(
+                after[name][0].replace('\n', '\n  ')))
+        # Every hot query should be answered from an index, without
+        #  scanning or sorting the Timer table
+        for name in after.keys():
+            self.assertIn('USING INDEX', after[name][0])
+            self.assertNotIn('TEMP B-TREE', after[name][0])
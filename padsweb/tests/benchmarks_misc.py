@@ -0,0 +1,122 @@
+#
+#
+# Public Archive of Days Since Timers
+# Non-Metric Measure Benchmarks
+#
+#
+"""Compares the run times of NonMetricMeasureInt with those of the
+original float division implementation, kept below as
+FloatNonMetricMeasureInt, on the minutes, hours and days measures used by
+PADSViewTimer. Every Timer card on an index page asks for the days, the
+full string and the string without zero measures.
+
+This module is not picked up by the test runner by default. To run the
+benchmarks, name the module explicitly:
+    python manage.py test padsweb.tests.benchmarks_misc
+"""
+
+# Django Features
+from django.test import SimpleTestCase
+
+# Standard Library Imports
+import statistics, time
+
+# Modules to be tested
+from padsweb.misc import NonMetricMeasureInt
+from padsweb.timers import PADSViewTimer
+
+#
+# Benchmark Settings
+#
+BENCHMARK_VALUES = range(0, 525600, 37) # up to a year, in minutes
+BENCHMARK_RUNS = 10
+
+class FloatNonMetricMeasureInt:
+    """NonMetricMeasureInt as it was before integer division and caching
+    were introduced, for comparison only.
+    """
+    DEFAULT_SEPARATOR_STR = ", "
+
+    def get_measure(self, measure):
+        self.measures = self.get_measures()
+        return self.measures.get(measure)
+
+    def get_measures(self):
+        output = dict()
+        working_value = self.decimal_int_value
+        pairs = zip(self.unit_labels, self.limits)
+        for p in list(pairs):
+            label = p[0]
+            radix = p[1]
+            output[label] = int(working_value % radix)
+            working_value /= radix
+        output[self.overflow_unit_label] = int(working_value)
+        return output
+
+    def get_string(self, **kwargs):
+        output = ""
+        measures = self.get_measures()
+        zeroes = kwargs.get('zeroes', True)
+        for u in self.get_units():
+            u_value = measures[u]
+            if ( (u_value == 0) & (zeroes != True) ):
+                pass
+            else:
+                current_measure = "{0} {1}{2}".format(
+                    u_value, u, self.separator_str)
+                output = ''.join([current_measure, output])
+        if self.negative == True:
+            output = ''.join(['-', output])
+        return output.rstrip(self.separator_str)
+
+    def get_units(self):
+        output = list(self.unit_labels)
+        output.append(self.overflow_unit_label)
+        return tuple(output)
+
+    def __init__(self, unit_labels, overflow_unit_label, limits,
+                 decimal_int_value):
+        self.decimal_int_value = 0
+        self.limits = limits
+        self.negative = False
+        self.overflow_unit_label = overflow_unit_label
+        self.separator_str = self.DEFAULT_SEPARATOR_STR
+        self.unit_labels = unit_labels
+        if decimal_int_value < 0:
+            self.negative = True
+            self.decimal_int_value = abs(decimal_int_value)
+        else:
+            self.decimal_int_value = decimal_int_value
+
+
+class NonMetricMeasureIntBenchmarks(SimpleTestCase):
+
+    def render_card(self, measure_class, value):
+        # Measures are used in the same way as on an index page
+        measure = measure_class(
+            PADSViewTimer.UNITS, PADSViewTimer.OVERFLOW_UNIT,
+            PADSViewTimer.UNIT_LIMITS, value)
+        return (measure.get_measure(PADSViewTimer.OVERFLOW_UNIT),
+                measure.get_string(zeroes=False), measure.get_string())
+
+    def measure(self, measure_class):
+        run_times = []
+        for r in range(0, BENCHMARK_RUNS):
+            start = time.perf_counter()
+            for v in BENCHMARK_VALUES:
+                self.render_card(measure_class, v)
+            run_times.append(time.perf_counter() - start)
+        return statistics.median(run_times)
+
+    def test_nonmetricmeasureint(self):
+        # Both implementations must agree before they are compared
+        for v in BENCHMARK_VALUES:
+            self.assertEqual(self.render_card(NonMetricMeasureInt, v),
+                             self.render_card(FloatNonMetricMeasureInt, v))
+        before = self.measure(FloatNonMetricMeasureInt)
+        after = self.measure(NonMetricMeasureInt)
+        print('\n{0} values, median of {1} runs'.format(
+            len(BENCHMARK_VALUES), BENCHMARK_RUNS))
+        print('[float division] {0:.3f}ms'.format(before * 1000))
+        print('[integer division, cached] {0:.3f}ms ({1:.2f}x)'.format(
+            after * 1000, before / after))
@@ -0,0 +1,145 @@
+#
+#
+# Public Archive of Days Since Timers
+# SQLite Concurrency Benchmarks
+#
+#
+"""Resets Timers and loads Timers in parallel threads through the Helpers
+on an SQLite database file, first with SQLite's default settings, then
+with the pragmas from padsweb.sqlite_tuning. Throughput and the number
+of 'database is locked' errors are reported for both.
+
+This module is not picked up by the test runner by default. To run the
+benchmarks, name the module explicitly:
+    python manage.py test padsweb.tests.benchmarks_sqlite
+
+The number of threads, Timers and seconds per run are set through
+environment variables, for example:
+    PADS_BENCHMARK_WRITERS=8 PADS_BENCHMARK_SECONDS=10 \\
+    python manage.py test padsweb.tests.benchmarks_sqlite
+"""
+
+# Django Features
+from django.core.management import call_command
+from django.db import OperationalError, connection, connections
+from django.test import SimpleTestCase
+
+# Standard Library Imports
+import os, random, tempfile, threading, time, unittest
+from unittest import mock
+
+# Modules to be tested
+from padsweb.helpers import PADSReadTimerHelper, PADSWriteTimerHelper
+from padsweb.helpers import PADSWriteUserHelper
+from padsweb.settings import defaults
+
+#
+# Benchmark Settings
+#
+def get_setting(name, default):
+    return type(default)(os.environ.get(
+        'PADS_BENCHMARK_{0}'.format(name), default))
+
+BENCHMARK_WRITERS = get_setting('WRITERS', 4)
+BENCHMARK_READERS = get_setting('READERS', 4)
+BENCHMARK_TIMERS = get_setting('TIMERS', 100)
+BENCHMARK_SECONDS = get_setting('SECONDS', 5.0)
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'Not using SQLite')
+class SQLiteConcurrencyBenchmarks(SimpleTestCase):
+    databases = '__all__'
+
+    def seed(self):
+        user = PADSWriteUserHelper().prepare_user_in_db(
+            'bench-sqlite', '    abcdABCD1234')
+        user.save()
+        write_timer_helper = PADSWriteTimerHelper(user.id)
+        timer_ids = [write_timer_helper.new(
+            'Benchmark Timer {0}'.format(i), public=True)
+            for i in range(0, BENCHMARK_TIMERS)]
+        return (user.id, timer_ids)
+
+    def run_workers(self, user_id, timer_ids):
+        """Runs the reset and read workers for BENCHMARK_SECONDS, and
+        returns the numbers of resets, reads and lock errors.
+        """
+        counts = {'resets' : 0, 'reads' : 0, 'lock_errors' : 0,
+                  'other_errors' : 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + BENCHMARK_SECONDS
+
+        def count(key):
+            with lock:
+                counts[key] += 1
+
+        def work(task):
+            try:
+                while time.perf_counter() < deadline:
+                    try:
+                        count(task(random.choice(timer_ids)))
+                    except OperationalError as e:
+                        if 'locked' in str(e):
+                            count('lock_errors')
+                        else:
+                            count('other_errors')
+            finally:
+                # Every thread has its own connection
+                connection.close()
+
+        def reset(timer_id):
+            PADSWriteTimerHelper(user_id).reset_by_id(timer_id, 'Benchmark')
+            return 'resets'
+
+        def read(timer_id):
+            read_timer_helper = PADSReadTimerHelper(user_id)
+            list(read_timer_helper.get_all_from_db())
+            list(read_timer_helper.get_resets_from_db_by_timer_id(timer_id))
+            return 'reads'
+
+        threads = [threading.Thread(target=work, args=(reset,))
+                   for i in range(0, BENCHMARK_WRITERS)]
+        threads.extend([threading.Thread(target=work, args=(read,))
+                        for i in range(0, BENCHMARK_READERS)])
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return counts
+
+    def run_on_database_file(self, tuned):
+        """Runs the workload on a new database file. The in-memory test
+        database is set aside rather than closed while the file is in use,
+        as closing it would discard it.
+        """
+        default_connection = connections['default']
+        settings_dict = default_connection.settings_dict
+        name_saved = settings_dict['NAME']
+        connection_saved = default_connection.connection
+        default_connection.connection = None
+        with tempfile.TemporaryDirectory() as temp_dir:
+            settings_dict['NAME'] = os.path.join(temp_dir, 'bench.sqlite3')
+            try:
+                with mock.patch.dict(defaults.strings,
+                                     {'sqlite_tuning' : tuned}):
+                    call_command('migrate', verbosity=0)
+                    user_id, timer_ids = self.seed()
+                    return self.run_workers(user_id, timer_ids)
+            finally:
+                default_connection.close()
+                settings_dict['NAME'] = name_saved
+                default_connection.connection = connection_saved
+
+    def test_concurrent_resets_and_reads(self):
+        print('\n{0} reset threads, {1} read threads, {2} Timers, '
+              '{3}s per run'.format(BENCHMARK_WRITERS, BENCHMARK_READERS,
+                                    BENCHMARK_TIMERS, BENCHMARK_SECONDS))
+        print('{0:<24}{1:>10}{2:>10}{3:>14}{4:>14}'.format(
+            'settings', 'resets/s', 'reads/s', 'lock errors',
+            'other errors'))
+        for label, tuned in (('default', False), ('tuned', True)):
+            counts = self.run_on_database_file(tuned)
+            print('{0:<24}{1:>10.1f}{2:>10.1f}{3:>14}{4:>14}'.format(
+                label, counts['resets'] / BENCHMARK_SECONDS,
+                counts['reads'] / BENCHMARK_SECONDS, counts['lock_errors'],
+                counts['other_errors']))
+            self.assertGreater(counts['resets'] + counts['reads'], 0)
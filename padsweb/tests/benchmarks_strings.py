@@ -0,0 +1,79 @@
+#
+#
+# Public Archive of Days Since Timers
+# String Dictionary Benchmarks
+#
+#
+"""Measures the time taken to look up settings and labels from the
+string dictionaries, as done many times on every request, against
+lookups from a plain dictionary. Lookups from a dictionary with several
+levels of patches are also measured, as in deployments where the
+defaults are patched with settings for production.
+
+This module is not picked up by the test runner by default. To run the
+benchmarks, name the module explicitly:
+    python manage.py test padsweb.tests.benchmarks_strings
+
+The number of lookups per run and the number of patch levels are set
+through environment variables, for example:
+    PADS_BENCHMARK_LOOKUPS=1000000 PADS_BENCHMARK_PATCH_LEVELS=8 \\
+    python manage.py test padsweb.tests.benchmarks_strings
+"""
+
+# Django Features
+from django.test import SimpleTestCase
+
+# Standard Library Imports
+import os, timeit
+
+# Modules to be tested
+from padsweb.settings import defaults
+from padsweb.strings import PADSStringDictionary, labels
+
+#
+# Benchmark Settings
+#
+def get_setting(name, default):
+    return type(default)(os.environ.get(
+        'PADS_BENCHMARK_{0}'.format(name), default))
+
+BENCHMARK_LOOKUPS = get_setting('LOOKUPS', 200000)
+BENCHMARK_PATCH_LEVELS = get_setting('PATCH_LEVELS', 4)
+
+class StringDictionaryBenchmarks(SimpleTestCase):
+
+    def get_patched(self, string_dict):
+        """Returns a copy of a string dictionary with BENCHMARK_PATCH_LEVELS
+        levels of patches, each patch being patched with the next.
+        """
+        patched = PADSStringDictionary(dict(string_dict.strings),
+                                       string_dict.description)
+        patches = [PADSStringDictionary({}, 'Patch {0}'.format(i))
+                   for i in range(0, BENCHMARK_PATCH_LEVELS)]
+        for i in range(1, len(patches)):
+            patches[i-1].patch(patches[i])
+        if len(patches) > 0:
+            patched.patch(patches[0])
+        return patched
+
+    def time_lookups(self, mapping, key):
+        """Returns the time taken per lookup in nanoseconds."""
+        seconds = timeit.timeit(lambda: mapping[key],
+                                number=BENCHMARK_LOOKUPS)
+        return seconds * 1e9 / BENCHMARK_LOOKUPS
+
+    def test_lookups(self):
+        print('\n{0} lookups per run, {1} patch levels'.format(
+            BENCHMARK_LOOKUPS, BENCHMARK_PATCH_LEVELS))
+        print('{0:<12}{1:>16}{2:>16}{3:>16}'.format(
+            'dictionary', 'dict ns', 'unpatched ns', 'patched ns'))
+        for name, string_dict, key in (
+                ('defaults', defaults, 'password_hasher'),
+                ('labels', labels, 'TIMER_DEFAULT_DESCRIPTION'),):
+            patched = self.get_patched(string_dict)
+            dict_ns = self.time_lookups(dict(string_dict.strings), key)
+            unpatched_ns = self.time_lookups(string_dict, key)
+            patched_ns = self.time_lookups(patched, key)
+            print('{0:<12}{1:>16.1f}{2:>16.1f}{3:>16.1f}'.format(
+                name, dict_ns, unpatched_ns, patched_ns))
+            self.assertEqual(patched[key], string_dict[key])
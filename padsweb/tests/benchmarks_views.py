@@ -0,0 +1,394 @@
+#
+#
+# Public Archive of Days Since Timers
+# View Benchmarks
+#
+#
+"""Requests every route in padsweb.urls through the test Client on a
+seeded database, and records the number of queries, the wall time
+percentiles and the peak memory use of each route. The results are also
+written to a JSON file, so that they may be compared between revisions.
+
+This module is not picked up by the test runner by default. To run the
+benchmarks, name the module explicitly:
+    python manage.py test padsweb.tests.benchmarks_views
+
+The size of the seeded database, the number of runs and the path of the
+results file are set through environment variables, for example:
+    PADS_BENCHMARK_USERS=100 PADS_BENCHMARK_RUNS=50 \\
+    PADS_BENCHMARK_OUTPUT=/tmp/views.json \\
+    python manage.py test padsweb.tests.benchmarks_views
+"""
+
+# Django Features
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+# Standard Library Imports
+import datetime, json, math, os, platform, statistics, time, tracemalloc
+
+# Modules to be tested
+from padsweb import urls
+from padsweb.helpers import PADSWriteTimerHelper
+from padsweb.models import GroupInclusion, PADSTimer, PADSTimerGroup
+from padsweb.models import PADSTimerReset, PADSUser
+from padsweb.user import PADSUserHelper
+
+#
+# Benchmark Settings
+#
+def get_setting(name, default):
+    return type(default)(os.environ.get(
+        'PADS_BENCHMARK_{0}'.format(name), default))
+
+BENCHMARK_USERS = get_setting('USERS', 20)
+BENCHMARK_QUICK_LISTS = get_setting('QUICK_LISTS', 5)
+BENCHMARK_TIMERS_PER_USER = get_setting('TIMERS_PER_USER', 50)
+BENCHMARK_GROUPS_PER_USER = get_setting('GROUPS_PER_USER', 5)
+BENCHMARK_RESETS_PER_TIMER = get_setting('RESETS_PER_TIMER', 3)
+BENCHMARK_RUNS = get_setting('RUNS', 20)
+BENCHMARK_OUTPUT = get_setting('OUTPUT', 'benchmarks_views.json')
+BENCHMARK_PASSWORD = '    abcdABCD1234'
+
+user_helper = PADSUserHelper()
+
+def percentile(values, p):
+    """Returns the p-th percentile of a list of values, using the nearest
+    rank method.
+    """
+    values_sorted = sorted(values)
+    rank = max(math.ceil(len(values_sorted) * p / 100), 1)
+    return values_sorted[rank - 1]
+
+class PADSViewBenchmarks(TestCase):
+
+    @classmethod
+    def seed_timers(cls, users, now):
+        # Timers are spread across the Users, with every third Timer
+        #  kept private. Every Timer has the same number of resets.
+        timers = []
+        for u in users:
+            for i in range(0, BENCHMARK_TIMERS_PER_USER):
+                n = len(timers)
+                date_time = now - datetime.timedelta(hours=n)
+                reset_times = [date_time + datetime.timedelta(minutes=r + 1)
+                               for r in range(0, BENCHMARK_RESETS_PER_TIMER)]
+                timers.append(PADSTimer(
+                    creation_date_time=date_time,
+                    count_from_date_time=(reset_times or [date_time])[-1],
+                    description='Benchmark Timer {0}'.format(n),
+                    creator_user=u, public=(n % 3 != 0), historical=False,
+                    running=True, permalink_code='v{0:09d}'.format(n),
+                    reset_count=len(reset_times),
+                    reset_latest_date_time=(reset_times or [None])[-1],
+                    reset_previous_date_time=(
+                        [None, None] + reset_times)[-2]))
+        PADSTimer.objects.bulk_create(timers, batch_size=500)
+        timers = PADSTimer.objects.filter(
+            creator_user__in=users).order_by('id')
+        PADSTimerReset.objects.bulk_create([PADSTimerReset(
+            timer=t, reason='Benchmark Reset {0}'.format(r),
+            date_time=t.creation_date_time + datetime.timedelta(
+                minutes=r + 1))
+            for t in timers for r in range(0, BENCHMARK_RESETS_PER_TIMER)],
+            batch_size=500)
+        return timers
+
+    @classmethod
+    def seed_groups(cls, users, timers):
+        # Every Timer of a User goes into one of the User's Timer Groups
+        PADSTimerGroup.objects.bulk_create([PADSTimerGroup(
+            name='Benchmark Group {0}'.format(g), creator_user=u)
+            for u in users for g in range(0, BENCHMARK_GROUPS_PER_USER)])
+        if BENCHMARK_GROUPS_PER_USER <= 0:
+            return
+        groups = {}
+        for g in PADSTimerGroup.objects.filter(
+                creator_user__in=users).order_by('id'):
+            groups.setdefault(g.creator_user_id, []).append(g)
+        GroupInclusion.objects.bulk_create([GroupInclusion(
+            timer=t, group=groups[t.creator_user_id][
+                t.id % BENCHMARK_GROUPS_PER_USER])
+            for t in timers], batch_size=500)
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        # All regular Users share one password hash, so that only one
+        #  hash has to be computed while seeding
+        password_hash = user_helper.prepare_user_in_db(
+            '-', BENCHMARK_PASSWORD).password_hash
+        PADSUser.objects.bulk_create([PADSUser(
+            password_hash=password_hash, sign_up_date_time=now,
+            last_login_date_time=now, nickname_short='bench-{0}'.format(u),
+            nickname='Benchmark User {0}'.format(u), time_zone='UTC')
+            for u in range(0, max(BENCHMARK_USERS, 1))])
+        # Quick Lists are created the same way as in the views
+        cls.quick_list_passwords = [user_helper.new_anon_user_in_db()
+                                    for q in range(0, BENCHMARK_QUICK_LISTS)]
+        users = PADSUser.objects.order_by('id')
+        timers = cls.seed_timers(users, now)
+        cls.seed_groups(users, timers)
+        # The first User is the one signed in during the benchmarks
+        cls.user = users.first()
+        cls.timer_id = timers.filter(creator_user=cls.user).first().id
+        cls.timer_ids = list(timers.filter(
+            creator_user=cls.user).values_list('id', flat=True))
+        cls.timer_public = timers.filter(
+            creator_user=cls.user, public=True).first()
+        cls.group_id = PADSTimerGroup.objects.filter(
+            creator_user=cls.user).order_by('id').first().id
+
+    #
+    # Request Preparation Methods
+    #
+    def new_client(self, user_id=None):
+        """Returns a new test Client, optionally with a User signed in. The
+        User's id is put into the session directly, skipping the sign-in
+        views and the password check.
+        """
+        client = Client()
+        if user_id is not None:
+            session = client.session
+            session['user_id'] = user_id
+            session.save()
+        return client
+
+    def new_timer(self, **kwargs):
+        write_timer_helper = PADSWriteTimerHelper(self.user.id)
+        timer_id = write_timer_helper.new('Benchmark Timer (Temporary)')
+        if kwargs.get('in_group', False) is True:
+            write_timer_helper.add_to_group(timer_id, self.group_id)
+        return timer_id
+
+    def new_quick_list(self):
+        quick_list_password = user_helper.new_anon_user_in_db()
+        quick_list_id = user_helper.split_anon_user_password(
+            quick_list_password)[0]
+        PADSWriteTimerHelper(int(quick_list_id)).new(
+            'Benchmark Quick List Timer')
+        return quick_list_password
+
+    def get_routes(self):
+        """Returns a dictionary of functions, one for each route, that
+        return a test Client, the request method, the URL and the form data
+        of a single request. Any items that a request consumes, such as
+        Timers to be deleted, are created by these functions, so that they
+        are not counted as part of the request.
+        """
+        client = self.new_client(self.user.id)
+        timer_kwargs = {'timer_id' : self.timer_id}
+        group_kwargs = {'timer_group_id' : self.group_id}
+        user_kwargs = {'user_id' : self.user.id}
+        link_kwargs = {'link_code' : self.timer_public.permalink_code}
+
+        def get(name, **kwargs):
+            return lambda r: (client, 'get', reverse(
+                'padsweb:{0}'.format(name), kwargs=kwargs), None)
+
+        def post(name, data=None, **kwargs):
+            return lambda r: (client, 'post', reverse(
+                'padsweb:{0}'.format(name), kwargs=kwargs), data)
+
+        def post_new_timer(name, data=None, **kwargs):
+            return lambda r: (client, 'post', reverse(
+                'padsweb:{0}'.format(name),
+                kwargs={'timer_id' : self.new_timer(**kwargs)}), data)
+
+        def signed_out(name, data=None):
+            return lambda r: (self.new_client(), 'post', reverse(
+                'padsweb:{0}'.format(name)), data(r) if data else None)
+
+        now = timezone.now()
+        routes = {
+            # Timer Read URLs
+            'index' : get('index'),
+            'index_alt' : get('index_alt'),
+            'index_personal' : get('index_personal'),
+            'index_private_by_user' : get('index_private_by_user'),
+            'index_personal_groups' : get('index_personal_groups'),
+            'index_group' : get('index_group', **group_kwargs),
+            'index_shared_by_user' : get('index_shared_by_user',
+                                         **user_kwargs),
+            'index_longest_running' : get('index_longest_running'),
+            'index_recent_resets' : get('index_recent_resets'),
+            'index_newest' : get('index_newest'),
+            # Timer URLs
+            'timer' : get('timer', **timer_kwargs),
+            'timer_by_permalink' : get('timer_by_permalink', **link_kwargs),
+            'timer_export' : get('timer_export', **timer_kwargs),
+            # Timer Configuration URLs
+            'timer_new' : post('timer_new', {
+                'description' : 'Benchmark Timer (New)',
+                'first_history_message' : 'Benchmark',
+                'year' : now.year, 'month' : now.month, 'day' : now.day,
+                'hour' : now.hour, 'minute' : now.minute,
+                'second' : now.second, 'historical' : False,
+                'use_current_date_time' : True,}),
+            'timer_set_groups' : post(
+                'timer_set_groups',
+                {'group_names' : 'benchmark-a benchmark-b'},
+                **timer_kwargs),
+            'timer_del' : post_new_timer('timer_del'),
+            'timer_reset' : post('timer_reset', {'reason' : 'Benchmark'},
+                                 **timer_kwargs),
+            'timer_share' : post('timer_share', **timer_kwargs),
+            'timer_unshare' : post('timer_unshare', **timer_kwargs),
+            'timer_rename' : post(
+                'timer_rename', {'description' : 'Benchmark Timer (Renamed)'},
+                **timer_kwargs),
+            'timer_stop' : post_new_timer('timer_stop',
+                                          {'reason' : 'Benchmark'}),
+            'timer_add_to_group' : post_new_timer(
+                'timer_add_to_group', {'timer_group' : self.group_id}),
+            'timer_remove_from_group' : post_new_timer(
+                'timer_remove_from_group', {'timer_group' : self.group_id},
+                in_group=True),
+            'timer_bulk' : post('timer_bulk', {
+                'operation' : 'reset', 'reason' : 'Benchmark',
+                'timer_id' : self.timer_ids}),
+            # User Session URLs
+            'session' : signed_out('session', lambda r: {
+                'username' : self.user.nickname_short,
+                'password' : BENCHMARK_PASSWORD,}),
+            'session_quicklist' : signed_out('session_quicklist', lambda r: {
+                'password' : self.quick_list_passwords[
+                    r % len(self.quick_list_passwords)]}
+                    if self.quick_list_passwords else {'password' : '-'}),
+            'session_end' : lambda r: (
+                self.new_client(self.user.id), 'get',
+                reverse('padsweb:session_end'), None),
+            # User Sign Up URLs
+            'sign_up_intro' : lambda r: (
+                self.new_client(), 'get',
+                reverse('padsweb:sign_up_intro'), None),
+            'sign_up_user' : signed_out('sign_up_user', lambda r: {
+                'username' : 'bench-new-{0}'.format(r),
+                'password' : BENCHMARK_PASSWORD,
+                'password_confirm' : BENCHMARK_PASSWORD,}),
+            'sign_up_quicklist' : signed_out('sign_up_quicklist'),
+            # User Settings URLs
+            'settings_info' : get('settings_info'),
+            'settings_new_timer_group' : lambda r: (
+                client, 'post', reverse('padsweb:settings_new_timer_group'),
+                {'name' : 'Benchmark Group (New {0})'.format(r)}),
+            'settings_delete_timer_group' : lambda r: (
+                client, 'post',
+                reverse('padsweb:settings_delete_timer_group'),
+                {'timer_group' : PADSWriteTimerHelper(self.user.id).new_group(
+                    'Benchmark Group (Temporary {0})'.format(r))}),
+            'settings_set_password' : post('settings_set_password', {
+                'user_id' : self.user.id,
+                'old_password' : BENCHMARK_PASSWORD,
+                'new_password' : BENCHMARK_PASSWORD,
+                'new_password_confirm' : BENCHMARK_PASSWORD,}),
+            'settings_set_tz' : post('settings_set_tz', {'time_zone' : 'UTC'}),
+            'settings_import_ql' : lambda r: (
+                client, 'post', reverse('padsweb:settings_import_ql'),
+                {'password' : self.new_quick_list(), 'timer_group' : ''}),
+            'user_export_all' : get('user_export_all'),
+            }
+        return routes
+
+    #
+    # Measurement Methods
+    #
+    def request(self, client, method, url, data):
+        """Sends a request and returns the status code of the response,
+        or the name of the exception if the view raised one. Exceptions are
+        recorded instead of stopping the benchmarks, so that the other
+        routes are still measured.
+        """
+        try:
+            if data is None:
+                response = getattr(client, method)(url)
+            else:
+                response = getattr(client, method)(url, data)
+            # Streaming responses are only generated when they are read
+            if response.streaming:
+                b''.join(response.streaming_content)
+            return response.status_code
+        except Exception as e:
+            return type(e).__name__
+
+    def measure(self, prepare):
+        run_times = []
+        query_counts = []
+        statuses = set()
+        for r in range(0, BENCHMARK_RUNS):
+            request_args = prepare(r)
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                status = self.request(*request_args)
+                run_times.append(time.perf_counter() - start)
+            query_counts.append(len(queries))
+            statuses.add(str(status))
+        # Peak memory use is measured in a separate run, as tracing memory
+        #  allocations slows down the request
+        request_args = prepare(BENCHMARK_RUNS)
+        tracemalloc.start()
+        try:
+            self.request(*request_args)
+            memory_peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return {
+            'statuses' : sorted(statuses),
+            'queries' : {
+                'min' : min(query_counts),
+                'median' : statistics.median(query_counts),
+                'max' : max(query_counts),
+                },
+            'time_ms' : {
+                'p50' : percentile(run_times, 50) * 1000,
+                'p90' : percentile(run_times, 90) * 1000,
+                'p99' : percentile(run_times, 99) * 1000,
+                'max' : max(run_times) * 1000,
+                },
+            'memory_peak_kib' : memory_peak / 1024,
+            }
+
+    def test_views(self):
+        routes = self.get_routes()
+        # Every route must be benchmarked
+        route_names = set([u.name for u in urls.urlpatterns])
+        self.assertEqual(set(routes.keys()), route_names)
+
+        results = {}
+        for name in sorted(routes.keys()):
+            self.request(*routes[name](-1)) # warm up, e.g. templates
+            results[name] = self.measure(routes[name])
+
+        output = {
+            'python' : platform.python_version(),
+            'database' : connection.vendor,
+            'settings' : {
+                'users' : BENCHMARK_USERS,
+                'quick_lists' : BENCHMARK_QUICK_LISTS,
+                'timers_per_user' : BENCHMARK_TIMERS_PER_USER,
+                'groups_per_user' : BENCHMARK_GROUPS_PER_USER,
+                'resets_per_timer' : BENCHMARK_RESETS_PER_TIMER,
+                'runs' : BENCHMARK_RUNS,
+                },
+            'routes' : results,
+            }
+        with open(BENCHMARK_OUTPUT, 'w') as output_file:
+            json.dump(output, output_file, indent=2, sort_keys=True)
+
+        print('\n{0} Users, {1} Timers each, {2} runs per route'.format(
+            BENCHMARK_USERS, BENCHMARK_TIMERS_PER_USER, BENCHMARK_RUNS))
+        print('{0:<28} {1:>7} {2:>9} {3:>9} {4:>9} {5:>10}  {6}'.format(
+            'Route', 'Queries', 'p50 (ms)', 'p90 (ms)', 'p99 (ms)',
+            'Peak (KiB)', 'Status'))
+        for name, result in results.items():
+            print('{0:<28} {1:>7} {2:>9.2f} {3:>9.2f} {4:>9.2f} {5:>10.1f}  '
+                  '{6}'.format(name, result['queries']['max'],
+                               result['time_ms']['p50'],
+                               result['time_ms']['p90'],
+                               result['time_ms']['p99'],
+                               result['memory_peak_kib'],
+                               ', '.join(result['statuses'])))
+        print('Results written to {0}'.format(BENCHMARK_OUTPUT))
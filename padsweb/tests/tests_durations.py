@@ -0,0 +1,67 @@
+#
+#
+# Public Archive of Days Since Timers
+# Batch Running Time Calculation Tests
+#
+#
+
+import datetime
+import unittest
+
+from django.test import TestCase
+from padsweb import durations
+from padsweb.durations import get_minutes_between, split_minutes
+from padsweb.misc import NonMetricMeasureInt
+
+#
+# Shared Test Items
+#
+start_time = datetime.datetime(2018, 1, 1, tzinfo=datetime.timezone.utc)
+test_spans = (
+    datetime.timedelta(0),
+    datetime.timedelta(seconds=59, microseconds=999999),
+    datetime.timedelta(minutes=1),
+    datetime.timedelta(hours=1, minutes=1, seconds=30),
+    datetime.timedelta(days=1),
+    datetime.timedelta(days=400, hours=23, minutes=59),
+    datetime.timedelta(seconds=-90),
+    )
+test_minutes = (0, 0, 1, 61, 1440, 577439, -1)
+units = ('min', 'h')
+unit_limits = (60, 24)
+
+class DurationTests(TestCase):
+    def get_results(self):
+        end_times = [start_time + s for s in test_spans]
+        minutes = get_minutes_between([start_time] * len(end_times),
+                                      end_times)
+        return (minutes, split_minutes(minutes, unit_limits))
+
+    def test_get_minutes_between(self):
+        minutes = self.get_results()[0]
+        self.assertEqual(tuple(minutes), test_minutes)
+        for m in minutes:
+            self.assertIsInstance(m, int)
+
+    def test_get_minutes_between_empty(self):
+        self.assertEqual(get_minutes_between([], []), [])
+        self.assertEqual(split_minutes([], unit_limits), [])
+
+    def test_split_minutes_matches_nonmetricmeasureint(self):
+        measures = split_minutes(test_minutes, unit_limits)
+        for m, ms in zip(test_minutes, measures):
+            measure = NonMetricMeasureInt(units, 'days', unit_limits, m)
+            self.assertEqual(ms, (measure.get_measure('min'),
+                                  measure.get_measure('h'),
+                                  measure.get_measure('days')))
+
+    @unittest.skipIf(durations.numpy is None, 'NumPy is not installed')
+    def test_numpy_matches_python(self):
+        results_numpy = self.get_results()
+        numpy = durations.numpy
+        durations.numpy = None
+        try:
+            results_python = self.get_results()
+        finally:
+            durations.numpy = numpy
+        self.assertEqual(results_numpy, results_python)
@@ -0,0 +1,118 @@
+#
+#
+# Public Archive of Days Since Timers
+# Password Hasher Unit Tests
+#
+#
+
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from padsweb.hashers import PADSPasswordHasher
+from padsweb.helpers import PADSUserHelper, PADSWriteUserHelper
+from padsweb.models import PADSUser
+from padsweb.settings import defaults
+from padsweb.user import PADSUserHelper as PADSOldUserHelper
+
+#
+# Shared Test Data
+#
+# Lighter parameters to keep the tests quick
+hasher_settings_light = {
+    'password_pbkdf2_iterations' : 1000,
+    'password_scrypt_n' : 1024,
+    }
+
+#
+# Hasher Tests
+#
+@mock.patch.dict(defaults.strings, hasher_settings_light)
+class PADSPasswordHasherTests(SimpleTestCase):
+    password = '    abcdABCD1234'
+    salt = 'test-salt'
+
+    def test_encode_verify(self):
+        for name in ('pbkdf2', 'scrypt'):
+            password_hasher = PADSPasswordHasher(name)
+            encoded = password_hasher.encode(self.password, self.salt)
+            # Assertions
+            self.assertTrue(password_hasher.verify(self.password, encoded))
+            self.assertFalse(password_hasher.verify('    wrong', encoded))
+            self.assertFalse(password_hasher.must_update(encoded))
+
+    def test_verify_other_hasher(self):
+        encoded = PADSPasswordHasher('scrypt').encode(
+            self.password, self.salt)
+        password_hasher = PADSPasswordHasher('pbkdf2')
+        # Assertions
+        #  Hashes made with other hashers must still be verified...
+        self.assertTrue(password_hasher.verify(self.password, encoded))
+        #  ...but must be replaced
+        self.assertTrue(password_hasher.must_update(encoded))
+
+    def test_verify_unknown_hasher(self):
+        password_hasher = PADSPasswordHasher()
+        self.assertFalse(password_hasher.verify(self.password, 'md5$a$b'))
+
+    def test_must_update_parameters_changed(self):
+        password_hasher = PADSPasswordHasher()
+        encoded = password_hasher.encode(self.password, self.salt)
+        with mock.patch.dict(defaults.strings,
+                             {'password_pbkdf2_iterations' : 2000}):
+            self.assertTrue(password_hasher.verify(self.password, encoded))
+            self.assertTrue(password_hasher.must_update(encoded))
+
+    def test_encode_without_pool(self):
+        password_hasher = PADSPasswordHasher()
+        encoded_pool = password_hasher.encode(self.password, self.salt)
+        with mock.patch.dict(defaults.strings, {'password_hash_workers' : 0}):
+            encoded = password_hasher.encode(self.password, self.salt)
+        self.assertEqual(encoded, encoded_pool)
+
+
+#
+# Rehash on Sign In Tests
+#
+@mock.patch.dict(defaults.strings, hasher_settings_light)
+class PADSPasswordRehashTests(TestCase):
+    username = 'test-rehash'
+    password = '    abcdABCD1234'
+
+    def setUp(self):
+        PADSWriteUserHelper().new(self.username, self.password)
+
+    def get_password_hash(self):
+        return PADSUser.objects.get(nickname_short=self.username).password_hash
+
+    def test_check_password_rehash(self):
+        password_hash_old = self.get_password_hash()
+        read_user_helper = PADSUserHelper()
+        read_user_helper.set_user_id_by_username(self.username)
+        with mock.patch.dict(defaults.strings, {'password_hasher' : 'scrypt'}):
+            check = read_user_helper.check_password(self.password)
+        # Assertions
+        self.assertTrue(check)
+        self.assertTrue(password_hash_old.startswith('pbkdf2_sha256$'))
+        self.assertTrue(self.get_password_hash().startswith('scrypt$'))
+        self.assertTrue(read_user_helper.check_password(self.password))
+
+    def test_check_password_rehash_wrong_password(self):
+        password_hash_old = self.get_password_hash()
+        read_user_helper = PADSUserHelper()
+        read_user_helper.set_user_id_by_username(self.username)
+        with mock.patch.dict(defaults.strings, {'password_hasher' : 'scrypt'}):
+            check = read_user_helper.check_password('    wrong')
+        # Assertions
+        self.assertFalse(check)
+        self.assertEqual(self.get_password_hash(), password_hash_old)
+
+    def test_check_password_rehash_view_user(self):
+        view_user = PADSOldUserHelper().get_user_by_nickname_short(
+            self.username)
+        with mock.patch.dict(defaults.strings,
+                             {'password_pbkdf2_iterations' : 2000}):
+            check = view_user.check_password(self.password)
+        # Assertions
+        self.assertTrue(check)
+        self.assertTrue(self.get_password_hash().startswith(
+            'pbkdf2_sha256$2000$'))
@@ -43,6 +43,14 @@ class PADSHelperTests(TestCase):
         self.assertEquals(user_copy, None,
                'Helper must fail to access User info when invalid User is set')
     
+    def test_get_user_from_db_supplied(self):
+        # A User record supplied to the Helper must not be loaded again
+        with self.assertNumQueries(0):
+            helper = PADSHelper(self.user_id, user_from_db=self.user)
+            user_copy = helper.get_user_from_db()
+        self.assertEqual(helper.user_id, self.user_id)
+        self.assertIs(user_copy, self.user)
+
     def test_set_user_id_valid(self):
         helper = PADSHelper()
         helper.set_user_id(self.user_id)
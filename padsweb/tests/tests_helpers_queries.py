@@ -0,0 +1,310 @@
+#
+#
+# Public Archive of Days Since Timers
+# Helper Query Count Regression Tests
+#
+#
+"""Guards against extra database round trips in the Helper classes.
+Every lookup of a single item should take only one query, whether or not
+the item is found. The User assigned to a Helper is only loaded once,
+when the Helper is created. Savepoints created by atomic blocks are 
+counted as queries.
+"""
+
+from django.test import TestCase
+from padsweb.helpers import PADSHelper
+from padsweb.helpers import PADSReadTimerHelper, PADSWriteTimerHelper
+from padsweb.helpers import PADSUserHelper, PADSWriteUserHelper
+from padsweb.models import PADSUser
+from padsweb.timers import PADSEditingTimerHelper, PADSPublicTimerHelper
+from padsweb.user import PADSUserHelper as PADSViewUserHelper
+
+#
+# Shared Test Items
+#
+write_user_helper = PADSWriteUserHelper()
+
+class PADSHelperQueryCountTestCase(TestCase):
+    """Base class for query count tests, with a test User owning a private
+    Timer, a public Timer and a Timer Group containing the public Timer.
+    """
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_id_fake = -9999
+        cls.username = 'test-dave'
+        cls.user = write_user_helper.prepare_user_in_db(
+                cls.username, '    abcdABCD1234')
+        cls.user.save()
+        write_timer_helper = PADSWriteTimerHelper(cls.user.id)
+        cls.timer_private_id = write_timer_helper.new('Private Timer')
+        cls.timer_public_id = write_timer_helper.new('Public Timer',
+                                                     public=True)
+        cls.group_id = write_timer_helper.new_group('Test Group')
+        write_timer_helper.add_to_group(cls.timer_public_id, cls.group_id)
+        cls.timer_public = write_timer_helper.user_timers.get(
+                pk=cls.timer_public_id)
+
+
+class PADSHelperQueryCountTests(PADSHelperQueryCountTestCase):
+    def test_get_user_from_db(self):
+        helper = PADSHelper(self.user.id)
+        with self.assertNumQueries(0):
+            self.assertIsNotNone(helper.get_user_from_db())
+
+    def test_get_user_from_db_invalidated(self):
+        helper = PADSHelper(self.user.id)
+        helper.invalidate_user()
+        with self.assertNumQueries(1):
+            self.assertIsNotNone(helper.get_user_from_db())
+            self.assertIsNotNone(helper.get_user_from_db())
+
+    def test_get_user_from_db_fake_user(self):
+        helper = PADSHelper(self.user_id_fake)
+        with self.assertNumQueries(1):
+            self.assertIsNone(helper.get_user_from_db())
+
+    def test_user_is_registered(self):
+        helper = PADSHelper(self.user.id)
+        with self.assertNumQueries(0):
+            self.assertTrue(helper.user_is_registered())
+
+    def test_set_user_id(self):
+        helper = PADSHelper()
+        with self.assertNumQueries(1):
+            helper.set_user_id(self.user.id)
+
+
+class PADSReadTimerHelperQueryCountTests(PADSHelperQueryCountTestCase):
+    def test_get_from_db(self):
+        helper = PADSReadTimerHelper(self.user.id)
+        with self.assertNumQueries(1):
+            self.assertIsNotNone(helper.get_from_db(self.timer_private_id))
+
+    def test_get_from_db_not_found(self):
+        helper = PADSReadTimerHelper()
+        with self.assertNumQueries(1):
+            self.assertIsNone(helper.get_from_db(self.timer_private_id))
+
+    def test_get_from_db_by_permalink_code(self):
+        helper = PADSReadTimerHelper()
+        with self.assertNumQueries(1):
+            self.assertIsNotNone(helper.get_from_db_by_permalink_code(
+                self.timer_public.permalink_code))
+
+    def test_get_from_db_by_permalink_code_not_found(self):
+        helper = PADSReadTimerHelper()
+        with self.assertNumQueries(1):
+            self.assertIsNone(helper.get_from_db_by_permalink_code('-'))
+
+    def test_get_from_db_by_description(self):
+        helper = PADSReadTimerHelper()
+        with self.assertNumQueries(1):
+            list(helper.get_from_db_by_description('Timer'))
+
+    def test_get_groups_by_timer_id(self):
+        helper = PADSReadTimerHelper(self.user.id)
+        with self.assertNumQueries(2):
+            groups = helper.get_groups_by_timer_id(self.timer_public_id)
+            self.assertEqual(len(groups), 1)
+
+    def test_get_groups_by_timer_id_not_found(self):
+        helper = PADSReadTimerHelper(self.user.id)
+        with self.assertNumQueries(1):
+            self.assertIsNone(helper.get_groups_by_timer_id(-9999))
+
+    def test_get_resets_from_db_by_timer_id(self):
+        helper = PADSReadTimerHelper(self.user.id)
+        with self.assertNumQueries(2):
+            resets = helper.get_resets_from_db_by_timer_id(
+                    self.timer_public_id)
+            self.assertEqual(len(resets), 1)
+
+
+class PADSWriteTimerHelperQueryCountTests(PADSHelperQueryCountTestCase):
+    def test_new(self):
+        helper = PADSWriteTimerHelper(self.user.id)
+        # Savepoint, Timer, Log Entry (two queries, see 
+        #  test_new_log_entry), savepoint release
+        with self.assertNumQueries(5):
+            self.assertIsNotNone(helper.new('New Timer'))
+
+    def test_new_group(self):
+        helper = PADSWriteTimerHelper(self.user.id)
+        # Name check, Group
+        with self.assertNumQueries(2):
+            self.assertIsNotNone(helper.new_group('New Group'))
+
+    def test_new_log_entry(self):
+        helper = PADSWriteTimerHelper(self.user.id)
+        # Timer reset count update (which checks for the Timer), Log Entry
+        with self.assertNumQueries(2):
+            self.assertIsNotNone(helper.new_log_entry(
+                    self.timer_private_id, 'Log Entry'))
+
+    def test_add_to_group(self):
+        helper = PADSWriteTimerHelper(self.user.id)
+        # Timer check, Group check, Group Inclusion
+        with self.assertNumQueries(3):
+            self.assertTrue(helper.add_to_group(
+                    self.timer_private_id, self.group_id))
+
+    def test_remove_from_group(self):
+        helper = PADSWriteTimerHelper(self.user.id)
+        # Group check, Timer check, Group Inclusion lookup, delete
+        with self.assertNumQueries(4):
+            self.assertTrue(helper.remove_from_group(
+                    self.timer_public_id, self.group_id))
+
+    def test_remove_from_group_not_in_group(self):
+        helper = PADSWriteTimerHelper(self.user.id)
+        with self.assertNumQueries(3):
+            self.assertFalse(helper.remove_from_group(
+                    self.timer_private_id, self.group_id))
+
+    def test_delete_not_found(self):
+        helper = PADSWriteTimerHelper(self.user.id)
+        # Timer lookup
+        with self.assertNumQueries(1):
+            self.assertFalse(helper.delete(-9999))
+
+    def test_delete_group_by_id_not_found(self):
+        helper = PADSWriteTimerHelper(self.user.id)
+        # Timer Group lookup
+        with self.assertNumQueries(1):
+            self.assertFalse(helper.delete_group_by_id(-9999))
+
+    def test_set_description(self):
+        helper = PADSWriteTimerHelper(self.user.id)
+        # Timer lookup, savepoint, Log Entry (two queries, see 
+        #  test_new_log_entry), Timer, savepoint release
+        with self.assertNumQueries(6):
+            self.assertTrue(helper.set_description(
+                    self.timer_private_id, 'Renamed Timer'))
+
+    def test_set_description_not_found(self):
+        helper = PADSWriteTimerHelper(self.user.id)
+        with self.assertNumQueries(1):
+            self.assertFalse(helper.set_description(-9999, 'Renamed Timer'))
+
+    def test_reset_by_id(self):
+        helper = PADSWriteTimerHelper(self.user.id)
+        # Timer lookup, savepoint, Log Entry (two queries), Timer,
+        #  savepoint release
+        with self.assertNumQueries(6):
+            self.assertTrue(helper.reset_by_id(
+                    self.timer_private_id, 'Test Reset'))
+
+    def test_reset_by_id_not_found(self):
+        helper = PADSWriteTimerHelper(self.user.id)
+        with self.assertNumQueries(1):
+            self.assertFalse(helper.reset_by_id(-9999, 'Test Reset'))
+
+    def test_stop_by_id(self):
+        helper = PADSWriteTimerHelper(self.user.id)
+        # Timer lookup, savepoint, Log Entry (two queries), Timer,
+        #  savepoint release
+        with self.assertNumQueries(6):
+            self.assertTrue(helper.stop_by_id(
+                    self.timer_private_id, 'Test Stop'))
+
+    def test_stop_by_id_not_found(self):
+        helper = PADSWriteTimerHelper(self.user.id)
+        with self.assertNumQueries(1):
+            self.assertFalse(helper.stop_by_id(-9999, 'Test Stop'))
+
+    def test_reset_many_by_id(self):
+        helper = PADSWriteTimerHelper(self.user.id)
+        helper.user_is_registered()
+        # Savepoint, Timer lookup, Timers, reset counts, Log Entries,
+        #  savepoint release; no matter how many Timers are reset
+        with self.assertNumQueries(6):
+            self.assertEqual(helper.reset_many_by_id(
+                    [self.timer_private_id, self.timer_public_id], 
+                    'Test Reset'), 2)
+
+    def test_add_many_to_group(self):
+        helper = PADSWriteTimerHelper(self.user.id)
+        helper.user_is_registered()
+        # Savepoint, Timer Group lookup, Timer lookup, Group Inclusions,
+        #  savepoint release
+        with self.assertNumQueries(5):
+            self.assertEqual(helper.add_many_to_group(
+                    [self.timer_private_id, self.timer_public_id], 
+                    self.group_id), 1)
+
+
+class PADSUserHelperQueryCountTests(PADSHelperQueryCountTestCase):
+    def test_get_user_from_db_by_username(self):
+        helper = PADSUserHelper()
+        with self.assertNumQueries(1):
+            self.assertIsNotNone(
+                    helper.get_user_from_db_by_username(self.username))
+
+    def test_get_user_from_db_by_username_not_found(self):
+        helper = PADSUserHelper()
+        with self.assertNumQueries(1):
+            self.assertIsNone(helper.get_user_from_db_by_username('-'))
+
+    def test_set_user_id_by_username(self):
+        helper = PADSUserHelper()
+        with self.assertNumQueries(1):
+            helper.set_user_id_by_username(self.username)
+
+    def test_user_has_signed_in(self):
+        helper = PADSUserHelper(self.user.id)
+        with self.assertNumQueries(0):
+            helper.user_has_signed_in()
+
+
+class PADSWriteUserHelperQueryCountTests(PADSHelperQueryCountTestCase):
+    def test_delete_invalidates_user(self):
+        helper = PADSWriteUserHelper(self.user.id)
+        self.assertTrue(helper.delete())
+        self.assertFalse(PADSUser.objects.filter(pk=self.user.id).exists())
+        # The deleted User must not be served from the Helper
+        with self.assertNumQueries(1):
+            self.assertFalse(helper.user_is_registered())
+
+
+class PADSViewHelperQueryCountTests(PADSHelperQueryCountTestCase):
+    def test_get_timer_for_view_by_id(self):
+        helper = PADSPublicTimerHelper()
+        with self.assertNumQueries(1):
+            self.assertIsNotNone(
+                    helper.get_timer_for_view_by_id(self.timer_public_id))
+
+    def test_get_timer_for_view_by_id_not_found(self):
+        helper = PADSPublicTimerHelper()
+        with self.assertNumQueries(1):
+            self.assertIsNone(
+                    helper.get_timer_for_view_by_id(self.timer_private_id))
+
+    def test_get_timer_for_view_by_permalink_code(self):
+        helper = PADSPublicTimerHelper()
+        with self.assertNumQueries(1):
+            self.assertIsNotNone(helper.get_timer_for_view_by_permalink_code(
+                    self.timer_public.permalink_code))
+
+    def test_get_timer_group_for_view_by_id(self):
+        helper = PADSEditingTimerHelper(self.user.id)
+        with self.assertNumQueries(1):
+            self.assertIsNotNone(
+                    helper.get_timer_group_for_view_by_id(self.group_id))
+
+    def test_get_timer_group_for_view_by_id_not_found(self):
+        helper = PADSEditingTimerHelper(self.user.id)
+        with self.assertNumQueries(1):
+            self.assertIsNone(helper.get_timer_group_for_view_by_id(-9999))
+
+    def test_get_timer_group_for_view_by_name(self):
+        helper = PADSEditingTimerHelper(self.user.id)
+        with self.assertNumQueries(1):
+            self.assertIsNotNone(
+                    helper.get_timer_group_for_view_by_name('Test Group'))
+
+    def test_get_user_from_db_by_id(self):
+        helper = PADSViewUserHelper()
+        with self.assertNumQueries(1):
+            self.assertIsNotNone(helper.get_user_from_db_by_id(self.user.id))
+        with self.assertNumQueries(1):
+            self.assertIsNone(helper.get_user_from_db_by_id(-9999))
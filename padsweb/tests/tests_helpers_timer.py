@@ -12,6 +12,7 @@ from padsweb.helpers import PADSWriteUserHelper
 from padsweb.models import GroupInclusion
 from padsweb.models import PADSTimer, PADSTimerGroup, PADSTimerReset 
 from padsweb.settings import defaults
+from padsweb.strings import labels
 import time
 #
 # Shared Test Items
@@ -729,6 +730,20 @@ class PADSWriteTimerHelperNewLogEntryTests(TestCase):
         self.assertTrue(entry_created)
         self.assertIsNotNone(entry_id)
 
+    def test_new_log_entry_reset_count(self):
+        timer_before = PADSTimer.objects.get(pk=self.timer_a1_p_id)
+        entry_id = self.write_timer_helper_a.new_log_entry(
+                self.timer_a1_p_id, 'Event for Test Timer A1')
+        entry = PADSTimerReset.objects.get(pk=entry_id)
+        timer = PADSTimer.objects.get(pk=self.timer_a1_p_id)
+        # Assertions
+        self.assertEqual(timer.reset_count, timer_before.reset_count + 1)
+        self.assertEqual(timer.reset_count, 
+                timer.padstimerreset_set.count())
+        self.assertEqual(timer.reset_latest_date_time, entry.date_time)
+        self.assertEqual(timer.reset_previous_date_time, 
+                timer_before.reset_latest_date_time)
+
     def test_new_log_entry_wrong_user_a(self):
         reason = 'Attempt by User A to add log entry to Timer Q1'
         entry_id = self.write_timer_helper_a.new_log_entry(
@@ -2166,4 +2181,125 @@ class PADSWriteTimerHelperStopByIdTests(TestCase):
         self.assertTrue(self.timers_cfdts_unchanged(),
                    'Count-from date time on test Timers must remain unchanged')
         self.assertFalse(stop_logged,
-                         'Failed Timer stops must not be logged')
\ No newline at end of file
+                         'Failed Timer stops must not be logged')
+
+
+class PADSWriteTimerHelperBulkTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Set Up Test Users and Write Timer Helpers
+        #  Test User A
+        cls.user_a = write_user_helper.prepare_user_in_db(
+                'test-jess-bulk', '       ///?????huyyuhHYUUH534435')
+        cls.user_a.save()
+        cls.write_timer_helper_a = PADSWriteTimerHelper(cls.user_a.id)
+        #  Test User B
+        cls.user_b = write_user_helper.prepare_user_in_db(
+                'not-jess-bulk', '       ///?????huyyuhHYUUH534435')
+        cls.user_b.save()
+        cls.write_timer_helper_b = PADSWriteTimerHelper(cls.user_b.id)
+        
+        # Set Up Test Timers
+        cls.timer_a_ids = [cls.write_timer_helper_a.new(
+                'Test Timer A{0} by Test User A'.format(i)) 
+                for i in range(0, 3)]
+        cls.timer_ah_id = cls.write_timer_helper_a.new(
+                'Test Timer AH by Test User A (Historical)', historical=True)
+        cls.timer_b1_p_id = cls.write_timer_helper_b.new(
+                'Test Timer B1 by Test User B (Public)', public=True)
+        cls.group_a_id = cls.write_timer_helper_a.new_group('Test Group A')
+
+    def test_reset_many_by_id(self):
+        reason = 'User A Resetting Many Timers'
+        timer_ids = self.timer_a_ids + [
+                self.timer_ah_id, self.timer_b1_p_id, -9999, 'x']
+        timers_reset = self.write_timer_helper_a.reset_many_by_id(
+                timer_ids, reason)
+        # Assertions
+        self.assertEqual(timers_reset, 3, 
+                'Only User A\'s non-historical Timers must be reset')
+        for i in self.timer_a_ids:
+            timer = PADSTimer.objects.get(pk=i)
+            self.assertTrue(timer.running)
+            self.assertEqual(timer.reset_count, 2)
+            self.assertEqual(timer.count_from_date_time, 
+                             timer.reset_latest_date_time)
+        self.assertEqual(PADSTimerReset.objects.filter(
+                reason__icontains=reason).count(), 3)
+        self.assertEqual(
+                PADSTimer.objects.get(pk=self.timer_b1_p_id).reset_count, 1,
+                'Other User\'s (B) Timer must not be reset')
+
+    def test_reset_many_by_id_bad_reason(self):
+        for i in bad_str_inputs.values():
+            self.assertEqual(
+                    self.write_timer_helper_a.reset_many_by_id(
+                    self.timer_a_ids, i), 0)
+        self.assertEqual(PADSTimerReset.objects.filter(
+                timer_id__in=self.timer_a_ids).count(), 3)
+
+    def test_stop_many_by_id(self):
+        reason = 'User A Stopping Many Timers'
+        timer_ids = [self.timer_a_ids[0], self.timer_ah_id, 
+                     self.timer_b1_p_id]
+        timers_stopped = self.write_timer_helper_a.stop_many_by_id(
+                timer_ids, reason)
+        # Assertions
+        self.assertEqual(timers_stopped, 2)
+        self.assertFalse(PADSTimer.objects.get(
+                pk=self.timer_a_ids[0]).running)
+        self.assertFalse(PADSTimer.objects.get(pk=self.timer_ah_id).running)
+        self.assertTrue(PADSTimer.objects.get(
+                pk=self.timer_b1_p_id).running)
+        self.assertEqual(PADSTimerReset.objects.get(
+                timer_id=self.timer_a_ids[0], reason__icontains=reason
+                ).reason, labels['TIMER_SUSPEND_NOTICE'].format(reason))
+        self.assertEqual(PADSTimerReset.objects.get(
+                timer_id=self.timer_ah_id, reason__icontains=reason
+                ).reason, labels['TIMER_STOP_NOTICE'].format(reason))
+        # Timers that are no longer running are not stopped again
+        self.assertEqual(self.write_timer_helper_a.stop_many_by_id(
+                timer_ids, reason), 0)
+
+    def test_set_public_many_by_id(self):
+        timer_ids = self.timer_a_ids + [self.timer_b1_p_id]
+        # Assertions
+        self.assertEqual(self.write_timer_helper_a.set_public_many_by_id(
+                timer_ids, True), 3)
+        self.assertEqual(PADSTimer.objects.filter(
+                pk__in=self.timer_a_ids, public=True).count(), 3)
+        self.assertEqual(self.write_timer_helper_a.set_public_many_by_id(
+                timer_ids, True), 0, 'Public Timers must not be counted')
+        self.assertEqual(self.write_timer_helper_a.set_public_many_by_id(
+                timer_ids, False), 3)
+        self.assertTrue(PADSTimer.objects.get(pk=self.timer_b1_p_id).public,
+                'Other User\'s (B) Timer must not be unshared')
+        self.assertEqual(self.write_timer_helper_a.set_public_many_by_id(
+                timer_ids, 'False'), 0)
+
+    def test_add_many_to_group(self):
+        GroupInclusion.objects.create(
+                timer_id=self.timer_a_ids[0], group_id=self.group_a_id)
+        timer_ids = self.timer_a_ids + [self.timer_b1_p_id]
+        timers_added = self.write_timer_helper_a.add_many_to_group(
+                timer_ids, self.group_a_id)
+        # Assertions
+        self.assertEqual(timers_added, 3, 
+                'Public Timers of other Users must also be added')
+        self.assertEqual(GroupInclusion.objects.filter(
+                group_id=self.group_a_id).count(), 4)
+        self.assertEqual(self.write_timer_helper_b.add_many_to_group(
+                timer_ids, self.group_a_id), 0,
+                'Timers must not be added to other Users\' Groups')
+
+    def test_bulk_signed_out(self):
+        write_timer_helper = PADSWriteTimerHelper()
+        # Assertions
+        self.assertEqual(write_timer_helper.reset_many_by_id(
+                self.timer_a_ids, 'Signed out reset'), 0)
+        self.assertEqual(write_timer_helper.stop_many_by_id(
+                self.timer_a_ids, 'Signed out stop'), 0)
+        self.assertEqual(write_timer_helper.set_public_many_by_id(
+                self.timer_a_ids, True), 0)
+        self.assertEqual(write_timer_helper.add_many_to_group(
+                self.timer_a_ids, self.group_a_id), 0)
@@ -8,6 +8,8 @@
 from django.test import TestCase
 from django.utils import timezone
 from padsweb.helpers import PADSUserHelper, PADSWriteUserHelper
+from padsweb.helpers import PADSWriteTimerHelper
+from padsweb.models import GroupInclusion, PADSTimer, PADSTimerGroup
 from padsweb.models import PADSUser
 from padsweb.settings import defaults
 import secrets  # For token_urlsafe()
@@ -156,7 +158,6 @@ class PADSUserHelperSetUserIdByUsernameTests(TestCase):
 
 # Write Helper Tests
 # TODO: PADSWriteUserHelper.generate_ql_password()
-# TODO: PADSWriteUserHelper.merge_users_by_id() tests (valid, invalid ids)
 class PADSWriteUserHelperDeleteTests(TestCase):
     @classmethod
     def setUpTestData(cls):
@@ -201,6 +202,111 @@ class PADSWriteUserHelperDeleteTests(TestCase):
         self.assertFalse(op_result,
                         'Helper must indicate failure of User deletion')        
 
+class PADSWriteUserHelperMergeUsersByIdTests(TestCase):
+    # Expected number of queries for a merge with one pair of Groups to be
+    # combined, including savepoints and the deletion of the Quick List
+    merge_query_count = 18
+
+    def setUp(self):
+        # Sign up Test User and Quick List
+        self.write_user_helper = PADSWriteUserHelper()
+        self.write_user_helper.new('test_jess_m', '    uiopUIOP-9999')
+        self.user_id = PADSUser.objects.get(nickname_short='test_jess_m').id
+        ql_password = self.write_user_helper.new()
+        self.ql_user_id = int(ql_password.partition(
+                settings['ql_password_seg_separator'])[0])
+        self.write_timer_helper = PADSWriteTimerHelper(self.user_id)
+        self.write_timer_helper_q = PADSWriteTimerHelper(self.ql_user_id)
+        self.write_user_helper.set_user_id(self.user_id)
+        
+        # Set up Timer Groups, two of which have clashing names
+        self.group_shared_id = self.write_timer_helper.new_group('Shared')
+        self.group_default_id = self.write_timer_helper.new_group('Default')
+        self.group_q_shared_id = self.write_timer_helper_q.new_group('Shared')
+        self.group_q_only_id = self.write_timer_helper_q.new_group('QL Only')
+
+        # Set up Timers
+        self.timer_id = self.write_timer_helper.new('Test Timer', public=True)
+        self.write_timer_helper.add_to_group(
+                self.timer_id, self.group_shared_id)
+        #  The Quick List also has the User's public Timer in a Group of
+        #  the same name
+        self.write_timer_helper_q.add_to_group(
+                self.timer_id, self.group_q_shared_id)
+        self.timer_q_shared_id = self.write_timer_helper_q.new('Q Shared')
+        self.write_timer_helper_q.add_to_group(
+                self.timer_q_shared_id, self.group_q_shared_id)
+        self.timer_q_only_id = self.write_timer_helper_q.new('Q Only')
+        self.write_timer_helper_q.add_to_group(
+                self.timer_q_only_id, self.group_q_only_id)
+        self.timer_q_ungrouped_ids = []
+        for i in range(0, 3):
+            self.timer_q_ungrouped_ids.append(
+                    self.write_timer_helper_q.new('Q Ungrouped {0}'.format(i)))
+    
+    def get_group_timer_ids(self, group_id):
+        return set(GroupInclusion.objects.filter(
+                group_id=group_id).values_list('timer_id', flat=True))
+
+    def test_merge_users_by_id_valid(self):
+        op_result = self.write_user_helper.merge_users_by_id(
+                self.ql_user_id, default_group_id=self.group_default_id)
+        # Assertions
+        self.assertTrue(op_result)
+        self.assertFalse(PADSUser.objects.filter(pk=self.ql_user_id).exists())
+        self.assertEqual(PADSTimer.objects.filter(
+                creator_user_id=self.user_id).count(), 6)
+        #  Groups of the same name are combined
+        self.assertEqual(
+                set(PADSTimerGroup.objects.filter(creator_user_id=self.user_id
+                    ).values_list('name', flat=True)),
+                {'Shared', 'Default', 'QL Only'})
+        self.assertEqual(self.get_group_timer_ids(self.group_shared_id),
+                         {self.timer_id, self.timer_q_shared_id})
+        self.assertEqual(self.get_group_timer_ids(self.group_q_only_id),
+                         {self.timer_q_only_id})
+        #  Ungrouped Timers are placed in the default Group
+        self.assertEqual(self.get_group_timer_ids(self.group_default_id),
+                         set(self.timer_q_ungrouped_ids))
+
+    def test_merge_users_by_id_query_count(self):
+        with self.assertNumQueries(self.merge_query_count):
+            self.write_user_helper.merge_users_by_id(
+                    self.ql_user_id, default_group_id=self.group_default_id)
+
+    def test_merge_users_by_id_query_count_more_timers(self):
+        # The number of queries must not depend on the number of Timers
+        for i in range(0, 20):
+            timer_id = self.write_timer_helper_q.new('Q Extra {0}'.format(i))
+            if (i % 2) == 0:
+                self.write_timer_helper_q.add_to_group(
+                        timer_id, self.group_q_shared_id)
+        with self.assertNumQueries(self.merge_query_count):
+            self.write_user_helper.merge_users_by_id(
+                    self.ql_user_id, default_group_id=self.group_default_id)
+
+    def test_merge_users_by_id_others_default_group(self):
+        # Timers must not be placed in another User's Group
+        write_user_helper_x = PADSWriteUserHelper()
+        write_user_helper_x.new('not_jess_m', '    uiopUIOP-9999')
+        user_x_id = PADSUser.objects.get(nickname_short='not_jess_m').id
+        group_x_id = PADSWriteTimerHelper(user_x_id).new_group('Other')
+        op_result = self.write_user_helper.merge_users_by_id(
+                self.ql_user_id, default_group_id=group_x_id)
+        # Assertions
+        self.assertTrue(op_result)
+        self.assertEqual(self.get_group_timer_ids(group_x_id), set())
+
+    def test_merge_users_by_id_invalid_ids(self):
+        for i in (-99999, self.user_id):
+            op_result = self.write_user_helper.merge_users_by_id(i)
+            # Assertions
+            self.assertFalse(op_result)
+            self.assertTrue(PADSUser.objects.filter(pk=self.user_id).exists())
+            self.assertEqual(PADSTimer.objects.filter(
+                    creator_user_id=self.ql_user_id).count(), 5)
+
+
 class PADSWriteUserHelperNewTests(TestCase):
     """Unit tests for PADSWriteUserHelper.new() which creates user accounts"""
     @classmethod
@@ -225,6 +331,15 @@ class PADSWriteUserHelperNewTests(TestCase):
         self.assertEquals(ql_user_test.id, ql_user_id,
           'Quick List user must be in database with correct id after creation')
     
+    def test_new_ql_is_quick_list(self):
+        ql_password = self.write_user_helper.new()
+        ql_user_id = self.read_user_helper.split_ql_password(ql_password)[0]
+        self.write_user_helper.new('test_jess_nql', '    abcdABCD1234')
+        # Assertions
+        self.assertTrue(PADSUser.objects.get(pk=ql_user_id).is_quick_list)
+        self.assertFalse(PADSUser.objects.get(
+            nickname_short='test_jess_nql').is_quick_list)
+    
     def test_new_blank_usernames(self):
         password = '    abcdABCD1234-5678'
         usernames = blank_inputs.values()
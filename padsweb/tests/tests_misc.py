@@ -0,0 +1,72 @@
+#
+#
+# Public Archive of Days Since Timers
+# Miscellaneous Helper Classes and Functions Tests
+#
+#
+
+# Imports
+from django.test import SimpleTestCase
+from padsweb.misc import NonMetricMeasureInt
+
+class NonMetricMeasureIntTests(SimpleTestCase):
+
+	def get_time_measure(self, value):
+		return NonMetricMeasureInt(('min', 'h'), 'days', (60, 24), value)
+
+	def test_get_measures(self):
+		# 400 days, 23 hours and 59 minutes
+		measure = self.get_time_measure(577439)
+
+		# Assertions
+		self.assertEqual(measure.get_measures(),
+			{'min' : 59, 'h' : 23, 'days' : 400})
+		self.assertEqual(measure.get_measure('days'), 400)
+		self.assertIsNone(measure.get_measure('weeks'))
+
+	def test_get_measures_lsd(self):
+		# 960 farthings is one pound
+		measure = NonMetricMeasureInt(('farthings', 'pence', 'shillings'),
+			'pounds', (4, 12, 20), 960)
+
+		# Assertions
+		self.assertEqual(measure.get_string(),
+			'1 pounds, 0 shillings, 0 pence, 0 farthings')
+
+	def test_get_measures_returns_copy(self):
+		measure = self.get_time_measure(61)
+		measure.get_measures()['min'] = 0
+
+		# Assertions
+		self.assertEqual(measure.get_measure('min'), 1)
+
+	def test_get_string(self):
+		measure = self.get_time_measure(1441)
+
+		# Assertions
+		self.assertEqual(measure.get_string(), '1 days, 0 h, 1 min')
+		self.assertEqual(measure.get_string(zeroes=False), '1 days, 1 min')
+		self.assertEqual(self.get_time_measure(0).get_string(zeroes=False),
+			'')
+
+	def test_get_string_negative(self):
+		measure = self.get_time_measure(-61)
+
+		# Assertions
+		self.assertEqual(measure.get_string(zeroes=False), '-1 h, 1 min')
+
+	def test_set_separator_str(self):
+		measure = self.get_time_measure(61)
+		measure.set_separator_str(' {} ')
+
+		# Assertions
+		self.assertEqual(measure.get_string(), '0 days {} 1 h {} 1 min')
+
+	def test_set_value(self):
+		measure = self.get_time_measure(61)
+		measure.get_measures()
+		measure.set_value(-1440)
+
+		# Assertions
+		self.assertEqual(measure.get_measure('days'), 1)
+		self.assertEqual(str(measure), '-1 days, 0 h, 0 min')
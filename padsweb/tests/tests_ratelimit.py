@@ -0,0 +1,83 @@
+#
+#
+# Public Archive of Days Since Timers
+# Sign-in Rate Limiter Unit Tests
+#
+#
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from padsweb.ratelimit import PADSCacheRateLimitBackend
+from padsweb.ratelimit import PADSMemoryRateLimitBackend
+from padsweb.ratelimit import PADSRateLimitBackend
+
+#
+# Shared Test Items
+#
+class TestClock:
+    # Clock that only moves when told to
+    def advance(self, seconds):
+        self.now += seconds
+
+    def __call__(self):
+        return self.now
+
+    def __init__(self):
+        self.now = 1000.0
+
+#
+# Token Bucket Backend Tests
+#
+class PADSRateLimitBackendTests(SimpleTestCase):
+    # Buckets of 3 tokens, refilled at one token every 10 seconds
+    size = 3
+    rate = 0.1
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.clock = TestClock()
+        self.backends = (PADSMemoryRateLimitBackend(clock=self.clock),
+                         PADSCacheRateLimitBackend(clock=self.clock))
+
+    def test_take_until_empty(self):
+        for b in self.backends:
+            takes = [b.take('test', self.size, self.rate) for i in range(4)]
+            # Assertions
+            self.assertEqual(takes, [True, True, True, False])
+            self.assertTrue(b.take('test-other', self.size, self.rate))
+
+    def test_take_refilled(self):
+        for b in self.backends:
+            for i in range(0, self.size):
+                b.take('test', self.size, self.rate)
+            self.clock.advance(9)
+            self.assertFalse(b.take('test', self.size, self.rate))
+            self.clock.advance(1)
+            self.assertTrue(b.take('test', self.size, self.rate))
+            # Buckets must not fill up beyond their size
+            self.clock.advance(3600)
+            takes = [b.take('test', self.size, self.rate) for i in range(4)]
+            self.assertEqual(takes, [True, True, True, False])
+
+    def test_give_back(self):
+        for b in self.backends:
+            for i in range(0, self.size):
+                b.take('test', self.size, self.rate)
+            b.give_back('test', self.size, self.rate)
+            # Assertions
+            self.assertTrue(b.take('test', self.size, self.rate))
+            self.assertFalse(b.take('test', self.size, self.rate))
+
+    def test_memory_full_buckets_forgotten(self):
+        backend = self.backends[0]
+        backend.take('test', self.size, self.rate)
+        backend.give_back('test', self.size, self.rate)
+        self.assertEqual(len(backend.buckets), 0)
+
+    def test_backend_incomplete(self):
+        # Backends missing any of the methods must not be created
+        class IncompleteBackend(PADSRateLimitBackend):
+            def take(self, key, size, rate):
+                return True
+        self.assertRaises(TypeError, IncompleteBackend)
@@ -0,0 +1,51 @@
+#
+#
+# Public Archive of Days Since Timers
+# SQLite Connection Tuning Tests
+#
+#
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from django.db import connection, connections
+from django.test import SimpleTestCase
+from padsweb.settings import defaults
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'Not using SQLite')
+class SQLiteTuningTests(SimpleTestCase):
+    def setUp(self):
+        # The test database is in memory, where WAL mode is not available,
+        #  thus the pragmas are checked on a separate database file
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        default_connection = connections['default']
+        settings_dict = dict(default_connection.settings_dict)
+        settings_dict['NAME'] = os.path.join(temp_dir.name, 'tuning.sqlite3')
+        self.connection = default_connection.__class__(
+            settings_dict, 'tuning')
+        self.addCleanup(self.connection.close)
+
+    def get_pragma(self, name):
+        with self.connection.cursor() as cursor:
+            cursor.execute('PRAGMA {0}'.format(name))
+            return cursor.fetchone()[0]
+
+    def test_tune_sqlite_connection(self):
+        self.connection.ensure_connection()
+        # Assertions
+        self.assertEqual(self.get_pragma('journal_mode'), 'wal')
+        self.assertEqual(self.get_pragma('synchronous'), 1) # NORMAL
+        self.assertEqual(self.get_pragma('busy_timeout'),
+                         defaults['sqlite_busy_timeout'])
+        self.assertEqual(self.get_pragma('cache_size'),
+                         defaults['sqlite_cache_size'])
+
+    def test_tune_sqlite_connection_disabled(self):
+        with mock.patch.dict(defaults.strings, {'sqlite_tuning' : False}):
+            self.connection.ensure_connection()
+        # Assertions
+        self.assertEqual(self.get_pragma('journal_mode'), 'delete')
+        self.assertEqual(self.get_pragma('synchronous'), 2) # FULL
@@ -244,3 +244,82 @@ class StringDictionaryExtendedTests(TestCase):
 		# Assertions
 		self.assertEqual(sd_test_self_patch.get_patch_level(), 0)
 
+
+	def test_infinite_loop_refused_at_patch(self):
+		# Arrangements
+		sd_test_a = PADSStringDictionary({'string1' : 'A'}, 'Dictionary A')
+		sd_test_b = PADSStringDictionary({'string2' : 'B'}, 'Dictionary B')
+		sd_test_c = PADSStringDictionary({'string3' : 'C'}, 'Dictionary C')
+		sd_test_a.patch(sd_test_b)
+		sd_test_b.patch(sd_test_c)
+		
+		# Actions
+		sd_test_c.patch(sd_test_a)
+		
+		# Assertions
+		#  The looping patch must not be applied
+		self.assertEqual(sd_test_c.get_patch_level(), 0)
+		self.assertTrue(sd_test_c.infinite_loop)
+		self.assertTrue(sd_test_a.infinite_loop)
+		self.assertEquals(sd_test_a['string3'], 'C')
+		self.assertRaises(KeyError, sd_test_c.__getitem__, 'string1')
+
+
+class StringDictionaryFlatLookupTests(TestCase):
+	
+	def test_unpatched_changes_seen(self):
+		# Arrangements
+		dict_init = {'string1' : 'hood'}
+		sd_test = PADSStringDictionary(dict_init, 'Test dictionary')
+		sd_test['string1']
+		
+		# Actions
+		dict_init['string1'] = 'bonnet'
+		
+		# Assertions
+		self.assertEquals(sd_test['string1'], 'bonnet')
+	
+	def test_patch_after_lookup(self):
+		# Arrangements
+		sd_test = PADSStringDictionary({'string1' : 'hood'}, 
+			'Test dictionary (en-us)')
+		sd_patch = PADSStringDictionary({'string1' : 'bonnet'}, 
+			'Test patch (en-uk)')
+		self.assertEquals(sd_test['string1'], 'hood')
+		
+		# Actions
+		sd_test.patch(sd_patch)
+		
+		# Assertions
+		self.assertEquals(sd_test['string1'], 'bonnet')
+	
+	def test_patch_of_patch_after_lookup(self):
+		# Arrangements
+		#  Patches applied to a patch must reach dictionaries that
+		#  were patched with it earlier
+		sd_test = PADSStringDictionary({'string1' : 'hood'}, 
+			'Test dictionary (en-us)')
+		sd_patch = PADSStringDictionary({'string2' : 'colour'}, 
+			'Test patch (en-uk)')
+		sd_patch_patch = PADSStringDictionary({'string1' : 'bonnet'}, 
+			'Test patch of patch (en-uk)')
+		sd_test.patch(sd_patch)
+		self.assertEquals(sd_test['string1'], 'hood')
+		
+		# Actions
+		sd_patch.patch(sd_patch_patch)
+		
+		# Assertions
+		self.assertEquals(sd_test['string1'], 'bonnet')
+		self.assertEquals(sd_test['string2'], 'colour')
+	
+	def test_patch_with_plain_dict(self):
+		# Arrangements
+		sd_test = PADSStringDictionary({'string1' : 'hood'}, 
+			'Test dictionary (en-us)')
+		
+		# Actions
+		sd_test.patch({'string1' : 'bonnet'})
+		
+		# Assertions
+		self.assertEquals(sd_test['string1'], 'bonnet')
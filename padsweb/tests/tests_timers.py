@@ -0,0 +1,678 @@
+#
+#
+# Public Archive of Days Since Timers
+# Timer View Helper and Timer Group Presentation Class Unit Tests
+#
+#
+
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from padsweb.models import GroupInclusion, PADSArchivedTimerReset, PADSTimer
+from padsweb.models import PADSTimerGroup, PADSTimerReset
+from padsweb.settings import *
+from padsweb.strings import labels
+from padsweb.timers import PADSEditingTimerHelper, PADSPublicTimerHelper
+from padsweb.timers import PADSLongestRunningTimerGroup
+from padsweb.timers import PADSNewestTimerGroup
+from padsweb.timers import PADSRecentlyResetTimerGroup
+from padsweb.timers import PADSViewTimer, PADSViewSuspendedTimer
+from padsweb.user import PADSUserHelper
+
+#
+# Shared Test Items
+#
+user_helper = PADSUserHelper()
+
+#
+# Page Loading Tests
+#
+class PADSViewTimerGroupPageLoadingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Sign Up Test User
+        cls.user_id = user_helper.put_user_in_db(
+            'test-dave', '    abcdABCD1234')
+        editing_timer_helper = PADSEditingTimerHelper(cls.user_id)
+
+        # Create Public Timers, some of them in a Group, and with an
+        # extra Reset History entry
+        cls.timer_count = INDEX_PAGE_SIZE * 2
+        group_id = editing_timer_helper.new_timer_group('test-group')
+        for i in range(0, cls.timer_count):
+            timer_id = editing_timer_helper.new_timer(
+                'Public Timer {0}'.format(i), public=True)
+            if (i % 2) == 0:
+                editing_timer_helper.new_group_inclusion_by_id(
+                    timer_id, group_id)
+                editing_timer_helper.new_timer_reset_history(
+                    timer_id, 'Extra History Entry')
+
+    def test_get_timers_query_count_fixed(self):
+        # Query count for loading a page must not depend on page size
+        group = PADSNewestTimerGroup(PADSPublicTimerHelper())
+        for last in (1, 2, INDEX_PAGE_SIZE):
+            with self.assertNumQueries(2):
+                group.get_timers(0, last)
+
+    def test_get_timers_render_without_queries(self):
+        group = PADSNewestTimerGroup(PADSPublicTimerHelper())
+        view_timers = group.get_timers(0, INDEX_PAGE_SIZE)
+        # Rendering details used on index cards must not hit the database
+        with self.assertNumQueries(0):
+            for t in view_timers:
+                t.get_heading_short_split()
+                t.get_description_short()
+                t.get_status_line()
+                t.creator_user_nickname_short()
+                t.reset_latest_date_time()
+                t.reset_count()
+                t.get_associated_groups_from_db()
+
+    def test_get_timers_running_times(self):
+        group = PADSNewestTimerGroup(PADSPublicTimerHelper())
+        view_timers = group.get_timers(0, INDEX_PAGE_SIZE)
+        date_time = timezone.now() + datetime.timedelta(days=1, minutes=61)
+        group.helper.set_running_times(view_timers, date_time)
+        for t in view_timers:
+            # Running times are worked out as of the same point in time
+            expected_minutes = int(
+                (date_time - t.count_from_date_time()).total_seconds() / 60)
+            self.assertEqual(t.get_running_time_minutes(), expected_minutes)
+            self.assertEqual(t.get_running_time_string(), 
+                             t.get_measures().get_string(zeroes=False))
+            self.assertEqual(t.get_days_since_string(), '1 days since')
+
+    def test_get_timers_prefetched_matches_db(self):
+        group = PADSNewestTimerGroup(PADSPublicTimerHelper())
+        view_timers = group.get_timers(0, INDEX_PAGE_SIZE)
+        self.assertEqual(len(view_timers), INDEX_PAGE_SIZE)
+        for t in view_timers:
+            # Load the same Timer without any prefetched information
+            t_db = PADSViewTimer(t.timer_from_db.__class__.objects.get(
+                pk=t.id()))
+            self.assertEqual(t.reset_count(), t_db.reset_count())
+            self.assertEqual(t.reset_history(), t_db.reset_history())
+            self.assertEqual(t.reset_history_latest(),
+                             t_db.reset_history_latest())
+            self.assertEqual(t.get_associated_groups_from_db(),
+                             t_db.get_associated_groups_from_db())
+
+    def test_get_timers_special_groups_accessible(self):
+        public_timer_helper = PADSPublicTimerHelper()
+        groups = (PADSLongestRunningTimerGroup(public_timer_helper),
+                  PADSRecentlyResetTimerGroup(public_timer_helper),
+                  PADSNewestTimerGroup(public_timer_helper),)
+        for g in groups:
+            view_timers = g.get_timers(0, INDEX_PAGE_SIZE)
+            self.assertNotIn(None, view_timers)
+            for t in view_timers:
+                self.assertTrue(t.is_public())
+
+
+class PADSViewTimerQuickListCreatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        ql_password = user_helper.new_anon_user_in_db()
+        cls.ql_user_id = user_helper.split_anon_user_password(ql_password)[0]
+        cls.user_id = user_helper.put_user_in_db(
+            'test-dave-qlc', '    abcdABCD1234')
+        cls.ql_timer_id = PADSEditingTimerHelper(cls.ql_user_id).new_timer(
+            'Quick List Timer', public=True)
+        cls.timer_id = PADSEditingTimerHelper(cls.user_id).new_timer(
+            'Regular Timer', public=True)
+
+    def test_creator_without_user_record(self):
+        public_timer_helper = PADSPublicTimerHelper()
+        ql_timer = public_timer_helper.get_timer_for_view_by_id(
+            self.ql_timer_id)
+        timer = public_timer_helper.get_timer_for_view_by_id(self.timer_id)
+        # The creator's User record must not be loaded to tell the creator
+        #  apart from Quick List Users
+        with self.assertNumQueries(0):
+            self.assertTrue(ql_timer.is_in_quick_list())
+            self.assertEqual(ql_timer.creator_user_nickname_short(),
+                             ANONYMOUS_USER_SHORT_NICKNAME_PREFIX)
+            self.assertFalse(timer.is_in_quick_list())
+            self.assertEqual(timer.creator_user_nickname_short(),
+                             'test-dave-qlc')
+
+    def test_creator_from_user_record(self):
+        # Timers loaded without the creator's details fall back on the
+        #  creator's User record
+        ql_timer = PADSViewTimer(PADSTimer.objects.get(pk=self.ql_timer_id))
+        self.assertTrue(ql_timer.is_in_quick_list())
+        timer = PADSViewTimer(PADSTimer.objects.get(pk=self.timer_id))
+        self.assertFalse(timer.is_in_quick_list())
+
+
+#
+# Pagination Tests
+#
+class PADSTimerGroupPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Sign Up Test User
+        cls.user_id = user_helper.put_user_in_db(
+            'test-dave', '    abcdABCD1234')
+        editing_timer_helper = PADSEditingTimerHelper(cls.user_id)
+
+        # Create enough Public Timers for three pages
+        cls.timer_count = INDEX_PAGE_SIZE * 3
+        for i in range(0, cls.timer_count):
+            editing_timer_helper.new_timer(
+                'Public Timer {0}'.format(i), public=True)
+    
+    def render_group(self, group):
+        # Simulates the calls made by the index template
+        group.get_current_page()
+        group.get_current_page()
+        group.is_multi_page()
+        group.current_natural_page_number()
+        group.max_natural_page()
+        group.get_previous_page_url()
+        group.get_previous_page_label()
+        group.get_next_page_url()
+        group.get_next_page_label()
+
+    def test_count_once_per_group(self):
+        group = PADSNewestTimerGroup(PADSPublicTimerHelper())
+        # One COUNT and one page of two queries
+        with self.assertNumQueries(3):
+            group.set_natural_page_number(2)
+            self.render_group(group)
+        self.assertEqual(group.pagination.count_queries, 1)
+        self.assertEqual(group.pagination.page_loads, 1)
+        self.assertEqual(group.count(), self.timer_count)
+
+    def test_count_invalidated_by_filter(self):
+        group = PADSNewestTimerGroup(PADSPublicTimerHelper())
+        self.render_group(group)
+        group.set_description_filter('Timer 1')
+        self.render_group(group)
+        self.assertEqual(group.pagination.count_queries, 2)
+        self.assertEqual(group.pagination.page_loads, 2)
+        # Timer 1 and Timers 10 to 17
+        self.assertEqual(group.count(), 9)
+
+    def test_page_invalidated_by_page_number(self):
+        group = PADSNewestTimerGroup(PADSPublicTimerHelper())
+        self.render_group(group)
+        first_page = group.get_current_page()
+        group.set_natural_page_number(2)
+        self.render_group(group)
+        second_page = group.get_current_page()
+        self.assertEqual(group.pagination.page_loads, 2)
+        self.assertNotEqual([t.id() for t in first_page],
+                            [t.id() for t in second_page])
+
+#
+# Keyset Pagination Tests
+#
+class PADSSpecialViewTimerGroupKeysetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Sign Up Test User
+        cls.user_id = user_helper.put_user_in_db(
+            'test-dave', '    abcdABCD1234')
+        editing_timer_helper = PADSEditingTimerHelper(cls.user_id)
+
+        # Create enough Public Timers for three pages, plus a small last
+        # page to be merged into the third page
+        cls.timer_count = (INDEX_PAGE_SIZE * 3) + 1
+        now = timezone.now()
+        for i in range(0, cls.timer_count):
+            timer_id = editing_timer_helper.new_timer(
+                'Public Timer {0}'.format(i), public=True)
+            # Give many Timers the same count-from time, so that Timers
+            # have to be told apart by id across page boundaries
+            PADSTimer.objects.filter(pk=timer_id).update(
+                count_from_date_time=now - datetime.timedelta(hours=i % 4))
+    
+    def get_groups(self, keyset_pagination):
+        public_timer_helper = PADSPublicTimerHelper()
+        return (
+            PADSLongestRunningTimerGroup(public_timer_helper, 
+                                         keyset_pagination),
+            PADSRecentlyResetTimerGroup(public_timer_helper, 
+                                        keyset_pagination),
+            PADSNewestTimerGroup(public_timer_helper, keyset_pagination),)
+
+    def get_page_parameter(self, url):
+        return url.split('?p=')[1]
+
+    def get_timer_ids(self, group):
+        return [t.id() for t in group.get_current_page()]
+
+    def test_keyset_pages_match_offset_pages(self):
+        for i in range(0, 3):
+            offset_group = self.get_groups(False)[i]
+            keyset_group = self.get_groups(True)[i]
+            pages = offset_group.max_natural_page()
+            self.assertEqual(pages, 3)
+            # Walk forwards by following the next page links...
+            for n in range(1, pages + 1):
+                offset_group.set_natural_page_number(n)
+                self.assertEqual(keyset_group.current_natural_page_number(), n)
+                self.assertEqual(self.get_timer_ids(offset_group),
+                                 self.get_timer_ids(keyset_group))
+                p = self.get_page_parameter(keyset_group.get_next_page_url())
+                if n < pages:
+                    # Links to pages after the first page carry cursors
+                    self.assertFalse(p.isdigit())
+                    keyset_group = self.get_groups(True)[i]
+                    keyset_group.set_page_from_query(p)
+            # ...then walk backwards by following the previous page links
+            for n in range(pages, 0, -1):
+                offset_group.set_natural_page_number(n)
+                self.assertEqual(keyset_group.current_natural_page_number(), n)
+                self.assertEqual(self.get_timer_ids(offset_group),
+                                 self.get_timer_ids(keyset_group))
+                if n > 1:
+                    p = self.get_page_parameter(
+                        keyset_group.get_previous_page_url())
+                    keyset_group = self.get_groups(True)[i]
+                    keyset_group.set_page_from_query(p)
+
+    def test_keyset_page_without_offset(self):
+        keyset_group = self.get_groups(True)[2]
+        p = self.get_page_parameter(keyset_group.get_next_page_url())
+        keyset_group = self.get_groups(True)[2]
+        keyset_group.set_page_from_query(p)
+        with CaptureQueriesContext(connection) as queries:
+            keyset_group.get_current_page()
+        for q in queries.captured_queries:
+            self.assertNotIn('OFFSET', q['sql'])
+
+    def test_keyset_foreign_cursor_ignored(self):
+        newest_group = self.get_groups(True)[2]
+        p = self.get_page_parameter(newest_group.get_next_page_url())
+        # Cursors from another Group are ignored, the first page is shown
+        longest_running_group = self.get_groups(True)[0]
+        longest_running_group.set_page_from_query(p)
+        self.assertEqual(longest_running_group.current_natural_page_number(), 1)
+        self.assertIsNone(longest_running_group.cursor)
+
+    def test_keyset_disabled_page_numbers(self):
+        for g in self.get_groups(False):
+            p = self.get_page_parameter(g.get_next_page_url())
+            self.assertEqual(p, '2')
+            g.set_page_from_query(p)
+            self.assertEqual(g.current_natural_page_number(), 2)
+            g.set_page_from_query('bogus')
+            self.assertEqual(g.current_natural_page_number(), 2)
+
+#
+# Reset Count Tests
+#
+class PADSViewTimerResetCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Sign Up Test User
+        cls.user_id = user_helper.put_user_in_db(
+            'test-dave', '    abcdABCD1234')
+        cls.editing_timer_helper = PADSEditingTimerHelper(cls.user_id)
+        cls.timer_id = cls.editing_timer_helper.new_timer('Test Timer')
+    
+    def get_view_timer(self):
+        return self.editing_timer_helper.get_timer_for_view_by_id(
+            self.timer_id)
+
+    def assert_reset_count_matches_history(self, timer_from_db):
+        history = list(timer_from_db.padstimerreset_set.order_by(
+            '-date_time'))
+        self.assertEqual(timer_from_db.reset_count, len(history))
+        self.assertEqual(timer_from_db.reset_latest_date_time,
+                         history[0].date_time)
+        if len(history) > 1:
+            self.assertEqual(timer_from_db.reset_previous_date_time,
+                             history[1].date_time)
+        else:
+            self.assertIsNone(timer_from_db.reset_previous_date_time)
+
+    def test_reset_count_new_timer(self):
+        timer = self.get_view_timer()
+        self.assertEqual(timer.reset_count(), 1)
+        self.assert_reset_count_matches_history(timer.timer_from_db)
+
+    def test_reset_count_reset(self):
+        timer = self.get_view_timer()
+        timer.reset('Test Reset')
+        timer.reset('Test Reset Again')
+        # The View Timer must be kept up to date...
+        self.assertEqual(timer.reset_count(), 3)
+        self.assert_reset_count_matches_history(timer.timer_from_db)
+        # ...as well as the Timer in the database
+        self.assert_reset_count_matches_history(
+            self.get_view_timer().timer_from_db)
+
+    def test_reset_count_reset_stale(self):
+        # Timers loaded before another reset must not write back their 
+        # older reset count and times when reset
+        timer_a = self.get_view_timer()
+        timer_b = self.get_view_timer()
+        timer_a.reset('Test Reset')
+        timer_b.reset('Test Reset by Stale Timer')
+        timer_a.reset('Test Reset Again by Stale Timer')
+        timer_from_db = PADSTimer.objects.get(pk=self.timer_id)
+        self.assertEqual(timer_from_db.reset_count, 4)
+        self.assert_reset_count_matches_history(timer_from_db)
+
+    def test_running_time_suspended_without_queries(self):
+        self.get_view_timer().stop('Test Suspension')
+        timer = self.get_view_timer()
+        self.assertIsInstance(timer, PADSViewSuspendedTimer)
+        history = timer.reset_history()
+        expected_minutes = int((history[0].date_time - history[1].date_time
+            ).total_seconds() / 60)
+        with self.assertNumQueries(0):
+            self.assertEqual(timer.get_running_time_minutes(), 
+                             expected_minutes)
+            self.assertEqual(timer.reset_count(), 2)
+
+    def test_backfill_timer_resets(self):
+        timer = self.get_view_timer()
+        timer.reset('Test Reset')
+        timer.reset('Test Reset Again')
+        PADSTimer.objects.update(reset_count=0, reset_latest_date_time=None,
+                                 reset_previous_date_time=None)
+        call_command('backfill_timer_resets', stdout=StringIO())
+        self.assert_reset_count_matches_history(
+            PADSTimer.objects.get(pk=self.timer_id))
+
+#
+# Reset History Paging and Archive Tests
+#
+class PADSViewTimerResetHistoryArchiveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Sign Up Test User
+        cls.user_id = user_helper.put_user_in_db(
+            'test-dave', '    abcdABCD1234')
+        cls.editing_timer_helper = PADSEditingTimerHelper(cls.user_id)
+        cls.timer_id = cls.editing_timer_helper.new_timer('Test Timer')
+        # Five old resets over two years, then two recent resets
+        cls.old_date_time = timezone.now() - datetime.timedelta(days=800)
+        for i in range(0, 5):
+            cls.editing_timer_helper.new_timer_reset_history(
+                cls.timer_id, 'Old Reset {0}'.format(i), 
+                cls.old_date_time + datetime.timedelta(days=100 * i))
+        timer = cls.editing_timer_helper.get_timer_for_view_by_id(
+            cls.timer_id)
+        timer.reset('Test Reset')
+        timer.reset('Test Reset Again')
+
+    def get_view_timer(self):
+        return self.editing_timer_helper.get_timer_for_view_by_id(
+            self.timer_id)
+
+    def compact(self):
+        call_command('compact_timer_resets', stdout=StringIO())
+
+    def test_reset_history_page(self):
+        timer = self.get_view_timer()
+        history = timer.reset_history()
+        with mock.patch.dict(defaults.strings,
+                             {'view_reset_history_page_size': 3}):
+            self.assertEqual(timer.reset_history_page_count(), 3)
+            self.assertEqual(timer.reset_history_page(0), history[0:3])
+            self.assertEqual(timer.reset_history_page(2), history[6:8])
+            self.assertEqual(timer.reset_history_page(3), ())
+
+    def test_compact_timer_resets(self):
+        self.compact()
+        timer = self.get_view_timer()
+        # Entries of the latest two resets are never archived
+        self.assertEqual(len(timer.reset_history_archived()), 5)
+        self.assertEqual(len(timer.reset_history_page(0)), 3)
+        self.assertEqual(timer.reset_count(), 8)
+        summaries = timer.reset_history_summaries()
+        self.assertEqual(sum([s.reset_count for s in summaries]), 5)
+        self.assertEqual(summaries[-1].first_date_time, self.old_date_time)
+        # Archived entries are still exported
+        self.assertEqual(len(timer.reset_history()), 8)
+        self.assertEqual(len(timer.dict()['history_list']), 8)
+
+    def test_compact_timer_resets_again(self):
+        self.compact()
+        self.editing_timer_helper.new_timer_reset_history(
+            self.timer_id, 'Late Old Reset', 
+            self.old_date_time + datetime.timedelta(days=1))
+        PADSTimer.objects.filter(pk=self.timer_id).update(
+            reset_latest_date_time=timezone.now())
+        self.compact()
+        timer = self.get_view_timer()
+        self.assertEqual(len(timer.reset_history_archived()), 6)
+        summaries = timer.reset_history_summaries()
+        self.assertEqual(sum([s.reset_count for s in summaries]), 6)
+        self.assertEqual(PADSArchivedTimerReset.objects.count(), 6)
+
+    def test_compact_timer_resets_before_backfill(self):
+        # Timers made before the reset times were added have no reset
+        # times until backfill_timer_resets is run
+        timer_id = self.editing_timer_helper.new_timer(
+            'Test Timer Before Backfill')
+        for i in range(0, 3):
+            self.editing_timer_helper.new_timer_reset_history(
+                timer_id, 'Old Reset {0}'.format(i), 
+                self.old_date_time + datetime.timedelta(days=i))
+        PADSTimer.objects.update(reset_latest_date_time=None,
+                                 reset_previous_date_time=None)
+        self.compact()
+        # Entries of the latest two resets are never archived, the
+        # latest entry being the creation of the Timer
+        resets = PADSTimerReset.objects.filter(timer_id=timer_id)
+        self.assertEqual(
+            [r.reason for r in resets.order_by('date_time')],
+            ['Old Reset 2', labels['TIMER_DEFAULT_CREATION_REASON']])
+        self.assertEqual(PADSArchivedTimerReset.objects.filter(
+            timer_id=timer_id).count(), 2)
+
+    def test_backfill_timer_resets_after_compact(self):
+        self.compact()
+        PADSTimer.objects.update(reset_count=0)
+        call_command('backfill_timer_resets', stdout=StringIO())
+        self.assertEqual(self.get_view_timer().reset_count(), 8)
+
+#
+# Timer Group Assignment Tests
+#
+class PADSViewTimerSetGroupsByNameTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Sign Up Test Users
+        cls.user_id = user_helper.put_user_in_db(
+            'test-dave', '    abcdABCD1234')
+        cls.editing_timer_helper = PADSEditingTimerHelper(cls.user_id)
+        cls.timer_id = cls.editing_timer_helper.new_timer(
+            'Test Timer', public=True)
+        cls.group_a_id = cls.editing_timer_helper.new_timer_group('alpha')
+        cls.group_b_id = cls.editing_timer_helper.new_timer_group('bravo')
+        cls.editing_timer_helper.new_group_inclusion_by_id(
+            cls.timer_id, cls.group_a_id)
+        cls.editing_timer_helper.new_group_inclusion_by_id(
+            cls.timer_id, cls.group_b_id)
+        # Another User's Group, which includes the public Test Timer
+        user_x_id = user_helper.put_user_in_db(
+            'test-xavier', '    abcdABCD1234')
+        cls.group_x_id = PADSEditingTimerHelper(user_x_id).new_timer_group(
+            'alpha')
+        cls.editing_timer_helper.new_group_inclusion_by_id(
+            cls.timer_id, cls.group_x_id)
+
+    def get_view_timer(self):
+        return self.editing_timer_helper.get_timer_for_view_by_id(
+            self.timer_id)
+
+    def get_group_ids(self):
+        return set(GroupInclusion.objects.filter(
+            timer_id=self.timer_id).values_list('group_id', flat=True))
+
+    def test_set_groups_by_name(self):
+        timer = self.get_view_timer()
+        # Assertions
+        self.assertTrue(timer.set_groups_by_name('Bravo  charlie delta '))
+        groups = PADSTimerGroup.objects.filter(
+            creator_user_id=self.user_id)
+        group_ids = dict(groups.values_list('name', 'id'))
+        self.assertEqual(set(group_ids.keys()), 
+                         {'alpha', 'bravo', 'charlie', 'delta'})
+        self.assertEqual(self.get_group_ids(), {
+            self.group_b_id, group_ids['charlie'], group_ids['delta'],
+            self.group_x_id})
+        self.assertEqual(timer.get_associated_group_names_as_str().split(),
+            self.get_view_timer().get_associated_group_names_as_str().split())
+
+    def test_set_groups_by_name_queries(self):
+        timer = self.get_view_timer()
+        names = ' '.join(['group-{0}'.format(i) for i in range(0, 20)])
+        # Savepoint, named Groups, new Groups (two queries), inclusions,
+        #  new inclusions, removed inclusions, savepoint release
+        with self.assertNumQueries(8):
+            timer.set_groups_by_name(names)
+        self.assertEqual(len(self.get_group_ids()), 21)
+        # Nothing is written if the Groups are unchanged
+        with self.assertNumQueries(4):
+            timer.set_groups_by_name(names)
+
+    def test_groups_partition(self):
+        group_c_id = self.editing_timer_helper.new_timer_group('charlie')
+        timer = self.get_view_timer()
+        # Assertions
+        with self.assertNumQueries(1):
+            associated_groups = timer.get_associated_groups_from_db()
+            available_groups = timer.get_available_groups_from_db()
+            timer.get_associated_group_names_as_str()
+            timer.get_associated_groups_for_choicefield()
+            timer.get_available_groups_for_choicefield()
+        self.assertEqual([g.id for g in associated_groups], 
+                         [self.group_a_id, self.group_x_id, self.group_b_id])
+        self.assertEqual([g.id for g in available_groups], [group_c_id])
+        # The Groups are loaded again after they are changed
+        timer.add_to_group(group_c_id)
+        self.assertEqual(timer.get_available_groups_from_db(), [])
+
+    def test_set_groups_by_name_empty(self):
+        self.get_view_timer().set_groups_by_name('  ')
+        # Assertions
+        self.assertEqual(self.get_group_ids(), {self.group_x_id})
+
+#
+# Export Tests
+#
+class PADSTimerHelperExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Sign Up Test User
+        cls.user_id = user_helper.put_user_in_db(
+            'test-dave', '    abcdABCD1234')
+        cls.editing_timer_helper = PADSEditingTimerHelper(cls.user_id)
+        cls.timer_ids = []
+        for i in range(0, 5):
+            cls.timer_ids.append(cls.editing_timer_helper.new_timer(
+                'Test Timer {0}'.format(i)))
+
+    def test_get_timers_for_export_chunked(self):
+        # Timers, Timer Groups, Reset History and archived Reset History
+        #  for each chunk
+        with self.assertNumQueries(12):
+            chunks = list(
+                self.editing_timer_helper.get_timers_for_export_chunked(2))
+        self.assertEqual([len(c) for c in chunks], [2, 2, 1])
+        view_timers = [t for c in chunks for t in c]
+        self.assertEqual([t.id() for t in view_timers], self.timer_ids)
+        with self.assertNumQueries(0):
+            for t in view_timers:
+                t.dict()
+
+
+#
+# Fragment Cache Tests
+#
+class PADSSpecialViewTimerGroupFragmentCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Sign Up Test User
+        cls.user_id = user_helper.put_user_in_db(
+            'test-dave', '    abcdABCD1234')
+        cls.editing_timer_helper = PADSEditingTimerHelper(cls.user_id)
+        cls.timer_public_id = cls.editing_timer_helper.new_timer(
+            'Public Timer', public=True)
+        cls.timer_private_id = cls.editing_timer_helper.new_timer(
+            'Private Timer')
+
+    def get_fragment_cache_key(self):
+        group = PADSNewestTimerGroup(PADSPublicTimerHelper())
+        return group.get_fragment_cache_key()
+
+    def test_get_fragment_cache_key(self):
+        public_timer_helper = PADSPublicTimerHelper()
+        groups = (PADSLongestRunningTimerGroup(public_timer_helper),
+                  PADSRecentlyResetTimerGroup(public_timer_helper),
+                  PADSNewestTimerGroup(public_timer_helper),)
+        keys = [g.get_fragment_cache_key() for g in groups]
+        self.assertNotIn(None, keys)
+        self.assertEqual(len(set(keys)), len(groups))
+        # Every page has its own key
+        groups[0].set_natural_page_number(2)
+        self.assertNotIn(groups[0].get_fragment_cache_key(), keys)
+
+    def test_get_fragment_cache_key_not_cacheable(self):
+        group_filtered = PADSNewestTimerGroup(PADSPublicTimerHelper())
+        group_filtered.set_description_filter('Public')
+        group_user = PADSNewestTimerGroup(
+            PADSPublicTimerHelper(self.user_id))
+        group_private = PADSNewestTimerGroup(
+            PADSEditingTimerHelper(self.user_id))
+        for g in (group_filtered, group_user, group_private):
+            self.assertIsNone(g.get_fragment_cache_key())
+
+    def test_get_fragment_cache_key_public_timer_changes(self):
+        changes = (
+            lambda h: h.set_timer_description(self.timer_public_id, 'Renamed'),
+            lambda h: h.set_timer_running_flag(self.timer_public_id, False),
+            lambda h: h.set_timer_public_flag(self.timer_private_id, True),
+            lambda h: h.set_timer_public_flag(self.timer_private_id, False),
+            lambda h: h.new_timer('New Public Timer', public=True),
+            lambda h: h.delete_timer_by_id(self.timer_public_id),
+            )
+        for change in changes:
+            key_before = self.get_fragment_cache_key()
+            change(self.editing_timer_helper)
+            self.assertNotEqual(self.get_fragment_cache_key(), key_before)
+
+    def test_get_fragment_cache_key_public_timer_reset(self):
+        view_timer = self.editing_timer_helper.get_timer_for_view_by_id(
+            self.timer_public_id)
+        key_before = self.get_fragment_cache_key()
+        view_timer.reset('Test Reset')
+        self.assertNotEqual(self.get_fragment_cache_key(), key_before)
+
+    def test_get_fragment_cache_key_user_deleted(self):
+        # Public Timers are deleted along with their creator's account
+        user_x_id = user_helper.put_user_in_db(
+            'test-xavier', '    abcdABCD1234')
+        PADSEditingTimerHelper(user_x_id).new_timer(
+            'Public Timer by Deleted User', public=True)
+        key_before = self.get_fragment_cache_key()
+        user_helper.delete_user(user_x_id)
+        self.assertNotEqual(self.get_fragment_cache_key(), key_before)
+
+    def test_get_fragment_cache_key_private_timer_changes(self):
+        # Changes to private Timers are never shown on the public indexes
+        view_timer = self.editing_timer_helper.get_timer_for_view_by_id(
+            self.timer_private_id)
+        key_before = self.get_fragment_cache_key()
+        view_timer.reset('Test Reset')
+        view_timer.stop('Test Stop')
+        self.editing_timer_helper.set_timer_public_flag(
+            self.timer_private_id, False)
+        self.editing_timer_helper.new_timer('New Private Timer')
+        self.editing_timer_helper.delete_timer_by_id(self.timer_private_id)
+        self.assertEqual(self.get_fragment_cache_key(), key_before)
@@ -0,0 +1,64 @@
+#
+#
+# Public Archive of Days Since Timers
+# Time Zone Registry Unit Tests
+#
+#
+
+from django.test import SimpleTestCase
+from padsweb.forms import TimeZoneForm
+from padsweb.timezones import TIME_ZONE_NAMES, TIME_ZONE_REGIONS
+from padsweb.timezones import get_time_zone_choices, get_time_zone_region
+from padsweb.timezones import is_time_zone_name
+
+class PADSTimeZoneRegistryTests(SimpleTestCase):
+    def test_is_time_zone_name(self):
+        self.assertTrue(is_time_zone_name('Australia/Perth'))
+        self.assertTrue(is_time_zone_name('UTC'))
+        self.assertFalse(is_time_zone_name('Australia/Atlantis'))
+        self.assertFalse(is_time_zone_name(''))
+
+    def test_get_time_zone_region(self):
+        self.assertEqual(get_time_zone_region('Australia/Perth'), 'Australia')
+        self.assertEqual(
+            get_time_zone_region('America/Argentina/Salta'), 'America')
+        self.assertEqual(get_time_zone_region('UTC'), 'Other')
+
+    def test_get_time_zone_choices(self):
+        choices = get_time_zone_choices()
+        # Assertions
+        self.assertEqual([c[0] for c in choices], list(TIME_ZONE_NAMES))
+        self.assertIs(get_time_zone_choices(), choices)
+
+    def test_get_time_zone_choices_region(self):
+        choices = get_time_zone_choices('Australia')
+        # Assertions
+        self.assertIn(('Australia/Perth', 'Perth'), choices)
+        for name, label in choices:
+            self.assertEqual(get_time_zone_region(name), 'Australia')
+        self.assertIn(('UTC', 'UTC'), get_time_zone_choices('Other'))
+
+    def test_get_time_zone_choices_grouped(self):
+        choices = get_time_zone_choices(grouped=True)
+        # Assertions
+        self.assertEqual([g[0] for g in choices], list(TIME_ZONE_REGIONS))
+        self.assertEqual(sum([len(g[1]) for g in choices]),
+                         len(TIME_ZONE_NAMES))
+
+
+class TimeZoneFormTests(SimpleTestCase):
+    def test_time_zone_form_region(self):
+        form = TimeZoneForm(region='Australia')
+        # Assertions
+        self.assertEqual(list(form.fields['time_zone'].choices),
+                         list(get_time_zone_choices('Australia')))
+
+    def test_time_zone_form_valid_other_region(self):
+        # Time zones outside of the region shown must still be accepted
+        form = TimeZoneForm({'time_zone' : 'Europe/Lisbon'},
+                            region='Australia')
+        self.assertTrue(form.is_valid())
+
+    def test_time_zone_form_invalid(self):
+        form = TimeZoneForm({'time_zone' : 'Australia/Atlantis'})
+        self.assertFalse(form.is_valid())
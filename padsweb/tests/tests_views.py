@@ -6,16 +6,23 @@
 #
 
 # Imports
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
 from django.test import Client
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from django.urls import reverse
+from padsweb import views
+from padsweb.ratelimit import sign_in_rate_limiter
 from padsweb.settings import *
 from padsweb.strings import labels, messages
 from padsweb.user import PADSUserHelper
 from padsweb.timers import PADSEditingTimerHelper, PADSTimerHelper
 from padsweb.views import PADSTimerEditView, PADSView
+from unittest import mock
 import datetime
+import json
 
 #
 # Shared Test Data
@@ -286,6 +293,16 @@ class TestUser:
         self.last_response = response
         return response
     
+    def timer_bulk(self, timer_ids, operation, **kwargs):
+        # Performs an operation on many Timers at once
+
+        url_timer_bulk = reverse('padsweb:timer_bulk')
+        req_body_bulk = { 'timer_id' : timer_ids, 'operation' : operation }
+        req_body_bulk.update(kwargs)
+        response = self.client.post(url_timer_bulk, req_body_bulk)
+        self.last_response = response
+        return response
+
     def timer_share(self, timer_id):
         # Makes a Timer visible to other Users and the general public
 
@@ -520,6 +537,65 @@ class PublicMiscGETNavigationTests(TestCase):
             self.assertNotEqual(r.status_code, 404)            
             self.assertNotEqual(r.status_code, 500)
     
+class PublicIndexFragmentCacheTests(TestCase):
+    # Public Index Fragment Cache Tests verify that the Timers on the 
+    # Public Index are served from the cache, and that changes to public
+    # Timers appear on the Index immediately.
+
+    @classmethod
+    def setUpTestData(cls):
+        # Test User Setup
+        cls.user_c = TestUser('test_jess_raet', 'secure0000!@#$')
+        cls.user_c.sign_up()
+        editing_timer_helper = PADSEditingTimerHelper(
+            cls.user_c.get_id_via_helper())
+        cls.timer_ids = []
+        for i in range(0, 3):
+            cls.timer_ids.append(editing_timer_helper.new_timer(
+                'Cache Test Timer {0}'.format(i), public=True))
+
+    def setUp(self):
+        # Fragments cached during other tests may refer to Timers that
+        #  no longer exist
+        cache.clear()
+
+    def get_index(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('padsweb:index'))
+        return (response, len(queries))
+
+    def test_index_cached(self):
+        # Actions
+        response_first, queries_first = self.get_index()
+        response_cached, queries_cached = self.get_index()
+        
+        # Assertions
+        self.assertContains(response_cached, 'Cache Test Timer 0')
+        self.assertEqual(response_cached.content, response_first.content)
+        self.assertLess(queries_cached, queries_first)
+
+    def test_index_timer_renamed(self):
+        # Actions
+        self.get_index()
+        self.user_c.sign_in()
+        self.user_c.timer_rename(self.timer_ids[0], 'Renamed Cache Test')
+        self.user_c.sign_out()
+        response = self.get_index()[0]
+        
+        # Assertions
+        self.assertContains(response, 'Renamed Cache Test')
+
+    def test_index_timer_unshared(self):
+        # Actions
+        self.get_index()
+        self.user_c.sign_in()
+        self.user_c.timer_unshare(self.timer_ids[1])
+        self.user_c.sign_out()
+        response = self.get_index()[0]
+        
+        # Assertions
+        self.assertNotContains(response, 'Cache Test Timer 1')
+
 class QuickListTests(TestCase):
     # Quick List Tests verify the correctness of Quick List-related
     # operations that are not covered by the Account and Timer tests.
@@ -709,6 +785,20 @@ class QuickListTests(TestCase):
         self.assertNotEquals(user_ql_id, INVALID_SESSION_ID)
         self.assertEquals(user_ql_id, self.user_ql.get_id_via_helper())
     
+    def test_sign_in_quick_list_regular_user(self):
+        # A regular User must not be able to sign in with a Quick List
+        # password made up of their id and password
+
+        # Actions
+        user_ql_fake = TestQuickListUser()
+        user_ql_fake.password = '{0}-{1}'.format(
+            self.user_reg.get_id_via_helper(), self.user_reg.password)
+        resp_sign_in_ql = user_ql_fake.sign_in()
+        session_id = get_session_value(resp_sign_in_ql, 'user_id')
+        
+        # Assertions
+        self.assertNotEquals(session_id, self.user_reg.get_id_via_helper())
+    
     def test_sign_out_quick_list(self):
         # A user who has opened a Quick List should succeed in closing it
         # cleanly
@@ -742,6 +832,46 @@ class RegularAccountSettingsTests(TestCase):
         cls.user_s = TestUser('test_jess_rast', cls.password_old)
         cls.user_s.sign_up()
 
+    def test_settings_time_zone_regions(self):
+        # Only time zones from the region of the User's time zone should
+        # be shown, unless another region is chosen
+        user_tz_test = TestUser('test_jess_rastz', self.password_old)
+        user_tz_test.sign_up()
+        user_tz_test.sign_in()
+        user_tz = timezone.get_current_timezone_name()
+        url_settings = reverse('padsweb:settings_info')
+        
+        # Actions
+        resp_region = user_tz_test.client.get(url_settings)
+        resp_europe = user_tz_test.client.get(url_settings, {'tzr':'Europe'})
+        resp_all = user_tz_test.client.get(url_settings, {'tzr':'all'})
+
+        # Assertions
+        self.assertContains(resp_region, 'value="{0}"'.format(user_tz))
+        self.assertContains(resp_europe, 'value="Europe/Lisbon"')
+        self.assertNotContains(resp_europe, 'value="Asia/Tokyo"')
+        self.assertContains(resp_all, 'value="Europe/Lisbon"')
+        self.assertContains(resp_all, '<optgroup label="Europe">')
+
+    def test_settings_time_zone_other_region_kept(self):
+        # The User's time zone should remain selected when time zones from
+        # another region are shown
+        user_tz_test = TestUser('test_jess_rasttk', self.password_old)
+        user_tz_test.sign_up()
+        user_tz_test.sign_in()
+        user_tz_test.client.post(reverse('padsweb:settings_set_tz'),
+                                 {'time_zone' : 'Asia/Tokyo'})
+        
+        # Actions
+        resp_europe = user_tz_test.client.get(
+            reverse('padsweb:settings_info'), {'tzr':'Europe'})
+        
+        # Assertions
+        self.assertContains(resp_europe,
+                            '<option value="Asia/Tokyo" selected>')
+        self.assertContains(resp_europe, 'value="Europe/Lisbon"')
+        self.assertNotContains(resp_europe, 'value="Asia/Kolkata"')
+    
     def test_change_password_valid(self):
         # A User should be able to change sign in passwords
 
@@ -779,6 +909,55 @@ class RegularAccountSettingsTests(TestCase):
         self.assertEqual(user_id_new_pass, self.user_s.get_id_via_helper())
 
 
+class RegularAccountExportTests(TestCase):
+    # Regular Account Export Tests verify that Users are able to export
+    # their settings and Timers.
+
+    @classmethod
+    def setUpTestData(cls):
+        # Test User Setup
+        cls.user_e = TestUser('test_jess_raet', 'secure0000!@#$')
+        cls.user_e.sign_up()
+        editing_timer_helper = PADSEditingTimerHelper(
+            cls.user_e.get_id_via_helper())
+        cls.group_id = editing_timer_helper.new_timer_group('test-group')
+        cls.timer_descs = []
+        for i in range(0, 5):
+            desc = 'Export Test Timer {0}'.format(i)
+            timer_id = editing_timer_helper.new_timer(desc)
+            editing_timer_helper.new_timer_reset_history(
+                timer_id, 'Export Test Reset {0}'.format(i))
+            if (i % 2) == 0:
+                editing_timer_helper.new_group_inclusion_by_id(
+                    timer_id, cls.group_id)
+            cls.timer_descs.append(desc)
+
+    def test_export_all_valid(self):
+        self.user_e.sign_in()
+        response = self.user_e.client.get(reverse('padsweb:user_export_all'))
+        export = json.loads(b''.join(response.streaming_content))
+        self.user_e.sign_out()
+        
+        # Assertions
+        self.assertEqual(response['content-type'], 'application/json')
+        self.assertEqual(export['groups'], ['test-group'])
+        self.assertEqual([t['description'] for t in export['timers']],
+                         self.timer_descs)
+        for i, t in enumerate(export['timers']):
+            # Every Timer has its own history, latest entry first
+            self.assertEqual(len(t['history_list']), 2)
+            self.assertEqual(t['history_list'][0]['reason'],
+                             'Export Test Reset {0}'.format(i))
+            if (i % 2) == 0:
+                self.assertEqual(t['associated_groups'], ['test-group'])
+            else:
+                self.assertEqual(t['associated_groups'], [])
+
+    def test_export_all_signed_out(self):
+        response = self.user_e.client.get(reverse('padsweb:user_export_all'))
+        self.assertRedirects(response, reverse('padsweb:sign_up_intro'))
+
+
 class RegularAccountSignUpTests(TestCase):
     # Regular Account Signup Tests verify that account creation (and
     # incidentially, sign-in) functions are working correctly, and that
@@ -1529,6 +1708,116 @@ class RegularAccountSignInTests(TestCase):
         self.assertEqual(user_si_uppercase.get_id_via_helper(), self.user_si.get_id_via_helper() )
 
 
+class SessionUserTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_su = TestUser('test_jess_su', '5678%^&*secure')
+        cls.user_su.sign_up()
+        timer_helper = PADSEditingTimerHelper(cls.user_su.get_id_via_helper())
+        timer_helper.new_timer('Session User Test Timer', public=True)
+
+    def get_user_query_count(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.user_su.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len([q for q in context.captured_queries 
+                    if 'FROM "padsweb_padsuser"' in q['sql']])
+
+    def test_session_user_loaded_once(self):
+        self.user_su.sign_in()
+        # The signed-in User must be loaded only once per request
+        for url in (reverse('padsweb:index'), 
+                    reverse('padsweb:index_personal'),
+                    reverse('padsweb:settings_info'),):
+            self.assertEqual(self.get_user_query_count(url), 1, url)
+
+    def test_session_user_signed_out(self):
+        self.assertEqual(
+            self.get_user_query_count(reverse('padsweb:index')), 0)
+
+
+@mock.patch.dict(defaults.strings, {'sign_in_rate_limit_account_burst' : 3,
+                                    'sign_in_rate_limit_ip_burst' : 5})
+class SignInRateLimitTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user_rl = TestUser('test_jess_rl', '5678%^&*secure')
+        cls.user_rl.sign_up()
+
+    def setUp(self):
+        sign_in_rate_limiter.clear()
+        self.addCleanup(sign_in_rate_limiter.clear)
+        # Count password checks without changing their outcome
+        password_hasher = views.user_helper.password_hasher
+        patcher = mock.patch.object(password_hasher, 'verify', 
+                                    wraps=password_hasher.verify)
+        self.verify = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_sign_in_wrong_password_limited(self):
+        user_rl_wrong = TestUser(self.user_rl.username, 'wrong%^&*secure')
+        for i in range(0, 3):
+            user_rl_wrong.sign_in()
+        # Actions
+        resp_sign_in = user_rl_wrong.sign_in()
+        resp_sign_in_valid = self.user_rl.sign_in()
+        # Assertions
+        #  The password must not be checked once the limit is reached,
+        #   not even the correct one
+        self.assertEqual(self.verify.call_count, 3)
+        self.assertEqual(get_session_value(resp_sign_in, 'banner_text'),
+                         messages['USER_SIGN_IN_RATE_LIMITED'])
+        self.assertEqual(get_session_value(resp_sign_in_valid, 'user_id'),
+                         INVALID_SESSION_ID)
+
+    def test_sign_in_valid_not_limited(self):
+        # Successful sign-ins must not count against the limit
+        for i in range(0, 6):
+            resp_sign_in = self.user_rl.sign_in()
+            self.assertEqual(get_session_value(resp_sign_in, 'user_id'),
+                             self.user_rl.get_id_via_helper())
+        self.assertEqual(self.verify.call_count, 6)
+
+    def test_sign_in_quick_list_guesses_limited(self):
+        # Guessing Quick List ids from the same address must trip the
+        # limit of the address, even as every id is different
+        user_ql = TestQuickListUser()
+        for i in range(0, 7):
+            user_ql.password = '{0}-AAAA-BBBB'.format(1000 + i)
+            resp_sign_in = user_ql.sign_in()
+        # Assertions
+        self.assertEqual(get_session_value(resp_sign_in, 'banner_text'),
+                         messages['USER_SIGN_IN_RATE_LIMITED'])
+
+    def test_sign_in_quick_list_limited(self):
+        user_ql = TestQuickListUser()
+        user_ql.sign_up()
+        password_valid = user_ql.password
+        user_ql.password = password_valid + 'X'
+        for i in range(0, 3):
+            user_ql.sign_in()
+        # Actions
+        user_ql.password = password_valid
+        resp_sign_in = user_ql.sign_in()
+        # Assertions
+        self.assertEqual(self.verify.call_count, 3)
+        self.assertEqual(get_session_value(resp_sign_in, 'banner_text'),
+                         messages['USER_SIGN_IN_RATE_LIMITED'])
+
+    def test_sign_in_limited_cache_backend(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        user_rl_wrong = TestUser(self.user_rl.username, 'wrong%^&*secure')
+        with mock.patch.dict(defaults.strings,
+                             {'sign_in_rate_limit_backend' : 'cache'}):
+            for i in range(0, 4):
+                resp_sign_in = user_rl_wrong.sign_in()
+        # Assertions
+        self.assertEqual(self.verify.call_count, 3)
+        self.assertEqual(get_session_value(resp_sign_in, 'banner_text'),
+                         messages['USER_SIGN_IN_RATE_LIMITED'])
+
+
 # For all the other Timer View tests, see TimerTests
 class TimerGroupTests(TestCase):
     @classmethod
@@ -2444,6 +2733,71 @@ class TimerTests(TestCase):
         #  Verify that a reset history entry has not been created
         self.assertNotIn(view_timer_after.reset_history_latest().reason, timer_reset_reason)
     
+    def test_bulk_reset_timers(self):
+        """A user who is signed in should succeed in resetting many of
+        own timers at once, but not the timers of other users.
+        """
+        # Actions
+        timer_ids = [self.timer_lpv_1_id, self.timer_rpub_4_id]
+        timer_reset_reason = 'Test User 2 Attempting to Reset Many Timers'
+        resp_u2 = self.user_test_t_2.timer_bulk(
+            timer_ids, 'reset', reason=timer_reset_reason)
+        timer_reset_reason = 'Test User 1 Resetting Many Timers'
+        resp_u1 = self.user_test_t_1.timer_bulk(
+            timer_ids, 'reset', reason=timer_reset_reason)
+        resp_timer_detail = self.user_test_t_1.timer_detail(
+            self.timer_rpub_4_id)
+        view_timer = resp_timer_detail.context.get('timer')
+        
+        # Assertions
+        self.assertEqual(get_session_value(resp_u2, 'banner_text'),
+            messages['TIMER_SETTINGS_BULK_DONE'].format(0))
+        self.assertEqual(get_session_value(resp_u1, 'banner_text'),
+            messages['TIMER_SETTINGS_BULK_DONE'].format(2))
+        self.assertIn(timer_reset_reason, 
+            view_timer.reset_history_latest().reason)
+    
+    def test_bulk_invalid_operation(self):
+        """Operations on many timers at once with unknown operations
+        or no timers should be refused.
+        """
+        # Actions
+        resp_op = self.user_test_t_1.timer_bulk(
+            [self.timer_lpv_1_id], 'explode')
+        resp_no_timers = self.user_test_t_1.timer_bulk([], 'share')
+        
+        # Assertions
+        for r in (resp_op, resp_no_timers):
+            self.assertEqual(get_session_value(r, 'banner_text'),
+                messages['TIMER_SETTINGS_INVALID_REQUEST'])
+    
+    def test_bulk_too_many_timers(self):
+        """Operations on more timers at once than allowed should be
+        refused without changing any of the timers.
+        """
+        # Actions
+        timer_ids = [self.timer_lpv_1_id, self.timer_rpub_4_id]
+        with mock.patch.dict(defaults.strings, {'timer_bulk_max' : 1}):
+            resp_max = self.user_test_t_1.timer_bulk(
+                timer_ids, 'reset', reason='Too Many Timers Reset')
+        #  Nearly as many ids as SQLite allows as variables in a single
+        #  query, but fewer than Django's limit on fields in a request
+        resp_huge = self.user_test_t_1.timer_bulk(
+            list(range(1, 991)), 'share')
+        resp_timer_detail = self.user_test_t_1.timer_detail(
+            self.timer_rpub_4_id)
+        view_timer = resp_timer_detail.context.get('timer')
+        
+        # Assertions
+        self.assertEqual(get_session_value(resp_max, 'banner_text'),
+            messages['TIMER_SETTINGS_BULK_TOO_MANY'].format(1))
+        self.assertEqual(resp_huge.status_code, 302)
+        self.assertEqual(get_session_value(resp_huge, 'banner_text'),
+            messages['TIMER_SETTINGS_BULK_TOO_MANY'].format(
+                defaults['timer_bulk_max']))
+        self.assertNotIn('Too Many Timers Reset', 
+            view_timer.reset_history_latest().reason)
+    
     def test_share_private_timer(self):
         """A user who is signed in should succeed in making a private
         timer viewable to the public.
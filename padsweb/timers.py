@@ -9,9 +9,14 @@
 # Imports
 #
 from django.db import IntegrityError, transaction
+from django.db.models import Exists, F, OuterRef, Prefetch, Q
 from django.urls import reverse
 from django.utils import timezone
+from padsweb.caching import get_public_timers_fragment_key
+from padsweb.caching import invalidate_public_timers
+from padsweb.durations import get_minutes_between, split_minutes
 from padsweb.models import GroupInclusion
+from padsweb.models import PADSArchivedTimerReset
 from padsweb.models import PADSTimer
 from padsweb.models import PADSTimerGroup
 from padsweb.models import PADSTimerReset 
@@ -21,6 +26,7 @@ from padsweb.strings import labels
 
 # Standard Library Imports
 import datetime
+import re # for keyset pagination cursors
 import secrets # for token_urlsafe()
 
 #
@@ -33,6 +39,7 @@ pads_timer_default_models = {
     "group_model" : PADSTimerGroup,
     "group_inclusion_model" : GroupInclusion,
     "reset_history_model" : PADSTimerReset,
+    "reset_archive_model" : PADSArchivedTimerReset,
     }
 
 #
@@ -95,8 +102,10 @@ class PADSTimerHelper:
         """Returns a PADSViewTimer of a single Timer by its id.
         Only Timers accessible by this Helper may be returned.
         """
-        if self.get_timers_from_db().filter(pk=timer_id).exists():
-            timer_from_db = self.get_timers_from_db().get(pk=timer_id)
+        timer_from_db = get_one_or_none(
+            self.prepare_timers_for_view(self.get_timers_from_db()), 
+            pk=timer_id)
+        if timer_from_db is not None:
             return self.prepare_view_timer(timer_from_db)
         else:
             return None
@@ -105,9 +114,10 @@ class PADSTimerHelper:
         """Returns a PADSViewTimer of a single Timer by its id.
         Only Timers accessible by this Helper may be returned.
         """
-        if self.get_timers_from_db().filter(permalink_code=link_code).exists():
-            timer_from_db = self.get_timers_from_db().get(
-                    permalink_code=link_code)
+        timer_from_db = get_one_or_none(
+            self.prepare_timers_for_view(self.get_timers_from_db()), 
+            permalink_code=link_code)
+        if timer_from_db is not None:
             return self.prepare_view_timer(timer_from_db)
         else:
             return None
@@ -117,17 +127,17 @@ class PADSTimerHelper:
     # Timer Group Methods
     #
     def get_timer_group_for_view_by_id(self, timer_group_id):
-        if self.get_timer_groups_from_db().filter(pk=timer_group_id).exists():
-            group_from_db = self.get_timer_groups_from_db().get(
-                pk=timer_group_id)
+        group_from_db = get_one_or_none(self.get_timer_groups_from_db(), 
+                                        pk=timer_group_id)
+        if group_from_db is not None:
             return PADSViewTimerGroup(group_from_db, self)
         else:
             return None
     
     def get_timer_group_for_view_by_name(self, group_name):
-        if self.get_timer_groups_from_db().filter(name=group_name).exists():
-            group_from_db = self.get_timer_groups_from_db().get(
-                    name=group_name)
+        group_from_db = get_one_or_none(self.get_timer_groups_from_db(), 
+                                        name=group_name)
+        if group_from_db is not None:
             return PADSViewTimerGroup(group_from_db, self)
         else:
             return None
@@ -151,6 +161,28 @@ class PADSTimerHelper:
             name__icontains=search_term)
         return self.prepare_view_timer_group_list(timer_groups_from_db)
 
+    def get_timer_groups_partition_from_db(self, timer_id):
+        """Returns a tuple of two lists of Timer Groups, both sorted by
+        name, with a single query: the Groups which include a Timer, and
+        the Groups accessible by this Helper which do not.
+        """
+        includes_timer = Exists(self.group_inclusion_model.objects.filter(
+            group_id=OuterRef('pk'), timer_id=timer_id))
+        groups = self.group_model.objects.annotate(
+            includes_timer=includes_timer)
+        if self.user_id != INVALID_SESSION_ID:
+            # Groups of other Users may include public Timers
+            groups = groups.filter(
+                Q(creator_user_id=self.user_id) | Q(includes_timer=True))
+        associated_groups = []
+        available_groups = []
+        for g in groups.order_by('name', 'id'):
+            if g.includes_timer:
+                associated_groups.append(g)
+            else:
+                available_groups.append(g)
+        return (associated_groups, available_groups)
+
     def get_timer_groups_for_view_by_name_prefix(self, search_term):
         timer_groups_from_db = self.get_timer_groups_from_db().filter(
             name__istartswith=search_term)
@@ -159,12 +191,102 @@ class PADSTimerHelper:
     #
     # View Object Preparation Methods
     #
+    def prepare_timers_for_view(self, timers_from_db):
+        """Prepares a QuerySet of Timers for loading as PADSViewTimers.
+        Only the Short Nickname and the account kind of the creator User
+        of each Timer are loaded along with the Timer, instead of the whole
+        User record.
+        """
+        return timers_from_db.annotate(
+            creator_is_quick_list=F('creator_user__is_quick_list'),
+            creator_nickname_short=F('creator_user__nickname_short'))
+
+    def prepare_timers_for_view_page(self, timers_from_db):
+        """Prepares a QuerySet of Timers for loading as a page of
+        PADSViewTimers. The creator User details needed on a page are 
+        loaded along with each Timer, while the Timer Group memberships of 
+        every Timer on the page are loaded with a single query. The Reset 
+        History is not needed on a page, as Timers carry their own reset 
+        count and times of the latest resets.
+        
+        The number of queries needed to load a page is thus fixed, 
+        regardless of the number of Timers on the page.
+        """
+        groups_ordered = self.group_model.objects.order_by('name')
+        return self.prepare_timers_for_view(timers_from_db).prefetch_related(
+            Prefetch('in_groups', queryset=groups_ordered,
+                     to_attr='groups_prefetched'))
+
+    def prepare_timers_for_export(self, timers_from_db):
+        """Prepares a QuerySet of Timers for loading as PADSViewTimers
+        for exporting. This is like prepare_timers_for_view_page(), except
+        that the Reset History of every Timer, and the archived entries, 
+        are also loaded with a single query each.
+        """
+        resets_ordered = self.reset_history_model.objects.order_by(
+            '-date_time')
+        archived_resets_ordered = self.reset_archive_model.objects.order_by(
+            '-date_time')
+        return self.prepare_timers_for_view_page(
+            timers_from_db).prefetch_related(
+                Prefetch('padstimerreset_set', queryset=resets_ordered, 
+                         to_attr='reset_history_prefetched'),
+                Prefetch('padsarchivedtimerreset_set', 
+                         queryset=archived_resets_ordered, 
+                         to_attr='reset_archive_prefetched'))
+
+    def get_timers_for_export_chunked(self, chunk_size=None):
+        """Generates lists of PADSViewTimers of all Timers accessible by
+        this Helper, at most chunk_size Timers at a time, in order of id.
+        Only one chunk of Timers is held in memory at any time, and each
+        chunk takes a fixed number of queries to load.
+        """
+        if chunk_size is None:
+            chunk_size = defaults['timer_export_chunk_size']
+        timers_from_db = self.get_timers_from_db().order_by('pk')
+        last_id = 0
+        while True:
+            timers_chunk = list(self.prepare_timers_for_export(
+                timers_from_db.filter(pk__gt=last_id)[:chunk_size]))
+            if len(timers_chunk) <= 0:
+                return
+            yield [self.prepare_view_timer(t) for t in timers_chunk]
+            if len(timers_chunk) < chunk_size:
+                return
+            last_id = timers_chunk[-1].id
+
     def prepare_view_timer_group_list(self, timer_groups_from_db):
         view_timer_groups = []
         for tg in timer_groups_from_db:
             view_timer_groups.append(PADSViewTimerGroup(tg, self))
         return view_timer_groups
     
+    def prepare_view_timer_list(self, timers_from_db):
+        """Returns a list of PADSViewTimers from a QuerySet of Timers,
+        bulk-loading all Timers in the QuerySet with related information.
+        Please slice the QuerySet to the required page before calling this
+        method.
+        """
+        view_timers = []
+        for t in self.prepare_timers_for_view_page(timers_from_db):
+            view_timers.append(self.prepare_view_timer(t))
+        self.set_running_times(view_timers)
+        return view_timers
+
+    def set_running_times(self, view_timers, date_time=None):
+        """Works out the running times of a list of PADSViewTimers in a 
+        single pass, as of the same point in time, date_time. The current
+        time is used if no date_time is specified.
+        """
+        if date_time is None:
+            date_time = timezone.now()
+        spans = [t.get_running_time_span(date_time) for t in view_timers]
+        minutes = get_minutes_between(
+            [s[0] for s in spans], [s[1] for s in spans])
+        measures = split_minutes(minutes, PADSViewTimer.UNIT_LIMITS)
+        for t, m, ms in zip(view_timers, minutes, measures):
+            t.set_running_time(m, ms)
+    
     def prepare_view_timer(self, timer_from_db):
         if timer_from_db.historical==True:
             return PADSViewHistoricalTimer(timer_from_db, self)
@@ -190,6 +312,9 @@ class PADSTimerHelper:
         self.reset_history_model = kwargs.get(
             'reset_history_model', 
             pads_timer_default_models.get('reset_history_model'))
+        self.reset_archive_model = kwargs.get(
+            'reset_archive_model', 
+            pads_timer_default_models.get('reset_archive_model'))
         
         if user_id:
             self.user_id = user_id
@@ -231,33 +356,50 @@ class PADSEditingTimerHelper(PADSTimerHelper):
     #
     def delete_timer_by_id(self, timer_id):
         timer = self.get_timers_from_db().get(pk=timer_id)
+        if timer.public:
+            invalidate_public_timers()
         return (timer.delete()[0] > 0)
         
     def set_timer_description(self, timer_id, description):
         timer_from_db = self.get_timers_from_db().get(
             creator_user_id=self.user_id, pk=timer_id)
         timer_from_db.description = description
-        timer_from_db.save()
+        timer_from_db.save(update_fields=['description'])
+        if timer_from_db.public:
+            invalidate_public_timers()
     
     def set_timer_public_flag(self, timer_id, flag):
         timer_from_db = self.get_timers_from_db().get(
             creator_user_id=self.user_id, pk=timer_id)
+        if timer_from_db.public != flag:
+            invalidate_public_timers()
         timer_from_db.public = flag
-        timer_from_db.save()
+        timer_from_db.save(update_fields=['public'])
     
     def set_timer_running_flag(self, timer_id, flag):
         timer_from_db = self.get_timers_from_db().get(
             creator_user_id=self.user_id, pk=timer_id)
         timer_from_db.running = flag
-        timer_from_db.save()
+        timer_from_db.save(update_fields=['running'])
+        if timer_from_db.public:
+            invalidate_public_timers()
         
-    def new_timer_reset_history(self, timer_id, reason, 
-        date_time=timezone.now()):
-        reset_history_item = PADSTimerReset()
-        reset_history_item.reason = reason
-        reset_history_item.date_time = date_time
-        reset_history_item.timer_id = timer_id
-        reset_history_item.save()
+    def new_timer_reset_history(self, timer_id, reason, date_time=None):
+        if date_time is None:
+            date_time = timezone.now()
+        with transaction.atomic(savepoint=False):
+            reset_history_item = PADSTimerReset()
+            reset_history_item.reason = reason
+            reset_history_item.date_time = date_time
+            reset_history_item.timer_id = timer_id
+            reset_history_item.save()
+            # Update the reset count and times on the Timer itself. The 
+            # previous time must be assigned before the latest time, as
+            # some databases apply assignments in order.
+            self.timer_model.objects.filter(pk=timer_id).update(
+                reset_count=F('reset_count') + 1,
+                reset_previous_date_time=F('reset_latest_date_time'),
+                reset_latest_date_time=date_time)
 
     def new_timer(self, description, 
         first_history_message=labels['TIMER_DEFAULT_CREATION_REASON'],
@@ -285,6 +427,8 @@ class PADSEditingTimerHelper(PADSTimerHelper):
             new_timer.permalink_code = secrets.token_urlsafe(
                     TIMERS_PERMALINK_CODE_LENGTH)
             new_timer.save()        
+            if public:
+                invalidate_public_timers()
             
             # Create a history entry to mark timer creation
             self.new_timer_reset_history(
@@ -339,6 +483,53 @@ class PADSEditingTimerHelper(PADSTimerHelper):
         inclusion = self.get_timer_group_inclusions_from_db().get(
             timer_id=timer_id, group_id=group_id)
         return (inclusion.delete()[0] > 0)
+
+    def set_timer_groups_by_name(self, timer_id, names):
+        """Includes a Timer in exactly the User's Timer Groups named in
+        the list 'names', creating Groups that do not exist yet, and removes
+        the Timer from the User's other Groups. Inclusions in Groups of 
+        other Users are left alone. Names are treated as in 
+        new_timer_group(), thus they are matched in lowercase.
+        
+        Only the differences from the Timer's current Groups are written,
+        with a fixed number of queries however many Groups are named.
+        """
+        names_set = set()
+        for name in names:
+            name = name.rstrip(SINGLE_LINE_RSTRIP_CHARS).lower()
+            if str_is_empty_or_space(name) is False:
+                names_set.add(name)
+        
+        user_groups = self.get_timer_groups_from_db()
+        if user_groups is None:
+            return False
+        with transaction.atomic():
+            group_ids = dict(user_groups.filter(
+                name__in=names_set).values_list('name', 'id'))
+            names_new = names_set.difference(group_ids.keys())
+            if len(names_new) > 0:
+                self.group_model.objects.bulk_create(
+                    [self.group_model(name=n, creator_user_id=self.user_id)
+                     for n in names_new], ignore_conflicts=True)
+                # Not all databases return the ids of new rows
+                group_ids.update(user_groups.filter(
+                    name__in=names_new).values_list('name', 'id'))
+            
+            inclusions = self.get_timer_group_inclusions_from_db().filter(
+                timer_id=timer_id, group__in=user_groups)
+            group_ids_before = set(inclusions.values_list(
+                'group_id', flat=True))
+            group_ids_after = set(group_ids.values())
+            group_ids_added = group_ids_after.difference(group_ids_before)
+            if len(group_ids_added) > 0:
+                self.group_inclusion_model.objects.bulk_create(
+                    [self.group_inclusion_model(timer_id=timer_id, 
+                                                group_id=i)
+                     for i in group_ids_added], ignore_conflicts=True)
+            group_ids_removed = group_ids_before.difference(group_ids_after)
+            if len(group_ids_removed) > 0:
+                inclusions.filter(group_id__in=group_ids_removed).delete()
+        return True
     
     def __init__(self, user_id, **kwargs):
         super().__init__(user_id, **kwargs)
@@ -398,37 +589,81 @@ class PADSViewTimer:
     def creator_user_nickname_short(self):
         if self.is_in_quick_list():
             return ANONYMOUS_USER_SHORT_NICKNAME_PREFIX
+        elif hasattr(self.timer_from_db, 'creator_nickname_short'):
+            return self.timer_from_db.creator_nickname_short
         else:
             return self.timer_from_db.creator_user.nickname_short
         
     def creation_date_time(self):
         return self.timer_from_db.creation_date_time
 
-    def get_running_time_minutes(self):
+    def get_running_time_span(self, date_time):
+        """Returns the start and end of the Timer's running time in a 
+        tuple, for a Timer viewed at date_time.
+        """
         if self.is_running():
             # Running timers: run time is time since the Count From
             #  Date Time, which must be the same as the 
             #  time of last reset.
-            running_time = timezone.now() - self.count_from_date_time()
+            return (self.count_from_date_time(), date_time)
         else:
             # Suspended timers: run time is the time between the last
             #  reset, and the reset immediately before it.
-            start_time = self.reset_history()[1].date_time
-            end_time = self.reset_history()[0].date_time
-            running_time = end_time - start_time
-        return (running_time.total_seconds()/60)
+            start_time = self.timer_from_db.reset_previous_date_time
+            end_time = self.timer_from_db.reset_latest_date_time
+            if start_time is None:
+                start_time = self.count_from_date_time()
+            if end_time is None:
+                end_time = start_time
+            return (start_time, end_time)
+
+    def get_running_time_minutes(self):
+        """Returns the running time in whole minutes. Timers loaded in
+        a list by the Timer Helper come with their running times worked out
+        together. Otherwise, the running time is worked out once, when it
+        is first needed.
+        """
+        if self.running_time_minutes is None:
+            self.helper.set_running_times([self])
+        return self.running_time_minutes
+
+    def get_running_time_measures(self):
+        """Returns the running time in a dictionary of measures, by unit
+        (see UNITS and OVERFLOW_UNIT).
+        """
+        if self.running_time_measures is None:
+            self.helper.set_running_times([self])
+        return self.running_time_measures
+
+    def get_measures_by_unit(self, measures):
+        units = self.UNITS + (self.OVERFLOW_UNIT,)
+        return dict(zip(units, measures))
+
+    def set_running_time(self, minutes, measures):
+        """Assigns a running time worked out in advance, in whole minutes 
+        and in a sequence of measures (see durations.split_minutes()).
+        """
+        self.running_time_minutes = minutes
+        self.running_time_measures = self.get_measures_by_unit(measures)
+
+    def clear_running_time(self):
+        self.running_time_minutes = None
+        self.running_time_measures = None
     
     def get_running_time_string(self):
         if int(self.get_running_time_minutes()) > 0:
-            return self.get_measures().get_string(zeroes=False)
+            # Show non-zero measures only, largest unit first
+            measures = self.get_running_time_measures()
+            units = self.UNITS + (self.OVERFLOW_UNIT,)
+            return ', '.join(['{0} {1}'.format(measures[u], u) 
+                              for u in reversed(units) if measures[u] != 0])
         else:
             return labels['TIMER_LT_ONE_MINUTE']
     
     def get_days_since_string(self):
         # Show only number of days
-        measure = self.get_measures()
         unit = self.OVERFLOW_UNIT
-        quantity = measure.get_measure(unit)
+        quantity = self.get_running_time_measures()[unit]
         # Running Timers
         if self.is_running():
             if int(quantity) > 0:
@@ -486,10 +721,33 @@ class PADSViewTimer:
         return reverse('padsweb:timer_by_permalink', 
                  kwargs={'link_code':link_code})
     
+    def get_groups_partition(self):
+        """Returns the Groups which include this Timer and the Groups 
+        available to add it to, as loaded by the Timer Helper's 
+        get_timer_groups_partition_from_db(). The Groups are loaded only
+        once for each View Timer, until they are changed.
+        """
+        if self.groups_partition is None:
+            self.groups_partition = \
+                self.helper.get_timer_groups_partition_from_db(self.id())
+        return self.groups_partition
+
+    def clear_groups(self):
+        """Discards the Groups loaded for this Timer, so that they are
+        loaded again when next needed.
+        """
+        self.groups_partition = None
+        if hasattr(self.timer_from_db, 'groups_prefetched'):
+            del self.timer_from_db.groups_prefetched
+
     # Return groups associated with this timer
     def get_associated_groups_from_db(self):
-        # TODO: explain the db wizardry here
-        return list(self.timer_from_db.in_groups.all().order_by("name"))
+        # Timers bulk-loaded by the Timer Helper come with their Groups
+        groups_prefetched = getattr(
+            self.timer_from_db, 'groups_prefetched', None)
+        if groups_prefetched is not None:
+            return list(groups_prefetched)
+        return list(self.get_groups_partition()[0])
     
     def get_associated_view_groups(self):
         return self.helper.prepare_view_timer_group_list(
@@ -514,12 +772,7 @@ class PADSViewTimer:
         return view_group_choices
             
     def get_available_groups_from_db(self):
-        available_groups = list(self.helper.get_timer_groups_from_db())
-        associated_groups = self.get_associated_groups_from_db()
-        # TODO: Find a more efficient way of doing this
-        for g in associated_groups:
-            available_groups.remove(g)
-        return available_groups
+        return list(self.get_groups_partition()[1])
     
     def get_available_groups_for_choicefield(self):
         available_view_groups = self.get_available_groups_from_db()
@@ -535,6 +788,7 @@ class PADSViewTimer:
         
     def add_to_group(self, group_id):
         self.helper.new_group_inclusion_by_id(self.id(), group_id)
+        self.clear_groups()
         return True
 
     def set_groups_by_name(self, names):
@@ -542,23 +796,12 @@ class PADSViewTimer:
         string 'names', and removes it from Groups not specified in the string.
         If a group does not exist, it will be automatically created.
         """
-        # TODO: Find a more efficient way of implementing this method
-        
         # Generate a list of names from string
         # TODO: Move separator character into a configuration variable
-        names_set = set(names.split(' '))
-                
-        with transaction.atomic():
-            self.remove_from_all_groups()
-            for name in names_set:
-                if not str_is_empty_or_space(name):
-                    old_group = self.helper.get_timer_group_for_view_by_name(name)
-                    if old_group is None:
-                        new_group_id = self.helper.new_timer_group(name)                    
-                        self.add_to_group(new_group_id)
-                    else:
-                        self.add_to_group(old_group.id())
-        return True
+        result = self.helper.set_timer_groups_by_name(
+            self.id(), names.split(' '))
+        self.clear_groups()
+        return result
         
     def delete(self):
         return self.helper.delete_timer_by_id(self.id())
@@ -570,8 +813,8 @@ class PADSViewTimer:
         # Export history
         reset_history = self.reset_history()
         export_hlist = []
-        export_hitem = {}
         for i in reset_history:
+            export_hitem = {}
             export_hitem['timestamp'] = i.date_time.timestamp()
             export_hitem['reason'] = i.reason
             export_hlist.append(export_hitem)
@@ -595,6 +838,7 @@ class PADSViewTimer:
     
     def remove_from_group(self, group_id):
         self.helper.delete_group_inclusion_by_id(self.id(), group_id)
+        self.clear_groups()
         return True
     
     def remove_from_all_groups(self):
@@ -620,9 +864,12 @@ class PADSViewTimer:
         return self.timer_from_db.running
         
     def is_in_quick_list(self):
-        creator_nick = self.timer_from_db.creator_user.nickname_short
-        return creator_nick.startswith(
-            ANONYMOUS_USER_SHORT_NICKNAME_PREFIX)
+        # Timers prepared with PADSTimerHelper.prepare_timers_for_view()
+        #  come with the account kind of their creator
+        if hasattr(self.timer_from_db, 'creator_is_quick_list'):
+            return self.timer_from_db.creator_is_quick_list
+        else:
+            return self.timer_from_db.creator_user.is_quick_list
 
     def reset(self, reason):
         date_time_now = timezone.now()
@@ -631,23 +878,109 @@ class PADSViewTimer:
         with transaction.atomic():
             self.timer_from_db.count_from_date_time = date_time_now
             self.timer_from_db.running = True
-            self.timer_from_db.save()
+            # Only the changed fields are saved, so that the reset count
+            #  and times loaded earlier do not overwrite newer ones
+            self.timer_from_db.save(
+                update_fields=['count_from_date_time', 'running'])
+            if self.is_public():
+                invalidate_public_timers()
             reason_full = labels['TIMER_RESET_NOTICE'].format(reason)
             self.helper.new_timer_reset_history(
                 self.id(), reason_full, date_time_now)
+            self.refresh_reset_counters()
         return True
 
+    def refresh_reset_counters(self):
+        """Reloads the reset count and times of this Timer, which are
+        updated in the database whenever a Reset History entry is added.
+        """
+        self.timer_from_db.refresh_from_db(fields=[
+            'reset_count', 'reset_latest_date_time', 
+            'reset_previous_date_time'])
+        # Running times depend on the reset times
+        self.clear_running_time()
+
+    def get_reset_history_prefetched(self):
+        """Returns the Reset History loaded along with the Timer by the
+        Timer Helper, latest first, or None if it has not been loaded.
+        """
+        return getattr(self.timer_from_db, 'reset_history_prefetched', None)
+
     def reset_count(self):
-        return self.timer_from_db.padstimerreset_set.count()
+        return self.timer_from_db.reset_count
+
+    def reset_latest_date_time(self):
+        return self.timer_from_db.reset_latest_date_time
+
+    def get_reset_history_from_db(self):
+        """Returns the Reset History, latest first, without the archived
+        entries. The prefetched Reset History is used if it was loaded.
+        """
+        reset_history = self.get_reset_history_prefetched()
+        if reset_history is not None:
+            return reset_history
+        return self.timer_from_db.padstimerreset_set.order_by("-date_time")
 
     def reset_history(self):
+        """Returns the entire Reset History, including archived entries,
+        latest first. On the Timer's page, please use reset_history_page()
+        instead.
+        """
+        reset_history = list(self.get_reset_history_from_db())
+        reset_history.extend(self.reset_history_archived())
+        reset_history.sort(key=lambda r: r.date_time, reverse=True)
+        return tuple(reset_history)
+
+    def reset_history_archived(self):
+        """Returns the Reset History entries archived by the 
+        compact_timer_resets command, latest first.
+        """
+        reset_archive = getattr(
+            self.timer_from_db, 'reset_archive_prefetched', None)
+        if reset_archive is not None:
+            return tuple(reset_archive)
+        return tuple(self.timer_from_db.padsarchivedtimerreset_set.order_by(
+            "-date_time"))
+
+    def reset_history_page(self, page=0):
+        """Returns a page of the Reset History, latest first, without the
+        archived entries. The first page is 0. Pages are as long as the
+        view_reset_history_page_size setting.
+        """
+        page_size = defaults['view_reset_history_page_size']
+        first_i = max(page, 0) * page_size
         return tuple(
-            self.timer_from_db.padstimerreset_set.order_by("-date_time"))
+            self.get_reset_history_from_db()[first_i:first_i + page_size])
+
+    def reset_history_page_count(self):
+        """Returns the number of pages of the Reset History, without the
+        archived entries. There is always at least one page.
+        """
+        page_size = defaults['view_reset_history_page_size']
+        reset_history = self.get_reset_history_from_db()
+        if isinstance(reset_history, list):
+            reset_count = len(reset_history)
+        else:
+            reset_count = reset_history.count()
+        return max((reset_count + page_size - 1) // page_size, 1)
+
+    def reset_history_summaries(self):
+        """Returns the yearly summaries of the archived Reset History 
+        entries, latest year first.
+        """
+        return tuple(self.timer_from_db.padstimerresetsummary_set.order_by(
+            "-year"))
 
     def reset_history_latest(self):
-        if self.timer_from_db.padstimerreset_set.count() > 0:
+        reset_history = self.get_reset_history_prefetched()
+        if reset_history is not None:
+            if len(reset_history) > 0:
+                return reset_history[0]
+            else:
+                return None
+        if self.reset_count() > 0:
             return self.timer_from_db.padstimerreset_set.order_by(
-                "-date_time")[0]
+                "-date_time").first()
         else:
             return None
                 
@@ -662,6 +995,8 @@ class PADSViewTimer:
     def __init__(self, timer_from_db, helper=PADSTimerHelper()):
         self.timer_from_db = timer_from_db
         self.helper = helper
+        self.groups_partition = None
+        self.clear_running_time()
 
     def __repr__(self):
         return self.__str__()
@@ -689,6 +1024,7 @@ class PADSViewHistoricalTimer(PADSViewTimer):
         with transaction.atomic():
             self.helper.set_timer_running_flag(self.id(), False)
             self.helper.new_timer_reset_history(self.id(), reason_full)
+            self.refresh_reset_counters()
         return True
 
     def get_status_line(self):
@@ -729,6 +1065,7 @@ class PADSViewRegularTimer(PADSViewTimer):
             self.helper.set_timer_running_flag(self.id(), False)
             self.helper.new_timer_reset_history(
                 self.id(), message, request_datetime)
+            self.refresh_reset_counters()
         return True
             
     def get_status_line(self):
@@ -759,6 +1096,49 @@ class PADSViewSuspendedTimer(PADSViewTimer):
         return 'Susp.'
 
 
+class PADSTimerGroupPagination:
+    """Pagination state of a PADSViewTimerGroup, intended to last no
+    longer than a single request. The Timers in the Group are counted only 
+    once, and each page is loaded only once, until the state is invalidated 
+    by a change to the Group's filters or current page number.
+    
+    The number of times the Timers have been counted and pages have been 
+    loaded are kept in count_queries and page_loads, mainly for testing.
+    """
+
+    def count(self):
+        if self.count_cached is None:
+            self.count_cached = self.timers_set.count()
+            self.count_queries += 1
+        return self.count_cached
+
+    def get_page(self, page):
+        """Returns a list of PADSViewTimers on a page if it has already 
+        been loaded, or None if it has not.
+        """
+        return self.pages.get(page)
+
+    def set_page(self, page, view_timers):
+        self.pages[page] = view_timers
+        self.page_loads += 1
+
+    def set_timers_set(self, timers_set):
+        self.timers_set = timers_set
+        self.invalidate()
+
+    def invalidate(self):
+        self.count_cached = None
+        self.invalidate_pages()
+
+    def invalidate_pages(self):
+        self.pages = dict()
+
+    def __init__(self, timers_set=None):
+        self.count_queries = 0
+        self.page_loads = 0
+        self.set_timers_set(timers_set)
+
+
 class PADSViewTimerGroup:
     """Timer Group Presentation Class that provides a view-friendly 
     interface to the Timer Group Model.
@@ -770,6 +1150,10 @@ class PADSViewTimerGroup:
     def get_first_page(self):
         return self.page()
 
+    def get_fragment_cache_key(self):
+        # Timer Groups from the database are not cached
+        return None
+
     def get_pagination_url(self):
         if self.id():
             return reverse(
@@ -818,12 +1202,16 @@ class PADSViewTimerGroup:
             return '>'
 
     def set_description_filter(self, search_term):
-        self.filtered_timers_set = self.timers_from_db.filter(
-            description__icontains=search_term).order_by('description')
+        self.set_filtered_timers_set(self.timers_from_db.filter(
+            description__icontains=search_term).order_by('description'))
         
     def set_description_prefix_filter(self, search_term):
-        self.filtered_timers_set = self.timers_from_db().filter(
-            description__istartswith=search_term).order_by('description')
+        self.set_filtered_timers_set(self.timers_from_db.filter(
+            description__istartswith=search_term).order_by('description'))
+
+    def set_filtered_timers_set(self, timers_set):
+        self.filtered_timers_set = timers_set
+        self.pagination.set_timers_set(timers_set)
 
     # Helper Functions
     def add_timer_by_id(self, timer_id):
@@ -867,7 +1255,18 @@ class PADSViewTimerGroup:
         elif n < 0:
             self.current_page_number = 0
         self.current_page_number = n - 1
+        self.pagination.invalidate_pages()
     
+    def set_page_from_query(self, p):
+        """Sets the current page from the page parameter ('p') of the
+        query string of a request. Page numbers that are not numbers are
+        ignored.
+        """
+        try:
+            self.set_natural_page_number(int(p))
+        except (TypeError, ValueError):
+            pass
+
     def current_natural_page_number(self):
         return self.current_page_number + 1
     
@@ -882,6 +1281,14 @@ class PADSViewTimerGroup:
     
     def page(self, page=0):
         # First page is 0, get the first page by default
+        # Pages already loaded during this request are not loaded again
+        view_timers = self.pagination.get_page(page)
+        if view_timers is None:
+            view_timers = self.load_page(page)
+            self.pagination.set_page(page, view_timers)
+        return view_timers
+
+    def load_page(self, page=0):
         max_page = self.max_page()
         if max_page > 0:
             # Get the last page if the page number is out of range
@@ -907,7 +1314,7 @@ class PADSViewTimerGroup:
         return req_page
             
     def count(self):
-        return self.filtered_timers_set.count()
+        return self.pagination.count()
     
     def max_page(self):
         if self.page_size:
@@ -935,20 +1342,18 @@ class PADSViewTimerGroup:
         return (self.count() % self.page_size) <= int(self.page_size / 2)
     
     def prepare_view_timer_list(self, timers_from_db):
-        view_timers = []
-        for t in timers_from_db:
-            view_timers.append(self.helper.get_timer_for_view_by_id(t.id))
-        return view_timers
+        return self.helper.prepare_view_timer_list(timers_from_db)
         
     def __init__(self, timer_group_from_db=None, helper=PADSTimerHelper()):
         self.page_size = abs(INDEX_PAGE_SIZE)
         self.current_page_number = 0
         self.helper = helper
+        self.pagination = PADSTimerGroupPagination()
         self.timer_group_from_db = timer_group_from_db
         if timer_group_from_db:
             self.title = timer_group_from_db.name
             self.timers_from_db = timer_group_from_db.padstimer_set.all()
-            self.filtered_timers_set = self.timers_from_db
+            self.set_filtered_timers_set(self.timers_from_db)
 
 class PADSSpecialViewTimerGroup(PADSViewTimerGroup):
     """Unbound Timer Group presentation class to provide a view-friendly 
@@ -958,60 +1363,229 @@ class PADSSpecialViewTimerGroup(PADSViewTimerGroup):
     database. Adding and removing Timers from this group have no effect
     on the permanent Group Inclusions in the database.
     """
-                    
-    def count(self):
-        return self.filtered_timers_set.count()
-    
+
+
+    # Keyset Pagination
+    # Special Groups sorted by a single date time field can be paginated
+    # by seeking past the last Timer on the previous page, using a cursor
+    # made of the Timer's sort key and id, instead of skipping over all 
+    # Timers on previous pages. Cursors take the place of page numbers in 
+    # the page parameter ('p') of the query string, and are formatted as:
+    #  {tag}{direction}{natural page number}_{sort key}_{id}
+    # The tag identifies the Group that issued the cursor, the direction is
+    # either 'a' (Timers after the cursor) or 'b' (Timers before it) and the
+    # sort key is the date time in microseconds since the Unix epoch.
+    KEYSET_CURSOR_TAG = None
+    KEYSET_FIELD = None
+    KEYSET_DESCENDING = False
+    CURSOR_AFTER = 'a'
+    CURSOR_BEFORE = 'b'
+    CURSOR_SEPARATOR = '_'
+    CURSOR_FORMAT = re.compile(r'^([a-z]+)([ab])([0-9]+)_(-?[0-9]+)_([0-9]+)$')
+    CURSOR_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+    # Fragment Caching
+    # The rendered pages of Groups of public Timers are the same for every
+    # visitor, and may be cached under the fragment cache name. Cached 
+    # pages are discarded whenever a public Timer changes.
+    FRAGMENT_CACHE_NAME = None
+
+    def keyset_enabled(self):
+        """Indicates if the Group is being paginated by cursor. Keyset 
+        pagination has to be enabled on a sortable Group, and is not used 
+        while a search filter is in place.
+        """
+        return ((self.keyset_pagination is True)
+            & (self.KEYSET_FIELD is not None)
+            & (self.filtered_timers_set is self.timers_from_db))
+
+    def get_cursor(self, direction, natural_page, view_timer):
+        sort_key = getattr(view_timer.timer_from_db, self.KEYSET_FIELD)
+        if timezone.is_naive(sort_key):
+            sort_key = timezone.make_aware(sort_key)
+        sort_key_us = (sort_key - self.CURSOR_EPOCH) // datetime.timedelta(
+            microseconds=1)
+        return '{0}{1}{2}{3}{4}{3}{5}'.format(
+            self.KEYSET_CURSOR_TAG, direction, natural_page, 
+            self.CURSOR_SEPARATOR, sort_key_us, view_timer.id())
+
+    def parse_cursor(self, p):
+        """Returns a cursor in a tuple: (direction, natural_page, sort_key,
+        timer_id), or None if p is not a cursor issued by this Group.
+        """
+        if isinstance(p, str) is False:
+            return None
+        match = self.CURSOR_FORMAT.match(p)
+        if match is None:
+            return None
+        elif match.group(1) != self.KEYSET_CURSOR_TAG:
+            return None
+        sort_key = self.CURSOR_EPOCH + datetime.timedelta(
+            microseconds=int(match.group(4)))
+        if timezone.is_naive(timezone.now()):
+            sort_key = timezone.make_naive(sort_key)
+        return (match.group(2), int(match.group(3)), sort_key, 
+                int(match.group(5)))
+
+    def set_page_from_query(self, p):
+        if self.keyset_enabled():
+            cursor = self.parse_cursor(p)
+            if cursor is not None:
+                self.set_natural_page_number(cursor[1])
+                self.cursor = cursor
+                return
+        super().set_page_from_query(p)
+
+    def set_natural_page_number(self, n=1):
+        super().set_natural_page_number(n)
+        self.cursor = None
+
+    def load_page(self, page=0):
+        if self.cursor is not None:
+            if self.keyset_enabled() & (page == self.current_page_number):
+                return self.load_page_by_cursor(self.cursor)
+        return super().load_page(page)
+
+    def load_page_by_cursor(self, cursor):
+        direction = cursor[0]
+        sort_key = cursor[2]
+        timer_id = cursor[3]
+        # Seeking backwards is done by seeking forwards in reverse order
+        descending = self.KEYSET_DESCENDING
+        if direction == self.CURSOR_BEFORE:
+            descending = not descending
+        if descending:
+            lookup = 'lt'
+            order_prefix = '-'
+        else:
+            lookup = 'gt'
+            order_prefix = ''
+        seek = (Q(**{'{0}__{1}'.format(self.KEYSET_FIELD, lookup) : sort_key})
+            | Q(**{self.KEYSET_FIELD : sort_key, 
+                   'pk__{0}'.format(lookup) : timer_id}))
+        timers_set = self.timers_from_db.filter(seek).order_by(
+            ''.join([order_prefix, self.KEYSET_FIELD]),
+            ''.join([order_prefix, 'pk']))
+        # The last page may hold up to one and a half pages of Timers
+        if (direction == self.CURSOR_AFTER) & self.at_last_page():
+            last_i = self.page_size * 2
+        else:
+            last_i = self.page_size
+        view_timers = self.prepare_view_timer_list(timers_set[:last_i])
+        if direction == self.CURSOR_BEFORE:
+            view_timers.reverse()
+        return view_timers
+
+    def get_next_page_url(self):
+        if self.keyset_enabled() & (self.at_last_page() is False):
+            view_timers = self.get_current_page()
+            if len(view_timers) > 0:
+                return '{0}?p={1}'.format(
+                    self.get_pagination_url(), 
+                    self.get_cursor(self.CURSOR_AFTER, 
+                                    self.get_next_natural_page_number(),
+                                    view_timers[-1]))
+        return super().get_next_page_url()
+
+    def get_previous_page_url(self):
+        previous_natural_page = self.get_previous_natural_page_number()
+        # The first page is always fetched by page number
+        if self.keyset_enabled() & (previous_natural_page > 1):
+            view_timers = self.get_current_page()
+            if len(view_timers) > 0:
+                return '{0}?p={1}'.format(
+                    self.get_pagination_url(), 
+                    self.get_cursor(self.CURSOR_BEFORE, 
+                                    previous_natural_page,
+                                    view_timers[0]))
+        return super().get_previous_page_url()
+
+    def get_fragment_cache_key(self):
+        """Returns the key to cache the rendered current page of the Group
+        under, or None if the page must not be cached. Only Groups with a
+        fragment cache name, listing public Timers from all Users without
+        a search filter are cached.
+        """
+        if self.FRAGMENT_CACHE_NAME is None:
+            return None
+        elif defaults['view_fragment_cache_timeout'] <= 0:
+            return None
+        elif isinstance(self.helper, PADSPublicTimerHelper) is False:
+            return None
+        elif self.helper.user_id != INVALID_SESSION_ID:
+            return None
+        elif self.filtered_timers_set is not self.timers_from_db:
+            return None
+        return get_public_timers_fragment_key(
+            self.FRAGMENT_CACHE_NAME, self.get_title(), self.page_size,
+            self.current_page_number, self.cursor)
+
     def id(self):
         # Special Groups are not bound to a database record, and thus
         # have no id
         return None
     
     def __init__(self, timers_set, title=labels['TIMER_GROUP_DEFAULT_TITLE'], 
-        helper=PADSTimerHelper()):
+        helper=PADSTimerHelper(), keyset_pagination=None):
         super().__init__(None, helper)
+        self.cursor = None
+        if keyset_pagination is None:
+            keyset_pagination = defaults['view_keyset_pagination']
+        self.keyset_pagination = keyset_pagination
         self.timers_from_db = timers_set
-        self.filtered_timers_set = timers_set
+        self.set_filtered_timers_set(timers_set)
         self.title = title
     
     def __str__(self):
         return self.title
 
 class PADSLongestRunningTimerGroup(PADSSpecialViewTimerGroup):
+    KEYSET_CURSOR_TAG = 'lr'
+    FRAGMENT_CACHE_NAME = 'longest_running'
+    KEYSET_FIELD = 'count_from_date_time'
     
     def get_pagination_url(self):
         return reverse('padsweb:index_longest_running')
 
-    def __init__(self, helper=PADSTimerHelper()):
+    def __init__(self, helper=PADSTimerHelper(), keyset_pagination=None):
         timers_set = helper.get_timers_from_db().order_by(
-            'count_from_date_time')
+            'count_from_date_time', 'pk')
         super().__init__(
             timers_set, labels['TIMER_GROUP_DEFAULT_LONGEST_RUNNING_TITLE'],
-            helper)
+            helper, keyset_pagination)
 
 class PADSRecentlyResetTimerGroup(PADSSpecialViewTimerGroup):
+    KEYSET_CURSOR_TAG = 'rr'
+    FRAGMENT_CACHE_NAME = 'recently_reset'
+    KEYSET_FIELD = 'count_from_date_time'
+    KEYSET_DESCENDING = True
     
     def get_pagination_url(self):
         return reverse('padsweb:index_recent_resets')
 
-    def __init__(self, helper=PADSTimerHelper()):
+    def __init__(self, helper=PADSTimerHelper(), keyset_pagination=None):
         earliest_time = timezone.now() - datetime.timedelta(days=TIMERS_RECENT_RESET_MAX_AGE)
         timers_set = helper.get_timers_from_db().filter(
-            count_from_date_time__gt=earliest_time).order_by('-count_from_date_time')
+            count_from_date_time__gt=earliest_time).order_by(
+                '-count_from_date_time', '-pk')
         super().__init__(
             timers_set, labels['TIMER_GROUP_DEFAULT_SHORTEST_RUNNING_TITLE'],
-            helper)
+            helper, keyset_pagination)
 
 class PADSNewestTimerGroup(PADSSpecialViewTimerGroup):
+    KEYSET_CURSOR_TAG = 'nw'
+    FRAGMENT_CACHE_NAME = 'newest'
+    KEYSET_FIELD = 'creation_date_time'
+    KEYSET_DESCENDING = True
     
     def get_pagination_url(self):
         return reverse('padsweb:index_newest')
 
-    def __init__(self, helper=PADSTimerHelper()):
+    def __init__(self, helper=PADSTimerHelper(), keyset_pagination=None):
         timers_set = helper.get_timers_from_db().order_by(
-            '-creation_date_time')
+            '-creation_date_time', '-pk')
         super().__init__(timers_set, labels['TIMER_GROUP_DEFAULT_NEWEST_TITLE'],
-         helper)
+         helper, keyset_pagination)
 
 class PADSSharedTimerGroup(PADSSpecialViewTimerGroup):
     
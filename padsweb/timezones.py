@@ -0,0 +1,63 @@
+#
+#
+# Public Archive of Days Since Timers
+# Time Zone Registry
+#
+#
+"""Time zone names, and form choices, prepared once when
+the module is first imported instead of on every request.
+
+Time zone names are checked against a frozenset of all names in the tz
+database, instead of the list from pytz. Choices for forms may be limited
+to a single region (the part of a name before the first slash, such as
+'Australia' in 'Australia/Perth') to keep the Settings page short.
+"""
+
+from functools import lru_cache
+from pytz import all_timezones
+
+#
+# Constants
+#
+# Region of names with no region, such as 'UTC'
+TIME_ZONE_REGION_OTHER = 'Other'
+
+TIME_ZONE_NAMES = tuple(all_timezones)
+TIME_ZONE_NAMES_SET = frozenset(TIME_ZONE_NAMES)
+
+#
+# Functions
+#
+def get_time_zone_region(name):
+    """Returns the region of a time zone name."""
+    region, separator, place = name.partition('/')
+    if separator == '':
+        return TIME_ZONE_REGION_OTHER
+    return region
+
+def is_time_zone_name(name):
+    """Returns True if name is the name of a time zone."""
+    return name in TIME_ZONE_NAMES_SET
+
+@lru_cache(maxsize=None)
+def get_time_zone_choices(region=None, grouped=False):
+    """Returns a tuple of choices of time zones for a ChoiceField.
+
+    If a region is specified, only time zones of the region are included,
+    labelled without the region. If grouped is True, the time zones are
+    grouped by region, as for the <optgroup> element. Otherwise, a choice
+    is made for every time zone, labelled with its full name.
+    """
+    if region is not None:
+        return tuple([(n, n.partition('/')[2] or n) for n in TIME_ZONE_NAMES
+                      if get_time_zone_region(n) == region])
+    if grouped is True:
+        return tuple([(r, get_time_zone_choices(r))
+                      for r in TIME_ZONE_REGIONS])
+    return tuple([(n, n) for n in TIME_ZONE_NAMES])
+
+#
+# Derived Constants
+#
+TIME_ZONE_REGIONS = tuple(sorted(set(
+    [get_time_zone_region(n) for n in TIME_ZONE_NAMES])))
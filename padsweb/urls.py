@@ -85,6 +85,8 @@ urlpatterns = [
     # Remove Timer from Group    
     url(r'^timer/(?P<timer_id>[0-9]+)/remove_from_group/$', 
         views.timer_remove_from_group, name='timer_remove_from_group'),    
+    # Operations on Many Timers
+    url(r'^timers/bulk/$', views.timer_bulk, name='timer_bulk'),
     
     #
     # User Account URLs
@@ -11,13 +11,14 @@ in a more view-friendly way than directly handling the Django Models.
 #
 # Imports
 #
-from django.contrib.auth.hashers import PBKDF2PasswordHasher
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import IntegrityError, transaction
 from django.utils import timezone
-from padsweb.misc import split_posint_rand
+from padsweb.caching import invalidate_public_timers
+from padsweb.hashers import PADSPasswordHasher
+from padsweb.helpers import PADSWriteUserHelper
+from padsweb.misc import get_one_or_none, split_posint_rand
 from padsweb.models import PADSUser
-from padsweb.models import GroupInclusion
 from padsweb.settings import *
 
 # Standard Library Imports
@@ -25,7 +26,7 @@ import datetime, random, secrets
 
 # Constants
 pads_user_default_models = {"user_model" : PADSUser,}
-pads_password_hasher = PBKDF2PasswordHasher()
+pads_password_hasher = PADSPasswordHasher()
 
 #
 # Classes
@@ -50,6 +51,8 @@ class PADSUserHelper:
     def delete_user(self, user_id):
         user_from_db = self.user_model.objects.get(id=user_id)
         user_from_db.delete()
+        # The User's public Timers were deleted along with the account
+        invalidate_public_timers()
         return True
 
     def generate_anon_user_password(self, length, segments, 
@@ -99,39 +102,18 @@ class PADSUserHelper:
         
     def get_user_from_db_by_id(self, user_id):
         if user_id:
-            if self.user_model.objects.filter(pk=user_id).exists():
-                return self.user_model.objects.get(pk=user_id)
-            else:
-                return None
+            return get_one_or_none(self.user_model.objects, pk=user_id)
         else:
             return None
 
-    # TODO: Replace this with a more efficient implementation.
     def merge_users_by_id(self, source_user_id, target_user_id, **kwargs):
-        with transaction.atomic():
-            source_user = self.get_user_from_db_by_id(source_user_id)
-
-            # Transfer Timer Groups
-            timer_groups_in_db = source_user.padstimergroup_set.all()
-            for tg in timer_groups_in_db:
-                tg.creator_user_id = target_user_id
-                tg.save()
-            
-            # Transfer Timers
-            timers_in_db = source_user.padstimer_set.all()
-            for t in timers_in_db:
-                t.creator_user_id = target_user_id    
-                t.save()
-                # Optionally transfer ungrouped timers into a default group
-                default_group_id = kwargs.get("default_group_id")
-                if default_group_id:
-                    if t.groupinclusion_set.count() <= 0:
-                        inclusion = GroupInclusion()
-                        inclusion.group_id = default_group_id
-                        inclusion.timer_id = t.id
-                        inclusion.save()
-            # Delete Source User
-            self.delete_user(source_user_id)
+        """Transfers all Timers and Timer Groups of the source User to the 
+        target User, and deletes the source User. See
+        PADSWriteUserHelper.merge_users_by_id() for details.
+        """
+        write_user_helper = PADSWriteUserHelper(int(target_user_id))
+        return write_user_helper.merge_users_by_id(int(source_user_id), 
+                                                   **kwargs)
 
     def prepare_user_in_db(self, nickname_short, password, **kwargs):
         new_user = PADSUser()
@@ -165,6 +147,18 @@ class PADSUserHelper:
         else:
             return None
         
+    def get_ql_user_for_view_by_id(self, user_id):
+        """Returns a PADSViewUser of a Quick List User by id, or None if
+        there is no Quick List User by that id. Regular Users are not
+        returned, even if they exist.
+        """
+        if user_id:
+            user_from_db = get_one_or_none(
+                self.user_model.objects, pk=user_id, is_quick_list=True)
+            if user_from_db:
+                return PADSViewUser(user_from_db, self)
+        return None
+
     def get_user_by_nickname_short(self, nick_short):
         if nick_short:
             try:
@@ -196,6 +190,7 @@ class PADSUserHelper:
             ANONYMOUS_USER_SHORT_NICKNAME_PREFIX, nickname_suffix)
         new_user = self.prepare_user_in_db(
             nickname_short, raw_password)
+        new_user.is_quick_list = True
         
         # Save new user to database, and return password
         try:
@@ -249,8 +244,17 @@ class PADSViewUser:
         return self.user_from_db.id
 
     def check_password(self, password):
-        return self.helper.password_hasher.verify(
-            password, self.user_from_db.password_hash)
+        password_hasher = self.helper.password_hasher
+        if password_hasher.verify(password, self.user_from_db.password_hash):
+            # Replace outdated password hashes while the password is known
+            if password_hasher.must_update(self.user_from_db.password_hash):
+                salt = secrets.token_urlsafe(SALT_BYTES)
+                self.user_from_db.password_hash = password_hasher.encode(
+                    password, salt)
+                self.user_from_db.save(update_fields=['password_hash'])
+            return True
+        else:
+            return False
     
     # Export to dictionary for easy serialisation (e.g. with json.dumps())
     def dict(self):
@@ -286,7 +290,7 @@ class PADSViewUser:
         
         # Reject malformed quick list password
         if ql_id.isdecimal():
-            user_ql = self.helper.get_user_for_view_by_id(ql_id)
+            user_ql = self.helper.get_ql_user_for_view_by_id(ql_id)
         else:
             return False
         
@@ -296,7 +300,7 @@ class PADSViewUser:
                 if default_group_id.isnumeric():
                     self.helper.merge_users_by_id(
                         user_ql.id(), self.id(), 
-                        default_group_id=default_group_id)
+                        default_group_id=int(default_group_id))
                 else:
                     self.helper.merge_users_by_id(
                         user_ql.id(), self.id())
@@ -316,8 +320,7 @@ class PADSViewUser:
         """Method to indicate if an account is a Quick List or a regular
          account.
         """
-        return self.user_from_db.nickname_short.startswith(
-            ANONYMOUS_USER_SHORT_NICKNAME_PREFIX)
+        return self.user_from_db.is_quick_list
     
     def __init__(self, user_from_db, helper=PADSUserHelper()):
         self.user_from_db = user_from_db
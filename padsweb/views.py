@@ -11,17 +11,21 @@
 
 from django.db import IntegrityError, models
 from django.http import HttpResponse, HttpResponseRedirect, HttpRequest
+from django.http import StreamingHttpResponse
 from django.shortcuts import render
 from django.urls import reverse
 from django.utils import timezone
 from django.views.generic.base import TemplateView
 from padsweb.forms import *
+from padsweb.helpers import PADSWriteTimerHelper
+from padsweb.ratelimit import get_client_ip_address, sign_in_rate_limiter
 from padsweb.settings import *
 from padsweb.strings import messages
+from padsweb.timezones import TIME_ZONE_REGIONS, get_time_zone_region
 from padsweb.timers import *
 from padsweb.user import PADSUserHelper, PADSViewUser
 import pytz  # For pytz.timezone() tzinfo object lookup
-import json  # For json.dumps()
+import json  # For json.JSONEncoder()
 
 #
 # Constants
@@ -47,8 +51,7 @@ class PADSView(TemplateView):
 
     def get_session_user(self):
         if self.user_present():
-            return self.user_helper.get_user_for_view_by_id(
-                self.get_session_user_id())
+            return get_session_user(self.request, self.user_helper)
         else:
             return None
 
@@ -88,11 +91,9 @@ class PADSView(TemplateView):
         self.add_context_item("signed_in", self.user_present())
 
         if self.user_present():
-            self.add_context_item("user", self.get_session_user())
-        
-        if self.user_present():
-            self.add_context_item('time_zone', 
-                         self.get_session_user().get_timezone())
+            user = self.get_session_user()
+            self.add_context_item("user", user)
+            self.add_context_item('time_zone', user.get_timezone())
         else:
             self.add_context_item('time_zone', 
                          timezone.get_current_timezone_name())
@@ -114,8 +115,12 @@ class PADSView(TemplateView):
         self.prepare_context()
         return render(self.request, template, self.context)
     
-    def __init__(self, request, context=dict(), user_helper=PADSUserHelper()):
+    def __init__(self, request, context=None, user_helper=user_helper):
         self.request = request
+        # Every View gets its own context, as a default dict() would be
+        #  shared between Views of different requests
+        if context is None:
+            context = dict()
         self.context = context
         self.user_helper = user_helper
         self.search_term = request.GET.get('q')
@@ -165,11 +170,26 @@ class PADSTimerDetailView(PADSTimerView):
             timer = self.public_timer_helper.get_timer_for_view_by_id(self.timer_id)
         return timer
         
+    def prepare_reset_history_context(self):
+        # Only a page of the Reset History is shown at a time, older
+        #  entries may be reached with the history page parameter ('hp')
+        page_count = self.timer.reset_history_page_count()
+        try:
+            natural_page_number = int(self.natural_history_page_number)
+        except (TypeError, ValueError):
+            natural_page_number = 1
+        natural_page_number = min(max(natural_page_number, 1), page_count)
+        self.add_context_item('reset_history', 
+            self.timer.reset_history_page(natural_page_number - 1))
+        self.add_context_item('reset_history_page', natural_page_number)
+        self.add_context_item('reset_history_pages', page_count)
+        self.add_context_item('reset_history_summaries', 
+            self.timer.reset_history_summaries())
+
     def prepare_context(self):
         if self.timer:
             self.add_context_item('timer', self.timer)
-            self.add_context_item(
-                'reset_history', self.timer.reset_history())
+            self.prepare_reset_history_context()
             self.add_context_item('edit_enabled', self.edit_enabled())
             if self.edit_enabled():
                 self.add_context_item('reason_form', ReasonForm())
@@ -186,6 +206,7 @@ class PADSTimerDetailView(PADSTimerView):
         super().__init__(request, timer_id)
         self.timer_id = timer_id
         self.timer = self.get_timer()
+        self.natural_history_page_number = request.GET.get('hp')
 
 class PADSTimerEditView(PADSTimerDetailView):
     """Dummy view for making requests to change a Timer's configuration.
@@ -236,7 +257,7 @@ class PADSTimerGroupIndexView(PADSTimerView):
     
     def add_timer_group(self, group):
         if self.natural_page_number:
-            group.set_natural_page_number(int(self.natural_page_number))
+            group.set_page_from_query(self.natural_page_number)
         if self.get_search_term():
             group.set_description_filter(self.get_search_term())
             group.set_title('{0} Containing "{1}"'.format(
@@ -262,6 +283,8 @@ class PADSTimerGroupIndexView(PADSTimerView):
 
     def prepare_context(self):
         self.add_context_item('index_groups', self.timer_groups)
+        self.add_context_item('fragment_cache_timeout', 
+                              defaults['view_fragment_cache_timeout'])
         super().prepare_context()
 
     def render_template(self):
@@ -695,7 +718,7 @@ def index_private_by_user(request):
     # Display personal timers when User is signed in
     if index_view.user_present():
         user_id = index_view.get_session_user_id()
-        user = user_helper.get_user_for_view_by_id(user_id)
+        user = index_view.get_session_user()
         private_timers = PADSPrivateTimerGroup(user_id)
         index_view.add_timer_group(private_timers)
         timer_group_title = ''.join(
@@ -821,7 +844,18 @@ def session_quicklist(request):
         
             # Only Handle Sign-in if well-form password is provided
             if quick_list_id.isdigit() > 0 and len(password_raw) > 0:
-                quick_list_user = user_helper.get_user_for_view_by_id(
+                # Turn away attempts over the rate limit before the
+                # password is checked
+                ip_address = get_client_ip_address(request)
+                account = 'ql:{0}'.format(int(quick_list_id))
+                if sign_in_rate_limiter.allow(ip_address, account) is False:
+                    set_banner(
+                        request, messages['USER_SIGN_IN_RATE_LIMITED'],
+                        BANNER_FAILURE_DENIAL)
+                    return HttpResponseRedirect(
+                        reverse('padsweb:sign_up_intro'))
+
+                quick_list_user = user_helper.get_ql_user_for_view_by_id(
                     quick_list_id)
 
                 # Only proceed if Quick List exists
@@ -829,6 +863,7 @@ def session_quicklist(request):
                     
                     # QL Sign-in Success
                     if quick_list_user.check_password(password_raw):
+                        sign_in_rate_limiter.succeeded(ip_address, account)
                         set_user_id(request, quick_list_user.id())
                         set_banner(
                             request, messages['USER_SIGN_IN_QL_SUCCESS'], 
@@ -891,6 +926,16 @@ def session_new(request):
             username = form_data.cleaned_data['username']
             password = form_data.cleaned_data['password']
         
+            # Turn away attempts over the rate limit before the password
+            # is checked
+            ip_address = get_client_ip_address(request)
+            account = 'user:{0}'.format(username)
+            if sign_in_rate_limiter.allow(ip_address, account) is False:
+                set_banner(
+                    request, messages['USER_SIGN_IN_RATE_LIMITED'],
+                    BANNER_FAILURE_DENIAL)
+                return HttpResponseRedirect(reverse('padsweb:sign_up_intro'))
+
             # Handle sign in only if user exists in database
             user_old = user_helper.get_user_by_nickname_short(username) 
             if user_old:
@@ -898,6 +943,7 @@ def session_new(request):
                 # Success
                 #  e.g. Valid Password
                 if user_old.check_password(password) == True:
+                    sign_in_rate_limiter.succeeded(ip_address, account)
                     set_user_id(request, user_old.id())
                     banner_text = messages['USER_SIGN_IN_SUCCESS'].format(
                         user_old.username())
@@ -1376,6 +1422,84 @@ def timer_reset(request, timer_id):
     # Redirect to index by default
     return dummy_view.redirect_to_index()
 
+def timer_bulk(request):
+    """Django view to reset, stop, share, unshare or add to a Timer Group
+    many of the signed-in User's Timers at once, in a single transaction.
+    The Timers are specified by repeating the timer_id field of the POST
+    request, as with a list of checkboxes.
+    """
+    # Prepare a dummy view to extract User info from session 
+    dummy_view = PADSView(request, dict())
+    
+    if dummy_view.user_present() is False:
+        set_banner(
+            request, messages['TIMER_SETTINGS_WRONG_USER'], 
+            BANNER_FAILURE_DENIAL)
+        return HttpResponseRedirect(reverse('padsweb:index'))
+
+    if request.method == "POST":
+        form_data = TimerBulkForm(request.POST)
+        try:
+            timer_ids = [int(i) for i in request.POST.getlist('timer_id')]
+        except ValueError:
+            timer_ids = []
+        
+        # Refuse requests with too many Timers, before the ids reach the
+        #  database as query parameters
+        timer_bulk_max = defaults['timer_bulk_max']
+        if len(timer_ids) > timer_bulk_max:
+            set_banner(
+                request, 
+                messages['TIMER_SETTINGS_BULK_TOO_MANY'].format(
+                    timer_bulk_max),
+                BANNER_FAILURE_DENIAL)
+        
+        elif form_data.is_valid() and (len(timer_ids) > 0):
+            session_user = dummy_view.get_session_user()
+            write_timer_helper = PADSWriteTimerHelper(
+                dummy_view.get_session_user_id(), 
+                user_from_db=getattr(session_user, 'user_from_db', None))
+            operation = form_data.cleaned_data['operation']
+            reason = form_data.cleaned_data['reason']
+            if len(reason) <= 0:
+                reason = labels['REASON_NONE']
+            timer_group_id = form_data.cleaned_data['timer_group']
+            
+            if operation == 'reset':
+                timers_changed = write_timer_helper.reset_many_by_id(
+                    timer_ids, reason)
+            elif operation == 'stop':
+                timers_changed = write_timer_helper.stop_many_by_id(
+                    timer_ids, reason)
+            elif operation == 'share':
+                timers_changed = write_timer_helper.set_public_many_by_id(
+                    timer_ids, True)
+            elif operation == 'unshare':
+                timers_changed = write_timer_helper.set_public_many_by_id(
+                    timer_ids, False)
+            elif timer_group_id is not None:
+                timers_changed = write_timer_helper.add_many_to_group(
+                    timer_ids, timer_group_id)
+            else:
+                timers_changed = 0
+            banner_text = messages['TIMER_SETTINGS_BULK_DONE'].format(
+                timers_changed)
+            set_banner(request, banner_text, BANNER_INFO)
+        
+        # Invalid form data received
+        else:
+            set_banner(
+                request, messages['TIMER_SETTINGS_INVALID_REQUEST'],
+                 BANNER_FAILURE_DENIAL)
+    
+    # Handle non-POST requests
+    else:
+        set_banner(
+            request, messages['TIMER_SETTINGS_INVALID_REQUEST'],
+             BANNER_FAILURE_DENIAL)
+    
+    return HttpResponseRedirect(reverse('padsweb:index_personal'))
+
 def timer_share(request, timer_id):
     """Django view to make a Timer public"""
     
@@ -1652,8 +1776,32 @@ def user_new(request):
     else:
         return HttpResponseRedirect(reverse('padsweb:sign_up_intro'))
 
+def user_export_json_chunks(user_info, view_timer_chunks, group_names):
+    """Generates a JSON export of a User's settings, Timers and Timer 
+    Group names one piece at a time. Every chunk of Timers from 
+    view_timer_chunks is encoded and sent out before the next is loaded.
+    """
+    encoder = json.JSONEncoder()
+    # User Settings
+    yield '{'
+    for key, value in user_info.items():
+        yield '{0}: {1}, '.format(encoder.encode(key), encoder.encode(value))
+    # Timers
+    yield '"timers": ['
+    separator = ''
+    for chunk in view_timer_chunks:
+        timers_json = []
+        for t in chunk:
+            timers_json.append(encoder.encode(t.dict()))
+        if len(timers_json) > 0:
+            yield ''.join([separator, ', '.join(timers_json)])
+            separator = ', '
+    # Timer Group names
+    yield '], "groups": {0}}}'.format(encoder.encode(group_names))
+
 def user_export_all(request):
-    """Django View to export User Settings and all Timers created to JSON
+    """Django View to export User Settings and all Timers created to JSON.
+    The export is streamed out while the Timers are being loaded.
     """
     # Prepare a view object to extract User info from session 
     #  PADSTimerView used because it has a built-in PADSTimerHelper
@@ -1663,27 +1811,16 @@ def user_export_all(request):
         user = settings_view.get_session_user()
         timer_helper = settings_view.timer_helper
         
-        # Get Timers by User
-        timers_export = []
-        timers = timer_helper.get_timers_for_view_all().get_timers_all()
-        for t in timers:
-            timers_export.append(t.dict())
-        
         # Get Timer Groups by User
-        group_names = []
-        groups = timer_helper.get_timer_groups_for_view_all()
-        for g in groups:
-            group_names.append(g.get_title())
+        group_names = list(timer_helper.get_timer_groups_from_db(
+            ).order_by('pk').values_list('name', flat=True))
         
-        # Prepare user info
-        user_info = user.dict()
-        user_info['timers'] = timers_export
-        user_info['groups'] = group_names
-        
-        # Render the Template
-        response = HttpResponse(json.dumps(user_info))
-        response['content-type'] = 'application/json'
-        return response
+        # Stream out the export, Timers are loaded only when needed
+        export_chunks = user_export_json_chunks(
+            user.dict(), timer_helper.get_timers_for_export_chunked(), 
+            group_names)
+        return StreamingHttpResponse(
+            export_chunks, content_type='application/json')
     
     # Reject users who have not signed in
     else:
@@ -1716,9 +1853,21 @@ def settings_info(request):
             'new_timer_group_form', NewTimerGroupForm())
         
         # Prepare Time Zone Form
+        #  Only time zones in the region of the User's time zone are shown,
+        #  other regions may be chosen with the region parameter ('tzr')
         initial_tz = {'time_zone':user.get_timezone()}
+        time_zone_region = request.GET.get(
+            'tzr', get_time_zone_region(user.get_timezone()))
+        if time_zone_region not in TIME_ZONE_REGIONS:
+            time_zone_region = None
+        settings_view.add_context_item(
+            "time_zone_form", 
+            TimeZoneForm(initial=initial_tz, region=time_zone_region,
+                         grouped=True))
         settings_view.add_context_item(
-            "time_zone_form", TimeZoneForm(initial=initial_tz))
+            "time_zone_region", time_zone_region)
+        settings_view.add_context_item(
+            "time_zone_regions", TIME_ZONE_REGIONS)
         
         # Prepare Password Change forms
         initial_pwc = {'user_id':user.id()}
@@ -2062,6 +2211,22 @@ def sign_up_sign_in_intro(request):
         dummy_view.add_context_item('sign_up_form', SignUpForm())
         return dummy_view.render_template("padsweb/sign_up.html")
         
+def get_session_user(request, helper=user_helper):
+    """Returns a PADSViewUser of the User signed in to a request's
+    session, or None if no User has signed in. The User is loaded from the
+    database only once per request, and is kept with the request for all
+    Views and Helpers that need it later on. The User is loaded again if
+    a different User has signed in during the request.
+    """
+    user_id = request.session.get('user_id', INVALID_SESSION_ID)
+    if (not user_id) or (user_id == INVALID_SESSION_ID):
+        return None
+    session_user = getattr(request, 'pads_session_user', None)
+    if (session_user is None) or (session_user[0] != user_id):
+        session_user = (user_id, helper.get_user_for_view_by_id(user_id))
+        request.pads_session_user = session_user
+    return session_user[1]
+
 def set_banner(request, text, banner_type=BANNER_INFO):
     """Inserts Banner Text and Type into a session.
     """
@@ -19,6 +19,8 @@ setup(
     version='0.587',
     packages=find_packages(),
     include_package_data=True,
+    # NumPy speeds up the running times on index pages, if installed
+    extras_require={'numpy': ['numpy']},
     description='''Yet another long-term stopwatch web app. Works just 
     like the countless "days since" personal calendar apps found on
      Google Play and the App Store, but intended to be accessible 